@@ -5,6 +5,8 @@ from app.schemas.captable import (
     CapTableEvolutionEntry,
     CapTableKPIs,
     CapTableSnapshot,
+    DilutionSimulationRequest,
+    DilutionSimulationResult,
     EquityEventCreate,
     EquityEventRead,
     ShareClassCreate,
@@ -12,6 +14,8 @@ from app.schemas.captable import (
     StakeholderCreate,
     StakeholderRead,
     StakeholderUpdate,
+    WaterfallRequest,
+    WaterfallResult,
 )
 from app.services.captable_service import CapTableService, serialize_event
 
@@ -158,3 +162,33 @@ async def get_cap_table_evolution(
     service: CapTableService = Depends(get_captable_service),
 ):
     return await service.get_cap_table_evolution(company_id)
+
+
+@router.post(
+    "/{company_id}/simulate",
+    response_model=DilutionSimulationResult,
+)
+async def simulate_dilution(
+    company_id: str,
+    data: DilutionSimulationRequest,
+    service: CapTableService = Depends(get_captable_service),
+):
+    try:
+        return await service.simulate(company_id, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post(
+    "/{company_id}/waterfall",
+    response_model=WaterfallResult,
+)
+async def get_waterfall(
+    company_id: str,
+    data: WaterfallRequest,
+    service: CapTableService = Depends(get_captable_service),
+):
+    try:
+        return await service.get_waterfall(company_id, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
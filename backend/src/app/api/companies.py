@@ -1,10 +1,15 @@
 import json as _json
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 
 from app.api.deps import get_company_service
 from app.schemas.company import CompanyCreate, CompanyDetail, CompanyRead, CompanyUpdate
-from app.schemas.intelligence import PipelineStatusResponse, AddSourceRequest, CompareQuery
+from app.schemas.intelligence import (
+    AddSourceRequest,
+    CompareQuery,
+    EnrichmentJobRead,
+    PipelineStatusResponse,
+)
 from app.database import get_session
 from app.services.company_service import CompanyService
 
@@ -14,14 +19,13 @@ router = APIRouter()
 @router.post("/", response_model=CompanyRead, status_code=201)
 async def create_company(
     data: CompanyCreate,
-    background_tasks: BackgroundTasks,
     service: CompanyService = Depends(get_company_service),
 ):
     company = await service.create(data)
     # Import here to avoid circular imports at module level
-    from app.intelligence.orchestrator import run_full_enrichment
+    from app.job_queue import enqueue_job
 
-    background_tasks.add_task(run_full_enrichment, company.id)
+    await enqueue_job(company.id, "full")
     return company
 
 
@@ -39,16 +43,25 @@ async def list_companies(
 
 @router.post("/bulk-update", status_code=202)
 async def bulk_update(
-    background_tasks: BackgroundTasks,
     service: CompanyService = Depends(get_company_service),
 ):
-    """Trigger incremental update for ALL companies."""
+    """Queue incremental update for ALL companies."""
     companies = await service.list_all(limit=100)
-    from app.intelligence.orchestrator import run_incremental_update
+    from app.job_queue import enqueue_jobs
 
-    for company in companies:
-        background_tasks.add_task(run_incremental_update, company.id)
-    return {"status": "accepted", "count": len(companies)}
+    jobs = await enqueue_jobs([c.id for c in companies], "incremental")
+    return {"status": "accepted", "count": len(jobs)}
+
+
+@router.get("/jobs", response_model=list[EnrichmentJobRead])
+async def list_enrichment_jobs(
+    status: str | None = None,
+    limit: int = 100,
+):
+    """Recent enrichment jobs across all companies."""
+    from app.job_queue import list_jobs
+
+    return await list_jobs(status=status, limit=limit)
 
 
 @router.get("/compare")
@@ -143,6 +156,7 @@ async def compare_consolidated(
         system_prompt=FEATURE_CONSOLIDATION_PROMPT,
         user_prompt=user_prompt,
         response_model=ConsolidatedFeatureResult,
+        pipeline="feature_consolidation",
     )
 
     return {
@@ -184,6 +198,7 @@ async def compare_quadrant(
         system_prompt=QUADRANT_PROMPT,
         user_prompt=f"Companies:\n{context}",
         response_model=QuadrantResult,
+        pipeline="quadrant",
     )
 
     return {
@@ -203,6 +218,26 @@ async def compare_chat_endpoint(
     return result
 
 
+@router.post("/compare/chat/stream")
+async def compare_chat_stream_endpoint(
+    query: CompareQuery,
+    request: Request,
+    session=Depends(get_session),
+):
+    """Same as /compare/chat, streamed as server-sent events."""
+    from app.api.streaming import stream_answer
+    from app.intelligence.ask import COMPARE_MODEL, prepare_compare
+    from app.intelligence.openai_client import stream_chat_completion
+
+    prepared = await prepare_compare(query, session)
+    if prepared is None:
+        raise HTTPException(status_code=404, detail="No companies found for comparison")
+    messages, sources = prepared
+    return stream_answer(
+        request, stream_chat_completion(messages, model=COMPARE_MODEL), sources
+    )
+
+
 @router.get("/{company_id}/competitor-clients")
 async def get_competitor_clients(
     company_id: str,
@@ -317,7 +352,6 @@ async def set_primary_company(
 async def add_custom_source(
     company_id: str,
     data: AddSourceRequest,
-    background_tasks: BackgroundTasks,
     service: CompanyService = Depends(get_company_service),
 ):
     from app.intelligence.research import fetch_custom_source
@@ -332,9 +366,9 @@ async def add_custom_source(
         content=source.content,
         content_md=source.content_md,
     )
-    # Trigger digest rerun in background
-    from app.intelligence.orchestrator import rerun_with_sources
-    background_tasks.add_task(rerun_with_sources, company_id)
+    # Queue digest rerun
+    from app.job_queue import enqueue_job
+    await enqueue_job(company_id, "sources")
     return {"id": ds.id, "url": ds.url, "title": ds.title}
 
 
@@ -352,43 +386,44 @@ async def delete_source(
 @router.post("/{company_id}/rerun", status_code=202)
 async def rerun_enrichment(
     company_id: str,
-    background_tasks: BackgroundTasks,
     service: CompanyService = Depends(get_company_service),
 ):
     company = await service.get_by_id(company_id)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
-    from app.intelligence.orchestrator import run_full_enrichment
-    background_tasks.add_task(run_full_enrichment, company_id)
-    return {"status": "accepted"}
+    from app.job_queue import enqueue_job
+    job = await enqueue_job(company_id, "full")
+    return {"status": "accepted", "job_id": job.id}
 
 
 @router.post("/{company_id}/update", status_code=202)
 async def incremental_update(
     company_id: str,
-    background_tasks: BackgroundTasks,
     service: CompanyService = Depends(get_company_service),
 ):
     company = await service.get_by_id(company_id)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
-    from app.intelligence.orchestrator import run_incremental_update
-    background_tasks.add_task(run_incremental_update, company_id)
-    return {"status": "accepted"}
+    from app.job_queue import enqueue_job
+    job = await enqueue_job(company_id, "incremental")
+    return {"status": "accepted", "job_id": job.id}
 
 
 @router.post("/{company_id}/reanalyze", status_code=202)
 async def reanalyze_company(
     company_id: str,
-    background_tasks: BackgroundTasks,
     service: CompanyService = Depends(get_company_service),
 ):
     company = await service.get_by_id(company_id)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
-    from app.intelligence.orchestrator import run_intelligence_rerun
-    background_tasks.add_task(run_intelligence_rerun, company_id)
-    return {"status": "accepted", "message": "Intelligence re-analysis started"}
+    from app.job_queue import enqueue_job
+    job = await enqueue_job(company_id, "intelligence")
+    return {
+        "status": "accepted",
+        "message": "Intelligence re-analysis queued",
+        "job_id": job.id,
+    }
 
 
 @router.delete("/{company_id}/social/{post_id}", status_code=204)
@@ -465,6 +500,14 @@ async def get_digest(
         ]
 
 
+@router.get("/{company_id}/jobs", response_model=list[EnrichmentJobRead])
+async def get_company_jobs(company_id: str, limit: int = 20):
+    """Enrichment job history for a single company."""
+    from app.job_queue import list_jobs
+
+    return await list_jobs(company_id=company_id, limit=limit)
+
+
 @router.get("/{company_id}/status", response_model=PipelineStatusResponse)
 async def get_company_status(
     company_id: str,
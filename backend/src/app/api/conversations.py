@@ -4,12 +4,13 @@ from __future__ import annotations
 import json
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 
-from app.database import get_session
+from app.database import async_session_factory, get_session
 from app.models.conversation import Conversation
+from app.models.conversation_message import ConversationMessage
 
 router = APIRouter()
 
@@ -50,7 +51,7 @@ async def list_conversations(session=Depends(get_session)):
             "id": c.id,
             "title": c.title,
             "company_id": c.company_id,
-            "message_count": len(json.loads(c.messages or "[]")),
+            "message_count": c.message_count,
             "created_at": c.created_at.isoformat() if c.created_at else None,
             "updated_at": c.updated_at.isoformat() if c.updated_at else None,
         }
@@ -58,41 +59,119 @@ async def list_conversations(session=Depends(get_session)):
     ]
 
 
+def _now() -> datetime:
+    # SQLite DateTime columns are naive; store UTC without tzinfo
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _message_dict(msg: ConversationMessage) -> dict:
+    out = {
+        "id": msg.id,
+        "role": msg.role,
+        "content": msg.content,
+        "timestamp": msg.created_at.replace(tzinfo=timezone.utc).isoformat()
+        if msg.created_at else None,
+    }
+    if msg.role == "assistant":
+        out["sources"] = json.loads(msg.sources or "[]")
+    return out
+
+
+async def _recent_messages(
+    session, conv_id: str, limit: int, before: int | None = None
+) -> list[ConversationMessage]:
+    """Up to ``limit`` messages older than ``before``, oldest first."""
+    stmt = (
+        select(ConversationMessage)
+        .where(ConversationMessage.conversation_id == conv_id)
+        .order_by(ConversationMessage.id.desc())
+        .limit(limit)
+    )
+    if before is not None:
+        stmt = stmt.where(ConversationMessage.id < before)
+    rows = (await session.execute(stmt)).scalars().all()
+    return list(reversed(rows))
+
+
 @router.get("/{conv_id}")
-async def get_conversation(conv_id: str, session=Depends(get_session)):
+async def get_conversation(
+    conv_id: str,
+    limit: int = Query(100, ge=1, le=500),
+    before: int | None = Query(None, description="Return messages older than this message id"),
+    session=Depends(get_session),
+):
+    """Conversation with its latest ``limit`` messages; page back with ``before``."""
     stmt = select(Conversation).where(Conversation.id == conv_id)
     result = await session.execute(stmt)
     conv = result.scalar_one_or_none()
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
+
+    page = await _recent_messages(session, conv_id, limit + 1, before)
+    has_more = len(page) > limit
+    messages = page[1:] if has_more else page
     return {
         "id": conv.id,
         "title": conv.title,
         "company_id": conv.company_id,
-        "messages": json.loads(conv.messages or "[]"),
+        "messages": [_message_dict(m) for m in messages],
+        "message_count": conv.message_count,
+        "has_more": has_more,
         "created_at": conv.created_at.isoformat() if conv.created_at else None,
         "updated_at": conv.updated_at.isoformat() if conv.updated_at else None,
     }
 
 
-@router.post("/{conv_id}/messages")
-async def add_message(conv_id: str, data: MessageInput, session=Depends(get_session)):
-    """Send a message — runs AI with history and appends both messages."""
+async def _append_turn(
+    session, conv_id: str, question: str, asked_at: datetime, answer: str, sources: list[dict]
+) -> ConversationMessage:
+    """Insert a question/answer pair, bump the counter and auto-title on the first turn."""
+    await session.execute(
+        update(Conversation)
+        .where(Conversation.id == conv_id, Conversation.message_count == 0)
+        .values(title=question[:80])
+    )
+    await session.execute(
+        update(Conversation)
+        .where(Conversation.id == conv_id)
+        .values(message_count=Conversation.message_count + 2)
+    )
+    assistant = ConversationMessage(
+        conversation_id=conv_id,
+        role="assistant",
+        content=answer,
+        sources=json.dumps(sources),
+        created_at=_now(),
+    )
+    session.add_all([
+        ConversationMessage(
+            conversation_id=conv_id, role="user", content=question, created_at=asked_at
+        ),
+        assistant,
+    ])
+    await session.commit()
+    return assistant
+
+
+async def _start_turn(conv_id: str, session) -> tuple[Conversation, list[dict]]:
+    """Load the conversation and the token-budgeted history preceding a new question."""
     stmt = select(Conversation).where(Conversation.id == conv_id)
     result = await session.execute(stmt)
     conv = result.scalar_one_or_none()
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    messages = json.loads(conv.messages or "[]")
+    from app.intelligence.history import build_history
 
-    # Add user message
-    user_msg = {
-        "role": "user",
-        "content": data.question,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-    }
-    messages.append(user_msg)
+    return conv, await build_history(session, conv)
+
+
+@router.post("/{conv_id}/messages")
+async def add_message(conv_id: str, data: MessageInput, session=Depends(get_session)):
+    """Send a message — runs AI with history and appends both messages."""
+    asked_at = _now()
+    conv, history = await _start_turn(conv_id, session)
+    history.append({"role": "user", "content": data.question})
 
     # Call ask_intelligence with conversation history
     from app.intelligence.ask import ask_intelligence_with_history
@@ -100,27 +179,46 @@ async def add_message(conv_id: str, data: MessageInput, session=Depends(get_sess
     response = await ask_intelligence_with_history(
         question=data.question,
         company_id=data.company_id or conv.company_id,
-        history=messages[-20:],  # Last 20 messages for context
+        history=history,
         session=session,
     )
 
-    assistant_msg = {
-        "role": "assistant",
-        "content": response.answer,
-        "sources": response.sources,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-    }
-    messages.append(assistant_msg)
+    assistant = await _append_turn(
+        session, conv_id, data.question, asked_at, response.answer, response.sources
+    )
+    return _message_dict(assistant)
 
-    conv.messages = json.dumps(messages)
 
-    # Auto-title from first user message
-    if len([m for m in messages if m["role"] == "user"]) == 1:
-        conv.title = data.question[:80]
+@router.post("/{conv_id}/messages/stream")
+async def add_message_stream(
+    conv_id: str, data: MessageInput, request: Request, session=Depends(get_session)
+):
+    """Send a message and stream the answer as server-sent events.
 
-    await session.commit()
+    Both messages are persisted once the answer completes; nothing is stored
+    if the client disconnects mid-stream.
+    """
+    asked_at = _now()
+    conv, history = await _start_turn(conv_id, session)
+    history.append({"role": "user", "content": data.question})
 
-    return assistant_msg
+    from app.api.streaming import stream_answer
+    from app.intelligence.ask import prepare_ask
+    from app.intelligence.openai_client import stream_chat_completion
+
+    messages, sources = await prepare_ask(
+        session, data.question, data.company_id or conv.company_id, history
+    )
+
+    async def on_complete(answer: str) -> dict:
+        # The request-scoped session may already be closed once streaming starts
+        async with async_session_factory() as write_session:
+            assistant = await _append_turn(
+                write_session, conv_id, data.question, asked_at, answer, sources
+            )
+        return _message_dict(assistant)
+
+    return stream_answer(request, stream_chat_completion(messages), sources, on_complete)
 
 
 @router.delete("/{conv_id}", status_code=204)
@@ -130,5 +228,8 @@ async def delete_conversation(conv_id: str, session=Depends(get_session)):
     conv = result.scalar_one_or_none()
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
+    await session.execute(
+        delete(ConversationMessage).where(ConversationMessage.conversation_id == conv_id)
+    )
     await session.delete(conv)
     await session.commit()
@@ -3,17 +3,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import async_session, get_session
 from app.schemas.finance import (
-    BurnRates,
     CategoryRuleRead,
     CategoryRuleUpdate,
     FinanceDashboard,
-    FinanceKPIs,
     ForecastSettings,
     HoldedConnectionTest,
     PlannedExpenseCreate,
     PlannedExpenseRead,
     PlannedExpenseUpdate,
-    RunwayScenarios,
     SyncStatus,
 )
 from app.services.finance_service import FinanceService, STARTUP_CATEGORIES, get_sync_status, _set_sync_status
@@ -25,76 +22,25 @@ router = APIRouter()
 @router.get("/dashboard", response_model=FinanceDashboard)
 async def get_dashboard(session: AsyncSession = Depends(get_session)):
     svc = FinanceService(session)
-
-    cash = await svc.get_cash_position()
-    monthly = await svc.get_monthly_summary()
-    burn_rates = await svc.get_burn_rates(monthly)
-    expenses = await svc.get_expense_breakdown(months=6)
-    income = await svc.get_income_sources(months=6)
-    accounts = await svc.get_treasury_accounts()
-    last_synced = await svc.get_last_synced()
-    forecast_settings = await svc.get_forecast_settings()
-
-    runway = await svc.get_runway_from_burn(cash, burn_rates["six_month"])
-    runway_scenarios = svc.compute_runway_scenarios(cash, burn_rates, monthly, forecast_settings)
-
-    now_ym = __import__("datetime").datetime.utcnow().strftime("%Y-%m")
-    complete = [m for m in monthly if m["year_month"] < now_ym]
-    monthly_burn = complete[-1]["expenses"] if complete else 0.0
-    monthly_income = complete[-1]["income"] if complete else 0.0
-    net_last = complete[-1]["net"] if complete else 0.0
-
-    # Exclude current partial month from chart; forecast starts from last complete month
-    forecast_months = svc.build_forecast_months(cash, forecast_settings, complete, count=36)
-    all_months = [
-        {**m, "is_forecast": False} for m in complete
-    ] + forecast_months
-
-    return FinanceDashboard(
-        kpis=FinanceKPIs(
-            cash_position=cash,
-            monthly_burn=monthly_burn,
-            monthly_income=monthly_income,
-            runway_months=runway,
-            runway_scenarios=RunwayScenarios(**runway_scenarios),
-            net_last_month=net_last,
-            burn_rates=BurnRates(**burn_rates),
-        ),
-        monthly_summary=all_months,
-        expense_breakdown=expenses,
-        income_sources=income,
-        treasury_accounts=[
-            {
-                "id": a.id,
-                "holded_id": a.holded_id,
-                "name": a.name,
-                "account_type": a.account_type,
-                "balance": a.balance,
-                "iban": a.iban,
-                "currency": a.currency,
-            }
-            for a in accounts
-        ],
-        last_synced=last_synced,
-        forecast=ForecastSettings(**forecast_settings),
-    )
+    return await svc.get_dashboard()
 
 
 # ── Sync ────────────────────────────────────────────────────
 
-async def _run_sync():
+async def _run_sync(force_full: bool = False):
     try:
         async with async_session() as session:
             svc = FinanceService(session)
-            await svc.full_sync()
+            await svc.full_sync(force_full=force_full)
     except Exception as e:
         _set_sync_status("error", str(e), 0)
 
 
 @router.post("/sync", status_code=202, response_model=dict)
-async def trigger_sync(background_tasks: BackgroundTasks):
-    background_tasks.add_task(_run_sync)
-    return {"message": "Sync started"}
+async def trigger_sync(background_tasks: BackgroundTasks, full: bool = False):
+    """Sync from Holded; incremental since the last sync unless ``full=true``."""
+    background_tasks.add_task(_run_sync, full)
+    return {"message": "Full resync started" if full else "Sync started"}
 
 
 @router.get("/sync-status", response_model=SyncStatus)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
@@ -15,3 +15,34 @@ async def ask_intelligence(
     from app.intelligence.ask import ask_intelligence as do_ask
 
     return await do_ask(query, session)
+
+
+@router.post("/ask/stream")
+async def ask_intelligence_stream(
+    query: AskQuery,
+    request: Request,
+    session: AsyncSession = Depends(get_db),
+):
+    """Same as /ask, streamed as server-sent events."""
+    from app.api.streaming import stream_answer
+    from app.intelligence.ask import prepare_ask
+    from app.intelligence.openai_client import stream_chat_completion
+
+    messages, sources = await prepare_ask(session, query.question, query.company_id)
+    return stream_answer(request, stream_chat_completion(messages), sources)
+
+
+@router.get("/cache")
+async def get_llm_cache_stats():
+    """Hit/miss metrics and stored entries of the LLM response cache."""
+    from app.intelligence import llm_cache
+
+    return await llm_cache.get_stats()
+
+
+@router.delete("/cache")
+async def clear_llm_cache():
+    """Drop every cached LLM response."""
+    from app.intelligence import llm_cache
+
+    return {"deleted": await llm_cache.invalidate()}
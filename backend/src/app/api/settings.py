@@ -93,6 +93,11 @@ async def update_settings(
     if body.holded_api_key is not None:
         await svc.set("holded_api_key", body.holded_api_key, is_secret=True)
 
+    # Drop cached OpenAI credentials so the next call picks up the change
+    if body.openai_api_key is not None or body.openai_model is not None:
+        from app.intelligence.openai_client import invalidate_settings_cache
+        invalidate_settings_cache()
+
     # Sync scheduler if auto-update settings changed
     if body.auto_update_enabled is not None or body.auto_update_hour is not None:
         from app.scheduler import sync_scheduler
@@ -0,0 +1,61 @@
+"""Server-sent events for streamed LLM answers."""
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_answer(
+    request: Request,
+    tokens: AsyncIterator[str],
+    sources: list[dict],
+    on_complete: Callable[[str], Awaitable[dict]] | None = None,
+) -> StreamingResponse:
+    """Forward ``tokens`` as SSE.
+
+    Emits ``sources`` first, then one ``token`` event per delta and a final
+    ``done`` event carrying ``on_complete(answer)`` (or the answer and
+    sources). If the client disconnects the upstream stream is closed and
+    ``on_complete`` is not called; failures are reported as an ``error``
+    event since the status line has already been sent.
+    """
+
+    async def events() -> AsyncIterator[str]:
+        yield sse_event("sources", sources)
+        parts: list[str] = []
+        try:
+            async for delta in tokens:
+                if await request.is_disconnected():
+                    logger.info("Client disconnected from %s, stopping stream", request.url.path)
+                    return
+                parts.append(delta)
+                yield sse_event("token", {"delta": delta})
+        except Exception as exc:
+            logger.exception("Streaming answer failed")
+            yield sse_event("error", {"detail": str(exc)})
+            return
+        finally:
+            await tokens.aclose()
+
+        answer = "".join(parts)
+        payload = {"answer": answer, "sources": sources}
+        if on_complete is not None:
+            payload = await on_complete(answer)
+        yield sse_event("done", payload)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Stop nginx and similar proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
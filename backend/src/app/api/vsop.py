@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.api.deps import get_vsop_service
 from app.schemas.vsop import (
@@ -8,6 +10,7 @@ from app.schemas.vsop import (
     VsopPoolCreate,
     VsopPoolRead,
     VsopPoolUpdate,
+    VsopSchedule,
     VsopSummary,
 )
 from app.services.vsop_service import VsopService
@@ -89,6 +92,16 @@ async def delete_grant(
 @router.get("/{company_id}/summary", response_model=VsopSummary)
 async def get_summary(
     company_id: str,
+    as_of: datetime | None = Query(None, description="Vesting as of this date (default: now)"),
+    service: VsopService = Depends(get_vsop_service),
+):
+    return await service.get_summary(company_id, as_of)
+
+
+@router.get("/{company_id}/schedule", response_model=VsopSchedule)
+async def get_schedule(
+    company_id: str,
+    years: int = Query(4, ge=1, le=10),
     service: VsopService = Depends(get_vsop_service),
 ):
-    return await service.get_summary(company_id)
+    return await service.get_schedule(company_id, years)
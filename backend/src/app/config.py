@@ -10,6 +10,43 @@ class Settings(BaseSettings):
     secret_key: str = ""
     debug: bool = True
 
+    # Enrichment job queue
+    enrichment_workers: int = 3
+    enrichment_max_attempts: int = 3
+    enrichment_retry_base_seconds: int = 60
+
+    # Structured LLM response cache
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_hours: int = 24 * 7
+    llm_cache_max_entries: int = 2000
+    llm_cache_bypass: list[str] = []  # pipeline names that always call OpenAI
+
+    # On-disk cache of fetched research pages
+    http_cache_enabled: bool = True
+    http_cache_dir: str = ".http_cache"
+    http_cache_max_bytes: int = 1_000_000_000
+    http_cache_ttl_days: int = 30
+    extraction_workers: int = 2  # processes for trafilatura/markdownify
+
+    # Shared research fetcher
+    fetch_max_connections: int = 20
+    fetch_per_host_connections: int = 4
+    fetch_max_body_bytes: int = 5_000_000
+
+    # Ask retrieval when no company is selected
+    ask_retrieval_token_budget: int = 12000
+    ask_retrieval_max_chunks: int = 40
+
+    # Conversation history sent with each chat turn
+    conversation_history_token_budget: int = 4000
+
+    # Incremental digest updates: above this share of new vs. full context,
+    # digests are regenerated from scratch instead of updated
+    digest_delta_max_ratio: float = 0.25
+
+    # What-if dilution simulator
+    captable_simulation_max_scenarios: int = 100_000
+
     model_config = {"env_file": ".env"}
 
 
@@ -22,6 +22,14 @@ async def init_db() -> None:
         await conn.run_sync(Base.metadata.create_all)
         # Add columns to existing tables (SQLite ALTER TABLE)
         await _add_column_if_missing(conn, "bank_transactions", "category", "VARCHAR(100)")
+        await _add_column_if_missing(
+            conn, "conversations", "message_count", "INTEGER NOT NULL DEFAULT 0"
+        )
+        await _add_column_if_missing(conn, "conversations", "summary", "TEXT")
+        await _add_column_if_missing(
+            conn, "conversations", "summary_through_id", "INTEGER NOT NULL DEFAULT 0"
+        )
+        await _migrate_conversation_messages(conn)
 
 
 async def _add_column_if_missing(conn, table: str, column: str, col_type: str):
@@ -34,6 +42,55 @@ async def _add_column_if_missing(conn, table: str, column: str, col_type: str):
         await conn.execute(sa.text(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}"))
 
 
+async def _migrate_conversation_messages(conn):
+    """Move legacy JSON conversation histories into conversation_messages rows."""
+    import json
+    from datetime import datetime, timezone
+
+    import sqlalchemy as sa
+
+    result = await conn.execute(
+        sa.text(
+            "SELECT id, messages FROM conversations "
+            "WHERE messages IS NOT NULL AND messages NOT IN ('', '[]')"
+        )
+    )
+    for conv_id, raw in result.fetchall():
+        try:
+            messages = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        rows = []
+        for m in messages:
+            try:
+                ts = datetime.fromisoformat(m["timestamp"]).astimezone(timezone.utc)
+            except (KeyError, TypeError, ValueError):
+                ts = datetime.now(timezone.utc)
+            rows.append({
+                "conversation_id": conv_id,
+                "role": m.get("role", "user"),
+                "content": m.get("content") or "",
+                "sources": json.dumps(m["sources"]) if m.get("sources") else None,
+                "created_at": ts.replace(tzinfo=None),
+            })
+        if rows:
+            await conn.execute(
+                sa.text(
+                    "INSERT INTO conversation_messages "
+                    "(conversation_id, role, content, sources, created_at) "
+                    "VALUES (:conversation_id, :role, :content, :sources, :created_at)"
+                ),
+                rows,
+            )
+        await conn.execute(
+            sa.text(
+                "UPDATE conversations SET messages = '[]', "
+                "message_count = message_count + :n WHERE id = :id"
+            ),
+            {"n": len(rows), "id": conv_id},
+        )
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_factory() as session:
         yield session
@@ -1,16 +1,20 @@
 import json
 import logging
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.intelligence.context_docs import get_context_doc, get_context_docs
 from app.intelligence.openai_client import chat_completion
 from app.intelligence.prompts import ASK_SYSTEM_PROMPT
+from app.intelligence.retrieval import retrieve_context
 from app.models.company import Company
 from app.schemas.intelligence import AskQuery, AskResponse
-from app.services.company_service import CompanyService
 
 logger = logging.getLogger(__name__)
 
+COMPARE_MODEL = "gpt-5.2"
+
 
 async def _format_finance_context(session: AsyncSession) -> str:
     """Build finance context from treasury and bank transaction data."""
@@ -349,88 +353,106 @@ def _format_company_context(company: Company) -> str:
     return "\n\n".join(parts)
 
 
-async def ask_intelligence(
-    query: AskQuery,
-    session: AsyncSession,
-) -> AskResponse:
+async def _format_cross_pillar_context(session: AsyncSession) -> list[str]:
+    """Finance and primary-company cap table context, when available."""
+    parts: list[str] = []
     try:
-        service = CompanyService(session)
-
-        context_parts: list[str] = []
-        all_sources: list[dict] = []
-
-        if query.company_id:
-            logger.info(f"Ask: looking up company {query.company_id}")
-            company = await service.get_by_id(query.company_id)
-            if company:
-                logger.info(
-                    f"Ask: found {company.name}, "
-                    f"data_sources={len(company.data_sources)}, "
-                    f"events={len(company.events)}, "
-                    f"founders={len(company.founders)}"
-                )
-                context_parts.append(_format_company_context(company))
-                for ds in company.data_sources:
-                    all_sources.append({"label": ds.title or ds.url, "url": ds.url})
-            else:
-                logger.warning(f"Ask: company {query.company_id} not found")
-        else:
-            # Load ALL tracked companies with full relations
-            all_companies = await service.list_all(limit=100)
-            for c in all_companies:
-                full = await service.get_by_id(c.id)
-                if full:
-                    context_parts.append(_format_company_context(full))
-                    for ds in full.data_sources:
-                        all_sources.append(
-                            {"label": ds.title or ds.url, "url": ds.url}
-                        )
-
-        # Add finance and cap table context (cross-pillar data)
-        try:
-            finance_ctx = await _format_finance_context(session)
-            if finance_ctx:
-                context_parts.append(finance_ctx)
-        except Exception:
-            logger.debug("Could not load finance context", exc_info=True)
+        finance_ctx = await _format_finance_context(session)
+        if finance_ctx:
+            parts.append(finance_ctx)
+    except Exception:
+        logger.debug("Could not load finance context", exc_info=True)
 
-        # Add cap table context for primary company
-        try:
-            primary_companies = await service.list_all(limit=100)
-            primary = next((c for c in primary_companies if c.is_primary), None)
-            if primary:
-                captable_ctx = await _format_captable_context(session, primary.id)
-                if captable_ctx:
-                    context_parts.append(captable_ctx)
-        except Exception:
-            logger.debug("Could not load cap table context", exc_info=True)
-
-        context = (
-            "\n\n---\n\n".join(context_parts)
-            if context_parts
-            else "No company data available."
+    try:
+        primary_id = await session.scalar(
+            select(Company.id).where(Company.is_primary.is_(True)).limit(1)
         )
+        if primary_id:
+            captable_ctx = await _format_captable_context(session, primary_id)
+            if captable_ctx:
+                parts.append(captable_ctx)
+    except Exception:
+        logger.debug("Could not load cap table context", exc_info=True)
+    return parts
+
+
+async def _build_ask_context(
+    session: AsyncSession, company_id: str | None, question: str
+) -> tuple[str, list[dict]]:
+    """Assemble the CONTEXT DATA block and its citable sources.
+
+    A selected company gets its full context document; otherwise only the
+    chunks most relevant to ``question`` are retrieved across all companies.
+    """
+    context_parts: list[str] = []
+    all_sources: list[dict] = []
+    if company_id:
+        doc = await get_context_doc(session, company_id)
+        if doc:
+            context_parts.append(doc.markdown)
+            all_sources.extend(doc.sources)
+        else:
+            logger.warning(f"Ask: company {company_id} not found")
+    else:
+        retrieved, all_sources = await retrieve_context(session, question)
+        if retrieved:
+            context_parts.append(retrieved)
+
+    context_parts.extend(await _format_cross_pillar_context(session))
+
+    context = (
+        "\n\n---\n\n".join(context_parts)
+        if context_parts
+        else "No company data available."
+    )
+    return context, all_sources
+
+
+def _unique_sources(sources: list[dict], limit: int = 20) -> list[dict]:
+    seen_urls: set[str] = set()
+    unique_sources: list[dict] = []
+    for s in sources:
+        if s["url"] not in seen_urls:
+            seen_urls.add(s["url"])
+            unique_sources.append(s)
+    return unique_sources[:limit]
+
+
+async def prepare_ask(
+    session: AsyncSession,
+    question: str,
+    company_id: str | None,
+    history: list[dict] | None = None,
+) -> tuple[list[dict], list[dict]]:
+    """Build the chat messages and deduplicated sources for an Ask question.
+
+    ``history`` is the conversation so far, ending with the current question.
+    """
+    context, all_sources = await _build_ask_context(session, company_id, question)
+    logger.info(f"Ask: context length={len(context)}, sources={len(all_sources)}")
+
+    messages: list[dict] = [
+        {"role": "system", "content": ASK_SYSTEM_PROMPT},
+        {"role": "system", "content": f"CONTEXT DATA:\n\n{context}"},
+    ]
+    # Add conversation history (exclude the last user message — we add it fresh)
+    for msg in (history or [])[:-1]:
+        messages.append({"role": msg["role"], "content": msg["content"]})
+    messages.append({"role": "user", "content": question})
+    return messages, _unique_sources(all_sources)
 
-        logger.info(f"Ask: context length={len(context)}, sources={len(all_sources)}")
 
-        messages = [
-            {"role": "system", "content": ASK_SYSTEM_PROMPT},
-            {"role": "system", "content": f"CONTEXT DATA:\n\n{context}"},
-            {"role": "user", "content": query.question},
-        ]
+async def ask_intelligence(
+    query: AskQuery,
+    session: AsyncSession,
+) -> AskResponse:
+    try:
+        messages, sources = await prepare_ask(session, query.question, query.company_id)
 
         answer = await chat_completion(messages)
         logger.info(f"Ask: answer length={len(answer)}")
 
-        # Deduplicate sources
-        seen_urls: set[str] = set()
-        unique_sources: list[dict] = []
-        for s in all_sources:
-            if s["url"] not in seen_urls:
-                seen_urls.add(s["url"])
-                unique_sources.append(s)
-
-        return AskResponse(answer=answer, sources=unique_sources[:20])
+        return AskResponse(answer=answer, sources=sources)
 
     except Exception as e:
         logger.exception(f"Ask endpoint error: {e}")
@@ -445,96 +467,30 @@ async def ask_intelligence_with_history(
 ) -> AskResponse:
     """Ask with conversation history for multi-turn context."""
     try:
-        service = CompanyService(session)
-        context_parts: list[str] = []
-        all_sources: list[dict] = []
-
-        if company_id:
-            company = await service.get_by_id(company_id)
-            if company:
-                context_parts.append(_format_company_context(company))
-                for ds in company.data_sources:
-                    all_sources.append({"label": ds.title or ds.url, "url": ds.url})
-        else:
-            all_companies = await service.list_all(limit=100)
-            for c in all_companies:
-                full = await service.get_by_id(c.id)
-                if full:
-                    context_parts.append(_format_company_context(full))
-                    for ds in full.data_sources:
-                        all_sources.append({"label": ds.title or ds.url, "url": ds.url})
-
-        # Add cross-pillar context (finance + cap table)
-        try:
-            finance_ctx = await _format_finance_context(session)
-            if finance_ctx:
-                context_parts.append(finance_ctx)
-        except Exception:
-            pass
-
-        try:
-            all_cos = await service.list_all(limit=100)
-            primary = next((c for c in all_cos if c.is_primary), None)
-            if primary:
-                captable_ctx = await _format_captable_context(session, primary.id)
-                if captable_ctx:
-                    context_parts.append(captable_ctx)
-        except Exception:
-            pass
-
-        context = (
-            "\n\n---\n\n".join(context_parts)
-            if context_parts
-            else "No company data available."
-        )
-
-        # Build messages array with conversation history
-        messages: list[dict] = [
-            {"role": "system", "content": ASK_SYSTEM_PROMPT},
-            {"role": "system", "content": f"CONTEXT DATA:\n\n{context}"},
-        ]
-        # Add conversation history (exclude the last user message — we add it fresh)
-        for msg in history[:-1]:
-            messages.append({"role": msg["role"], "content": msg["content"]})
-        messages.append({"role": "user", "content": question})
+        messages, sources = await prepare_ask(session, question, company_id, history)
 
         answer = await chat_completion(messages)
 
-        # Deduplicate sources
-        seen_urls: set[str] = set()
-        unique_sources: list[dict] = []
-        for s in all_sources:
-            if s["url"] not in seen_urls:
-                seen_urls.add(s["url"])
-                unique_sources.append(s)
-
-        return AskResponse(answer=answer, sources=unique_sources[:20])
+        return AskResponse(answer=answer, sources=sources)
 
     except Exception as e:
         logger.exception(f"Ask with history error: {e}")
         raise
 
 
-async def compare_chat(query, session):
-    """Chat with full context of compared companies using GPT-4.1."""
-    from app.schemas.intelligence import CompareResponse
-
-    service = CompanyService(session)
-    companies = await service.get_comparison_data(query.company_ids)
-
-    if not companies:
-        return CompareResponse(answer="No companies found for comparison.", sources=[])
+async def prepare_compare(query, session) -> tuple[list[dict], list[dict]] | None:
+    """Build comparison chat messages and sources, or None if no company matched."""
+    docs = await get_context_docs(session, query.company_ids)
+    if not docs:
+        return None
 
     # Build comprehensive context
     context_parts = []
     all_sources = []
-    for company in companies:
-        ctx = _format_company_context(company)
-        primary_label = " [PRIMARY - YOUR COMPANY]" if company.is_primary else ""
-        context_parts.append(f"## {company.name}{primary_label}\n\n{ctx}")
-        if hasattr(company, 'data_sources') and company.data_sources:
-            for ds in company.data_sources[:10]:
-                all_sources.append({"label": ds.title or ds.url, "url": ds.url})
+    for doc in docs:
+        primary_label = " [PRIMARY - YOUR COMPANY]" if doc.is_primary else ""
+        context_parts.append(f"## {doc.name}{primary_label}\n\n{doc.markdown}")
+        all_sources.extend(doc.sources[:10])
 
     context = "\n\n---\n\n".join(context_parts)
 
@@ -544,15 +500,18 @@ async def compare_chat(query, session):
         {"role": "system", "content": f"COMPARISON DATA:\n\n{context}"},
         {"role": "user", "content": query.question},
     ]
+    return messages, _unique_sources(all_sources)
 
-    answer = await chat_completion(messages, model="gpt-5.2")
 
-    # Deduplicate sources
-    seen = set()
-    unique_sources = []
-    for s in all_sources:
-        if s["url"] not in seen:
-            seen.add(s["url"])
-            unique_sources.append(s)
+async def compare_chat(query, session):
+    """Chat with full context of compared companies using GPT-4.1."""
+    from app.schemas.intelligence import CompareResponse
+
+    prepared = await prepare_compare(query, session)
+    if prepared is None:
+        return CompareResponse(answer="No companies found for comparison.", sources=[])
+    messages, sources = prepared
+
+    answer = await chat_completion(messages, model=COMPARE_MODEL)
 
-    return CompareResponse(answer=answer, sources=unique_sources[:20])
+    return CompareResponse(answer=answer, sources=sources)
@@ -0,0 +1,172 @@
+"""Materialized per-company context documents for Ask mode.
+
+Formatting a company for the Ask prompt needs every relation eager-loaded and
+produces a multi-hundred-KB string, yet it only changes when the company is
+re-enriched or one of its child rows is added/removed. Each document is
+stored with a fingerprint of that state (data_version, updated_at and
+per-table row counts/timestamps), served from memory or the
+``company_context_docs`` table while the fingerprint matches, and rebuilt in
+one batched load otherwise.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.associations import company_categories
+from app.models.company import Company
+from app.models.company_context_doc import CompanyContextDoc
+from app.models.company_digest import CompanyDigest
+from app.models.competitor_client import CompetitorClient
+from app.models.data_source import DataSource
+from app.models.event import Event
+from app.models.founder import Founder
+from app.models.funding_round import FundingRound
+from app.models.product import Product
+from app.models.social_post import SocialPost
+
+logger = logging.getLogger(__name__)
+
+# (company_id column, change timestamp or None) for every relation the
+# formatter reads; a count/max-timestamp shift marks the document stale.
+# In-place child updates don't show up here, so CompanyService writers also
+# bump Company.updated_at, which is part of the fingerprint.
+_CHILD_STATE = (
+    (Founder.company_id, Founder.updated_at),
+    (FundingRound.company_id, FundingRound.created_at),
+    (Product.company_id, Product.created_at),
+    (Event.company_id, Event.created_at),
+    (DataSource.company_id, DataSource.created_at),
+    (SocialPost.company_id, SocialPost.created_at),
+    (CompanyDigest.company_id, CompanyDigest.generated_at),
+    (CompetitorClient.company_id, None),
+    (company_categories.c.company_id, None),
+)
+
+
+@dataclass
+class ContextDoc:
+    company_id: str
+    name: str
+    is_primary: bool
+    fingerprint: str
+    markdown: str
+    sources: list[dict] = field(default_factory=list)
+
+
+_memory: dict[str, ContextDoc] = {}
+
+
+async def company_fingerprints(
+    session: AsyncSession, company_ids: list[str] | None, limit: int
+) -> list[tuple[str, str, bool, int, str]]:
+    """Return (id, name, is_primary, data_version, fingerprint) per company."""
+    stmt = select(
+        Company.id, Company.name, Company.is_primary, Company.data_version, Company.updated_at
+    )
+    if company_ids is not None:
+        stmt = stmt.where(Company.id.in_(company_ids))
+    else:
+        stmt = stmt.order_by(Company.created_at.desc()).limit(limit)
+    companies = (await session.execute(stmt)).all()
+    if not companies:
+        return []
+    ids = [row.id for row in companies]
+
+    state: dict[str, list[str]] = {cid: [] for cid in ids}
+    for fk, ts in _CHILD_STATE:
+        cols = [fk, func.count()]
+        if ts is not None:
+            cols.append(func.max(ts))
+        rows = await session.execute(select(*cols).where(fk.in_(ids)).group_by(fk))
+        seen = {row[0]: row[1:] for row in rows.all()}
+        for cid in ids:
+            state[cid].append(repr(seen.get(cid)))
+
+    result = []
+    for row in companies:
+        digest = hashlib.sha256(
+            "|".join([str(row.data_version), str(row.updated_at), *state[row.id]]).encode()
+        ).hexdigest()
+        result.append((row.id, row.name, row.is_primary, row.data_version or 0, digest))
+    return result
+
+
+async def get_context_docs(
+    session: AsyncSession,
+    company_ids: list[str] | None = None,
+    limit: int = 100,
+) -> list[ContextDoc]:
+    """Context documents for ``company_ids`` (or the newest ``limit`` companies).
+
+    Documents come back in the same order as the companies were listed;
+    unknown ids are skipped.
+    """
+    from app.intelligence.ask import _format_company_context
+    from app.services.company_service import CompanyService
+
+    listing = await company_fingerprints(session, company_ids, limit)
+    docs: dict[str, ContextDoc] = {}
+
+    stale: dict[str, str] = {}
+    for cid, _name, _primary, _version, fp in listing:
+        hit = _memory.get(cid)
+        if hit is not None and hit.fingerprint == fp:
+            docs[cid] = hit
+        else:
+            stale[cid] = fp
+
+    if stale:
+        stored = await session.execute(
+            select(CompanyContextDoc).where(CompanyContextDoc.company_id.in_(list(stale)))
+        )
+        rows = {row.company_id: row for row in stored.scalars().all()}
+        for cid, name, primary, _version, fp in listing:
+            row = rows.get(cid)
+            if cid in stale and row is not None and row.fingerprint == fp:
+                docs[cid] = _memory[cid] = ContextDoc(
+                    cid, name, primary, fp, row.context_markdown, json.loads(row.sources_json)
+                )
+                del stale[cid]
+
+    if stale:
+        companies = await CompanyService(session).get_comparison_data(list(stale))
+        versions = {cid: version for cid, _n, _p, version, _fp in listing}
+        for company in companies:
+            fp = stale[company.id]
+            doc = ContextDoc(
+                company_id=company.id,
+                name=company.name,
+                is_primary=company.is_primary,
+                fingerprint=fp,
+                markdown=_format_company_context(company),
+                sources=[
+                    {"label": ds.title or ds.url, "url": ds.url}
+                    for ds in company.data_sources
+                ],
+            )
+            await session.merge(
+                CompanyContextDoc(
+                    company_id=company.id,
+                    fingerprint=fp,
+                    data_version=versions[company.id],
+                    context_markdown=doc.markdown,
+                    sources_json=json.dumps(doc.sources),
+                )
+            )
+            docs[company.id] = _memory[company.id] = doc
+        await session.commit()
+        logger.info("Rebuilt %d Ask context document(s)", len(companies))
+
+    return [docs[cid] for cid, *_ in listing if cid in docs]
+
+
+async def get_context_doc(session: AsyncSession, company_id: str) -> ContextDoc | None:
+    docs = await get_context_docs(session, [company_id])
+    return docs[0] if docs else None
+
@@ -0,0 +1,112 @@
+"""Dependency-graph executor for AI pipelines.
+
+Each pipeline is declared as a node with the results it needs (``requires``)
+and an optional sink that persists its output. Independent nodes run
+concurrently; a node only starts once everything it requires has run *and*
+been persisted. Sinks share one ``AsyncSession`` so they are serialized
+behind a lock, while the (slow) LLM calls overlap freely.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelineNode:
+    name: str
+    run: Callable[[dict[str, Any]], Awaitable[Any]]
+    requires: tuple[str, ...] = ()
+    sink: Callable[[Any], Awaitable[None]] | None = None
+    # Nodes whose sinks must be applied before this node's sink, without
+    # delaying this node's run (e.g. product features update discovery's rows).
+    sink_after: tuple[str, ...] = ()
+    # Run holds the session lock (for nodes that read from the DB).
+    uses_session: bool = False
+
+
+def _validate(nodes: list[PipelineNode], inputs: dict[str, Any]) -> None:
+    names = {n.name for n in nodes}
+    if len(names) != len(nodes):
+        raise ValueError("Duplicate pipeline node names")
+    clash = names & inputs.keys()
+    if clash:
+        raise ValueError(f"Node names shadow inputs: {sorted(clash)}")
+
+    known = names | inputs.keys()
+    for node in nodes:
+        missing = [d for d in (*node.requires, *node.sink_after) if d not in known]
+        if missing:
+            raise ValueError(f"Node {node.name!r} depends on unknown {missing}")
+
+    # Kahn's algorithm over node -> node edges to reject cycles up front
+    deps = {
+        n.name: {d for d in (*n.requires, *n.sink_after) if d in names} for n in nodes
+    }
+    ready = [name for name, d in deps.items() if not d]
+    seen = 0
+    while ready:
+        current = ready.pop()
+        seen += 1
+        for name, d in deps.items():
+            if current in d:
+                d.discard(current)
+                if not d:
+                    ready.append(name)
+    if seen != len(nodes):
+        raise ValueError("Pipeline graph contains a cycle")
+
+
+async def execute_pipeline_graph(
+    nodes: list[PipelineNode],
+    inputs: dict[str, Any],
+    *,
+    label: str = "",
+) -> dict[str, Any]:
+    """Run all nodes respecting dependencies; return results keyed by node name.
+
+    Initial ``inputs`` are available to every node under their own keys. The
+    first failing node cancels the rest and its exception is re-raised.
+    """
+    _validate(nodes, inputs)
+
+    lock = asyncio.Lock()
+    results: dict[str, Any] = dict(inputs)
+    done: dict[str, asyncio.Event] = {n.name: asyncio.Event() for n in nodes}
+
+    async def _wait_for(names: tuple[str, ...]) -> None:
+        for name in names:
+            if name in done:
+                await done[name].wait()
+
+    async def _run_node(node: PipelineNode) -> None:
+        await _wait_for(node.requires)
+        logger.info("Running %s for %s ...", node.name, label)
+        args = {name: results[name] for name in node.requires}
+        if node.uses_session:
+            async with lock:
+                output = await node.run(args)
+        else:
+            output = await node.run(args)
+        results[node.name] = output
+
+        if node.sink is not None:
+            await _wait_for(node.sink_after)
+            async with lock:
+                await node.sink(output)
+        done[node.name].set()
+
+    tasks = [asyncio.create_task(_run_node(n), name=n.name) for n in nodes]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return results
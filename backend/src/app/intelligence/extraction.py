@@ -0,0 +1,96 @@
+"""HTML -> text/markdown extraction, run in a bounded process pool.
+
+trafilatura and markdownify are CPU-bound and would otherwise block the
+event loop for every fetched page. This module is deliberately light on
+imports because each pool worker is a spawned interpreter that loads it.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import trafilatura
+from markdownify import markdownify as md
+
+logger = logging.getLogger(__name__)
+
+MIN_EXTRACTED_CHARS = 100
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def html_to_markdown(html: str) -> str:
+    """Convert HTML to clean Markdown."""
+    try:
+        return md(html, heading_style="ATX", strip=["img", "script", "style"])
+    except Exception:
+        return ""
+
+
+def extract_recall(html: str) -> dict[str, str]:
+    """High-recall extraction used for research sources."""
+    text = trafilatura.extract(
+        html,
+        include_comments=False,
+        include_tables=True,
+        favor_recall=True,
+    )
+    if not text or len(text.strip()) <= MIN_EXTRACTED_CHARS:
+        return {"text": "", "markdown": ""}
+    return {"text": text.strip(), "markdown": html_to_markdown(html)}
+
+
+def extract_default(html: str) -> dict[str, str]:
+    """Default extraction plus <title>, used for user-added sources."""
+    title_match = re.search(r"<title[^>]*>([^<]+)</title>", html, re.I)
+    return {
+        "text": trafilatura.extract(html) or "",
+        "markdown": html_to_markdown(html),
+        "title": title_match.group(1).strip() if title_match else "",
+    }
+
+
+EXTRACTORS = {"recall": extract_recall, "default": extract_default}
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        from app.config import settings
+
+        # spawn, not fork: the parent runs an event loop and worker threads
+        _pool = ProcessPoolExecutor(
+            max_workers=max(1, settings.extraction_workers),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+async def extract(html: str, mode: str) -> dict[str, str]:
+    """Run an extractor off the event loop, in the process pool."""
+    global _pool
+    extractor = EXTRACTORS[mode]
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    try:
+        return await loop.run_in_executor(pool, extractor, html)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a pathological page); rebuild next time.
+        # Shut the broken executor down so its surviving workers are reaped,
+        # unless a concurrent call already replaced it.
+        logger.warning("Extraction pool broke; falling back to a thread for this page")
+        pool.shutdown(wait=False, cancel_futures=True)
+        if _pool is pool:
+            _pool = None
+        return await asyncio.to_thread(extractor, html)
+
+
+def shutdown_extraction_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
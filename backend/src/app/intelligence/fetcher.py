@@ -0,0 +1,148 @@
+"""Shared HTTP fetcher for research pages.
+
+One long-lived ``httpx.AsyncClient`` (keep-alive, HTTP/2 when ``h2`` is
+installed) is reused across every enrichment. Requests are bounded globally
+and per host, and bodies are streamed with a size cap so huge pages or PDFs
+are abandoned early instead of buffered whole.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+FETCH_TIMEOUT = 15  # seconds per URL
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+@dataclass
+class FetchedResponse:
+    url: str
+    status_code: int
+    headers: httpx.Headers
+    text: str
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class Fetcher:
+    def __init__(
+        self,
+        max_connections: int,
+        per_host_connections: int,
+        max_body_bytes: int,
+        timeout: float,
+    ):
+        self.max_body_bytes = max_body_bytes
+        self.timeout = timeout
+        self._per_host_connections = per_host_connections
+        self._global = asyncio.Semaphore(max_connections)
+        # Per-host semaphores exist only while some request holds or awaits them
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self._host_users: dict[str, int] = {}
+        self._max_connections = max_connections
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=importlib.util.find_spec("h2") is not None,
+                headers={"User-Agent": USER_AGENT},
+                follow_redirects=True,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str) -> AsyncIterator[None]:
+        host = urlsplit(url).hostname or ""
+        slot = self._hosts.get(host)
+        if slot is None:
+            slot = self._hosts[host] = asyncio.Semaphore(self._per_host_connections)
+        self._host_users[host] = self._host_users.get(host, 0) + 1
+        try:
+            async with slot:
+                yield
+        finally:
+            self._host_users[host] -= 1
+            if not self._host_users[host]:
+                del self._host_users[host]
+                del self._hosts[host]
+
+    async def fetch(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        require_html: bool = False,
+    ) -> FetchedResponse | None:
+        """GET ``url`` under the global and per-host limits.
+
+        Returns None on network errors, when the body exceeds
+        ``max_body_bytes``, or (with ``require_html``) for non-HTML content,
+        all detected before the body is downloaded where possible. Non-200
+        statuses are returned with an empty body.
+        """
+        # Host slot first, so a request queued behind a busy host holds no global slot
+        async with self._host_slot(url), self._global:
+            try:
+                async with self.client.stream("GET", url, headers=headers) as response:
+                    if response.status_code != 200:
+                        return FetchedResponse(url, response.status_code, response.headers, "")
+                    if require_html and "text/html" not in response.headers.get(
+                        "content-type", ""
+                    ):
+                        return None
+                    declared = response.headers.get("content-length")
+                    if declared and declared.isdigit() and int(declared) > self.max_body_bytes:
+                        raise BodyTooLarge(declared)
+
+                    chunks: list[bytes] = []
+                    size = 0
+                    async for chunk in response.aiter_bytes():
+                        size += len(chunk)
+                        if size > self.max_body_bytes:
+                            raise BodyTooLarge(size)
+                        chunks.append(chunk)
+                    body = b"".join(chunks).decode(
+                        response.encoding or "utf-8", errors="replace"
+                    )
+                    return FetchedResponse(url, 200, response.headers, body)
+            except BodyTooLarge as exc:
+                logger.debug(f"Skipping {url}: body over {self.max_body_bytes} bytes ({exc})")
+            except Exception as e:
+                logger.debug(f"Failed to fetch {url}: {e}")
+        return None
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+fetcher = Fetcher(
+    max_connections=settings.fetch_max_connections,
+    per_host_connections=settings.fetch_per_host_connections,
+    max_body_bytes=settings.fetch_max_body_bytes,
+    timeout=FETCH_TIMEOUT,
+)
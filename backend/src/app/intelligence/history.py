@@ -0,0 +1,114 @@
+"""Token-budgeted conversation history for multi-turn Ask.
+
+Recent turns are sent verbatim up to ``conversation_history_token_budget``.
+When the unsummarized tail outgrows the budget, the oldest turns are folded
+into a rolling summary stored on the conversation, so the history sent per
+turn stays bounded no matter how long the conversation gets. Compaction
+trims down to half the budget, so the summary is refreshed every few turns
+rather than on every one. A large backlog (e.g. a conversation from before
+summaries existed) is folded in ``SUMMARY_BATCH_TOKENS`` slices, one
+summarizer call each, so no single call outgrows the model's context.
+"""
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.intelligence.openai_client import chat_completion
+from app.intelligence.prompts import HISTORY_SUMMARY_PROMPT
+from app.models.conversation import Conversation
+from app.models.conversation_message import ConversationMessage
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4  # role and separators per chat message
+SUMMARY_BATCH_TOKENS = 24_000  # turns folded into the summary per LLM call
+
+
+def count_tokens(text: str) -> int:
+    """Local token estimate; close enough for budgeting English prose."""
+    return len(text) // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+async def _summarize(previous: str | None, messages: list[ConversationMessage]) -> str:
+    transcript = "\n\n".join(f"{m.role.upper()}: {m.content}" for m in messages)
+    return await chat_completion([
+        {"role": "system", "content": HISTORY_SUMMARY_PROMPT},
+        {
+            "role": "user",
+            "content": f"EXISTING SUMMARY:\n{previous or '(none)'}\n\nNEW TURNS:\n{transcript}",
+        },
+    ])
+
+
+def _batches(messages: list[ConversationMessage]) -> list[list[ConversationMessage]]:
+    """Split oldest-first ``messages`` into runs of at most SUMMARY_BATCH_TOKENS."""
+    batches: list[list[ConversationMessage]] = [[]]
+    used = 0
+    for m in messages:
+        cost = count_tokens(m.content)
+        if batches[-1] and used + cost > SUMMARY_BATCH_TOKENS:
+            batches.append([])
+            used = 0
+        batches[-1].append(m)
+        used += cost
+    return batches
+
+
+async def build_history(
+    session: AsyncSession, conv: Conversation, budget: int | None = None
+) -> list[dict]:
+    """Chat messages preceding a new question: summary (if any) plus recent turns.
+
+    May update and commit ``conv.summary`` when older turns need compacting.
+    """
+    budget = budget or settings.conversation_history_token_budget
+
+    stmt = (
+        select(ConversationMessage)
+        .where(
+            ConversationMessage.conversation_id == conv.id,
+            ConversationMessage.id > (conv.summary_through_id or 0),
+        )
+        .order_by(ConversationMessage.id.desc())
+    )
+    tail = list((await session.execute(stmt)).scalars().all())  # newest first
+
+    total = sum(count_tokens(m.content) for m in tail)
+    if total > budget:
+        # Keep the newest turns that fit in half the budget, fold the rest
+        kept, used = [], 0
+        for m in tail:
+            cost = count_tokens(m.content)
+            if used + cost > budget // 2:
+                break
+            kept.append(m)
+            used += cost
+        overflow = list(reversed(tail[len(kept):]))
+        try:
+            # Commit per batch so a failure part-way keeps the progress made
+            for batch in _batches(overflow):
+                conv.summary = await _summarize(conv.summary, batch)
+                conv.summary_through_id = batch[-1].id
+                await session.commit()
+            logger.info(
+                "Compacted %d messages of conversation %s into its summary",
+                len(overflow), conv.id,
+            )
+        except Exception:
+            # Without a fresh summary, older turns are simply dropped this time
+            logger.warning("History summary failed for conversation %s", conv.id, exc_info=True)
+        tail = kept
+
+    history: list[dict] = []
+    if conv.summary:
+        history.append({
+            "role": "system",
+            "content": f"SUMMARY OF EARLIER CONVERSATION:\n\n{conv.summary}",
+        })
+    history.extend({"role": m.role, "content": m.content} for m in reversed(tail))
+    return history
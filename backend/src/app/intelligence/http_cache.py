@@ -0,0 +1,147 @@
+"""On-disk HTTP cache for fetched research pages.
+
+Each URL is stored as one JSON file holding the body, its validators
+(ETag / Last-Modified) and any text already extracted from it. Refetches
+send conditional requests; a 304, or a 200 with a byte-identical body,
+reuses the stored extraction instead of re-running trafilatura/markdownify.
+
+The directory is bounded: entries older than ``http_cache_ttl_days`` are
+dropped, then the least recently written or revalidated ones until the
+total size is back under ``http_cache_max_bytes``. A sweep runs on the first write after start
+and whenever the running total crosses the bound.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedPage:
+    url: str
+    body: str
+    etag: str | None = None
+    last_modified: str | None = None
+    stored_at: str = ""
+    # Extraction results keyed by mode, e.g. {"recall": {"text": ..., "markdown": ...}}
+    extracted: dict[str, dict[str, str]] = field(default_factory=dict)
+
+    @property
+    def body_hash(self) -> str:
+        return hashlib.sha256(self.body.encode()).hexdigest()
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+SWEEP_TARGET = 0.8  # sweeps trim down to this share of the size bound
+
+
+class HttpCache:
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self._bytes: int | None = None  # running total; None until first sweep
+        self._sweep_lock = threading.Lock()
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def _load(self, url: str) -> CachedPage | None:
+        path = self._path(url)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return CachedPage(**data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError):
+            logger.debug("Discarding unreadable cache entry for %s", url)
+            path.unlink(missing_ok=True)
+            return None
+
+    def _store(self, page: CachedPage) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        page.stored_at = datetime.now(timezone.utc).isoformat()
+        # Write-then-rename so concurrent readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(asdict(page), fh)
+            size = os.path.getsize(tmp)
+            os.replace(tmp, self._path(page.url))
+        except OSError:
+            logger.warning("Could not write HTTP cache entry for %s", page.url, exc_info=True)
+            Path(tmp).unlink(missing_ok=True)
+            return
+        # Rewrites of an existing entry are over-counted; the sweep recounts exactly
+        with self._sweep_lock:
+            if self._bytes is not None:
+                self._bytes += size
+            if self._bytes is None or self._bytes > settings.http_cache_max_bytes:
+                self._sweep()
+
+    def _touch(self, url: str) -> None:
+        """Mark an entry as fresh after a 304 so sweeps treat it as recent."""
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def _sweep(self) -> None:
+        """Drop expired entries, then the oldest until under the size target."""
+        cutoff = time.time() - settings.http_cache_ttl_days * 86400
+        entries = []
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if stat.st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        target = settings.http_cache_max_bytes * SWEEP_TARGET
+        if total > settings.http_cache_max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+        self._bytes = total
+        if removed:
+            logger.info("HTTP cache sweep removed %d entries (%d bytes kept)", removed, total)
+
+    async def load(self, url: str) -> CachedPage | None:
+        return await asyncio.to_thread(self._load, url)
+
+    async def store(self, page: CachedPage) -> None:
+        await asyncio.to_thread(self._store, page)
+
+    async def touch(self, url: str) -> None:
+        await asyncio.to_thread(self._touch, url)
+
+
+http_cache = HttpCache(settings.http_cache_dir)
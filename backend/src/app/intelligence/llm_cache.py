@@ -0,0 +1,156 @@
+"""Content-addressed cache for structured LLM responses.
+
+Pipelines build deterministic prompts from stored sources, so an identical
+(system prompt, user prompt, response schema, model) tuple always asks the
+same question. Responses are persisted in SQLite and revalidated against the
+Pydantic model on read; any cache failure falls through to a live call.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import TypeVar
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import delete, func, select
+
+from app.config import settings
+from app.models.llm_cache_entry import LlmCacheEntry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+_stats: dict[str, dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def is_enabled(pipeline: str) -> bool:
+    return settings.llm_cache_enabled and pipeline not in settings.llm_cache_bypass
+
+
+def cache_key(
+    system_prompt: str, user_prompt: str, response_model: type[BaseModel], model: str
+) -> str:
+    schema = json.dumps(response_model.model_json_schema(), sort_keys=True)
+    digest = hashlib.sha256()
+    for part in (system_prompt, user_prompt, schema, model):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+async def get(key: str, response_model: type[T], pipeline: str) -> T | None:
+    """Return the cached, validated response or None on miss/expiry."""
+    from app.database import async_session_factory
+
+    try:
+        async with async_session_factory() as session:
+            entry = await session.get(LlmCacheEntry, key)
+            if entry is not None and entry.created_at < _now() - timedelta(
+                hours=settings.llm_cache_ttl_hours
+            ):
+                await session.delete(entry)
+                await session.commit()
+                entry = None
+            if entry is None:
+                _stats[pipeline]["misses"] += 1
+                return None
+
+            value = response_model.model_validate_json(entry.response_json)
+            entry.hit_count += 1
+            entry.last_used_at = _now()
+            await session.commit()
+    except ValidationError:
+        # Schema drifted under the same hash (e.g. validators changed)
+        logger.info("Discarding stale %s cache entry %s", pipeline, key[:12])
+        await invalidate(key)
+        _stats[pipeline]["misses"] += 1
+        return None
+    except Exception:
+        logger.warning("LLM cache read failed for %s", pipeline, exc_info=True)
+        _stats[pipeline]["misses"] += 1
+        return None
+
+    _stats[pipeline]["hits"] += 1
+    return value
+
+
+async def put(key: str, value: BaseModel, pipeline: str, model: str) -> None:
+    """Store a response, evicting least-recently-used entries over the size bound."""
+    from app.database import async_session_factory
+
+    try:
+        async with async_session_factory() as session:
+            now = _now()
+            await session.merge(
+                LlmCacheEntry(
+                    key=key,
+                    pipeline=pipeline,
+                    model=model,
+                    response_json=value.model_dump_json(),
+                    hit_count=0,
+                    last_used_at=now,
+                    created_at=now,
+                )
+            )
+            await session.flush()
+
+            count = await session.scalar(select(func.count()).select_from(LlmCacheEntry))
+            overflow = (count or 0) - settings.llm_cache_max_entries
+            if overflow > 0:
+                oldest = (
+                    select(LlmCacheEntry.key)
+                    .order_by(LlmCacheEntry.last_used_at)
+                    .limit(overflow)
+                )
+                await session.execute(
+                    delete(LlmCacheEntry).where(LlmCacheEntry.key.in_(oldest))
+                )
+            await session.commit()
+    except Exception:
+        logger.warning("LLM cache write failed for %s", pipeline, exc_info=True)
+
+
+async def invalidate(key: str | None = None) -> int:
+    """Delete one entry, or the whole cache when ``key`` is None."""
+    from app.database import async_session_factory
+
+    async with async_session_factory() as session:
+        stmt = delete(LlmCacheEntry)
+        if key is not None:
+            stmt = stmt.where(LlmCacheEntry.key == key)
+        result = await session.execute(stmt)
+        await session.commit()
+        return result.rowcount or 0
+
+
+async def get_stats() -> dict:
+    """Hit/miss counters since process start plus stored entries per pipeline."""
+    from app.database import async_session_factory
+
+    async with async_session_factory() as session:
+        rows = await session.execute(
+            select(LlmCacheEntry.pipeline, func.count()).group_by(LlmCacheEntry.pipeline)
+        )
+        stored = {pipeline: count for pipeline, count in rows.all()}
+
+    pipelines = sorted(set(stored) | set(_stats))
+    return {
+        "enabled": settings.llm_cache_enabled,
+        "bypass": list(settings.llm_cache_bypass),
+        "pipelines": {
+            name: {
+                "hits": _stats[name]["hits"] if name in _stats else 0,
+                "misses": _stats[name]["misses"] if name in _stats else 0,
+                "entries": stored.get(name, 0),
+            }
+            for name in pipelines
+        },
+    }
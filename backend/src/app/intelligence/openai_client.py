@@ -1,48 +1,112 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
 from typing import TypeVar
 
+import httpx
 from openai import AsyncOpenAI
 from pydantic import BaseModel
 
 from app.config import settings
+from app.intelligence import llm_cache
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseModel)
 
 
-async def _get_api_key() -> str:
-    """Resolve API key: DB first, then env var fallback."""
+_http_client: httpx.AsyncClient | None = None
+_clients: dict[str, AsyncOpenAI] = {}
+_resolved: tuple[str, str] | None = None  # (api_key, model)
+_generation = 0  # bumped by invalidate_settings_cache
+_resolve_lock = asyncio.Lock()
+
+
+async def _load_settings() -> tuple[str, str, bool]:
+    """Resolve API key and model: DB first, then env var fallback.
+
+    The flag is False when the DB could not be read, so the env fallback
+    is used for this call but not cached.
+    """
+    api_key, model = settings.openai_api_key, settings.openai_model
     try:
         from app.database import async_session_factory
         from app.services.settings_service import SettingsService
 
         async with async_session_factory() as session:
             svc = SettingsService(session)
-            db_key = await svc.get_openai_api_key()
-            if db_key:
-                return db_key
-    except Exception:
-        pass
-    return settings.openai_api_key
+            api_key = await svc.get_openai_api_key() or api_key
+            model = await svc.get_openai_model() or model
+    except Exception as exc:
+        logger.warning("Could not read OpenAI settings from the database: %s", exc)
+        return api_key, model, False
+    return api_key, model, True
+
+
+async def _resolve() -> tuple[str, str]:
+    """Cached (api_key, model); reloaded after ``invalidate_settings_cache``.
+
+    A load only populates the cache if no invalidation happened while it
+    was reading, so a settings change can't be overwritten by an older read.
+    """
+    global _resolved
+    if _resolved is not None:
+        return _resolved
+    async with _resolve_lock:
+        if _resolved is not None:
+            return _resolved
+        generation = _generation
+        api_key, model, cacheable = await _load_settings()
+        if cacheable and generation == _generation:
+            _resolved = (api_key, model)
+        return api_key, model
+
+
+async def _get_api_key() -> str:
+    return (await _resolve())[0]
 
 
 async def _get_model() -> str:
-    """Resolve model: DB first, then env var fallback."""
-    try:
-        from app.database import async_session_factory
-        from app.services.settings_service import SettingsService
+    return (await _resolve())[1]
 
-        async with async_session_factory() as session:
-            svc = SettingsService(session)
-            db_model = await svc.get_openai_model()
-            if db_model:
-                return db_model
-    except Exception:
-        pass
-    return settings.openai_model
+
+def invalidate_settings_cache() -> None:
+    """Drop cached credentials so the next call re-reads settings.
+
+    Per-key clients are released; the shared HTTP connection pool is kept.
+    """
+    global _resolved, _generation
+    _generation += 1
+    _resolved = None
+    _clients.clear()
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(600.0, connect=10.0),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return _http_client
 
 
 def _get_client(api_key: str) -> AsyncOpenAI:
-    """Create a fresh client with the given API key."""
-    return AsyncOpenAI(api_key=api_key)
+    """Process-wide client per API key, all sharing one pooled transport."""
+    client = _clients.get(api_key)
+    if client is None:
+        client = AsyncOpenAI(api_key=api_key, http_client=_get_http_client())
+        _clients[api_key] = client
+    return client
+
+
+async def close_clients() -> None:
+    """Close the shared HTTP pool (on application shutdown)."""
+    global _http_client
+    _clients.clear()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
 async def structured_completion(
@@ -50,11 +114,27 @@ async def structured_completion(
     user_prompt: str,
     response_model: type[T],
     model: str | None = None,
+    pipeline: str = "default",
+    use_cache: bool = True,
 ) -> T:
-    """Call OpenAI with structured output, returning a validated Pydantic model."""
+    """Call OpenAI with structured output, returning a validated Pydantic model.
+
+    Identical requests are answered from the LLM response cache unless
+    ``use_cache`` is False or ``pipeline`` is listed in ``llm_cache_bypass``.
+    """
+    resolved_model = model or await _get_model()
+
+    cache_key = None
+    if use_cache and llm_cache.is_enabled(pipeline):
+        cache_key = llm_cache.cache_key(
+            system_prompt, user_prompt, response_model, resolved_model
+        )
+        cached = await llm_cache.get(cache_key, response_model, pipeline)
+        if cached is not None:
+            return cached
+
     api_key = await _get_api_key()
     client = _get_client(api_key)
-    resolved_model = model or await _get_model()
 
     completion = await client.beta.chat.completions.parse(
         model=resolved_model,
@@ -67,6 +147,8 @@ async def structured_completion(
     parsed = completion.choices[0].message.parsed
     if parsed is None:
         raise ValueError("OpenAI returned no parsed response")
+    if cache_key is not None:
+        await llm_cache.put(cache_key, parsed, pipeline, resolved_model)
     return parsed
 
 
@@ -85,3 +167,29 @@ async def chat_completion(
     )
     content = response.choices[0].message.content
     return content or ""
+
+
+async def stream_chat_completion(
+    messages: list[dict],
+    model: str | None = None,
+) -> AsyncIterator[str]:
+    """Chat completion streamed as content deltas, for SSE endpoints.
+
+    Closing the generator early (e.g. the client disconnected) closes the
+    upstream OpenAI stream so generation stops being billed.
+    """
+    api_key = await _get_api_key()
+    client = _get_client(api_key)
+    resolved_model = model or await _get_model()
+
+    stream = await client.chat.completions.create(
+        model=resolved_model,
+        messages=messages,
+        stream=True,
+    )
+    try:
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        await stream.close()
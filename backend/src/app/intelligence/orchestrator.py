@@ -8,15 +8,24 @@ from datetime import datetime, timezone
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
+from app.config import settings
 from app.database import async_session
-from app.intelligence.pipelines.company_digest import run_company_digest
-from app.intelligence.pipelines.crosscheck import run_crosscheck
+from app.intelligence.executor import PipelineNode, execute_pipeline_graph
+from app.intelligence.pipelines.client_intelligence import run_client_intelligence
+from app.intelligence.pipelines.company_digest import (
+    run_company_digest,
+    run_company_digest_update,
+)
+from app.intelligence.pipelines.crosscheck import run_crosscheck, run_crosscheck_update
 from app.intelligence.pipelines.discovery import run_discovery
 from app.intelligence.pipelines.event_extraction import run_event_extraction
 from app.intelligence.pipelines.market_intel import run_market_intel
 from app.intelligence.pipelines.media_fingerprint import run_media_fingerprint
 from app.intelligence.pipelines.product_features import run_product_features
-from app.intelligence.pipelines.social_digest import run_social_digest
+from app.intelligence.pipelines.social_digest import (
+    run_social_digest,
+    run_social_digest_update,
+)
 from app.intelligence.research import (
     ResearchContext,
     SearchResult,
@@ -83,83 +92,15 @@ async def run_full_enrichment(company_id: str) -> None:
             await _store_social_results(session, company_id, "twitter", twitter_results)
             await _store_social_results(session, company_id, "hackernews", hn_results)
 
-            # -- Step 5: Run existing 4 pipelines --
-            logger.info("Running discovery pipeline for %s ...", company_name)
-            discovery = await run_discovery(company_name, web_context)
-            await service.apply_discovery(company_id, discovery)
-
-            # Re-gather founder names after discovery populated them
-            company = await service.get_by_id(company_id)
-            if company and company.founders:
-                founder_names = [f.name for f in company.founders]
-
-            logger.info("Running media fingerprint for %s ...", company_name)
-            fingerprint = await run_media_fingerprint(company_name, web_context)
-            await service.apply_media_fingerprint(company_id, fingerprint)
-
-            logger.info("Running event extraction for %s ...", company_name)
-            events = await run_event_extraction(company_name, web_context)
-            await service.apply_events(company_id, events)
-
-            logger.info("Running market intel for %s ...", company_name)
-            intel = await run_market_intel(company_name, web_context)
-            await service.apply_market_intel(company_id, intel)
-
-            # -- Step 5b: Client Intelligence pipeline (with dedicated search) --
-            logger.info("Running dedicated client search for %s ...", company_name)
-            import asyncio
-            client_search_results = await asyncio.to_thread(
-                search_company_clients, company_name, company.domain if company else None
-            )
-            client_docs = await fetch_and_extract(client_search_results)
-            # Also scrape the company's own client-related pages
-            company = await service.get_by_id(company_id)
-            if company and company.domain:
-                website_client_docs = await fetch_company_client_pages(company.domain)
-                client_docs.extend(website_client_docs)
-            # Build enriched context for client intelligence
-            client_context = ResearchContext(
-                sources=web_context.sources + client_docs
-            )
-            logger.info("Running client intelligence for %s (%d client sources)...",
-                        company_name, len(client_docs))
-            from app.intelligence.pipelines.client_intelligence import run_client_intelligence
-            client_intel = await run_client_intelligence(company_name, client_context)
-            await service.apply_client_intelligence(company_id, client_intel)
-
-            # -- Step 6: Product features pipeline --
-            logger.info("Running product features extraction for %s ...", company_name)
-            features_result = await run_product_features(company_name, web_context)
-            await service.apply_product_features(company_id, features_result)
-
-            # -- Step 7: Social digest pipeline --
+            # -- Step 5: All AI pipelines, concurrently where independent --
             social_content = _build_social_content(
                 linkedin_results, twitter_results, hn_results
             )
-            if social_content.strip():
-                logger.info("Running social digest for %s ...", company_name)
-                social_digest_result = await run_social_digest(
-                    company_name, social_content
-                )
-                social_md = _social_digest_to_markdown(social_digest_result)
-                await service.store_digest(company_id, social_md, "social")
-
-            # -- Step 8: Company digest (GPT-4.1, cross-references ALL data) --
-            logger.info("Running company digest for %s ...", company_name)
-            company = await service.get_by_id(company_id)
-            all_context = _build_full_context(company, web_context) if company else ""
-            if all_context.strip():
-                digest_result = await run_company_digest(company_name, all_context)
-                full_md = _digest_to_markdown(digest_result)
-                await service.store_digest(company_id, full_md, "full")
-
-            # -- Step 9: 360° Crosscheck (final validation) --
-            logger.info("Running 360° crosscheck for %s ...", company_name)
-            if all_context.strip():
-                crosscheck_result = await run_crosscheck(company_name, all_context)
-                crosscheck_md = _crosscheck_to_markdown(crosscheck_result)
-                await service.store_digest(company_id, crosscheck_md, "crosscheck")
-                await service.apply_crosscheck(company_id, crosscheck_result)
+            await execute_pipeline_graph(
+                _enrichment_nodes(service, company_id, company_name),
+                {"web_context": web_context, "social_content": social_content},
+                label=company_name,
+            )
 
             # Bump version and set enrichment timestamp
             co_stmt = select(Company).where(Company.id == company_id)
@@ -192,40 +133,15 @@ async def rerun_with_sources(company_id: str) -> None:
 
         await service.set_status(company_id, "running")
         try:
-            # Build context from all stored data sources
-            source_texts = []
-            for ds in company.data_sources:
-                header = f"[Source: {ds.title or ds.url}]\nURL: {ds.url}\n"
-                content = ds.raw_content or ds.content_snippet or ""
-                if content:
-                    source_texts.append(header + content[:5000])
-
-            # Build social context
-            social_texts = []
-            for post in company.social_posts:
-                social_texts.append(
-                    f"[{post.platform}] {post.author or 'Unknown'}: "
-                    f"{post.content or post.url}"
-                )
-
-            # Build full context
-            web_text = "\n\n---\n\n".join(source_texts)
-            social_text = "\n".join(social_texts)
-
-            all_context = _build_full_context_from_company(company, web_text, social_text)
+            all_context = _build_stored_full_context(company)
 
             if all_context.strip():
                 logger.info("Re-running digest for %s ...", company.name)
-                digest_result = await run_company_digest(company.name, all_context)
-                full_md = _digest_to_markdown(digest_result)
-                await service.store_digest(company_id, full_md, "full")
-
-                # 360° Crosscheck
-                logger.info("Running 360° crosscheck for %s ...", company.name)
-                crosscheck_result = await run_crosscheck(company.name, all_context)
-                crosscheck_md = _crosscheck_to_markdown(crosscheck_result)
-                await service.store_digest(company_id, crosscheck_md, "crosscheck")
-                await service.apply_crosscheck(company_id, crosscheck_result)
+                await execute_pipeline_graph(
+                    _digest_nodes(service, company_id, company.name, social=False),
+                    {"full_context": all_context},
+                    label=company.name,
+                )
 
             await service.set_status(company_id, "enriched")
             logger.info("Rerun complete for %s", company.name)
@@ -308,57 +224,45 @@ async def run_incremental_update(company_id: str) -> None:
                 new_source_count, new_social_count, company_name,
             )
 
-            # Step 6: If new data found, re-run digests with ALL data (old + new)
+            # Step 6: If new data found, update digests with the new data
+            # (or regenerate them from ALL data when the delta is large)
             if new_source_count > 0 or new_social_count > 0:
-                await service.clear_digests(company_id)
-
-                # Reload company with all data
+                # Reload company with all data; expire first, or the identity
+                # map keeps the collections loaded before the new rows were stored
+                session.expire(company)
                 company = await service.get_by_id(company_id)
                 if company:
-                    source_texts = []
-                    for ds in company.data_sources:
-                        header = f"[Source: {ds.title or ds.url}]\nURL: {ds.url}\n"
-                        content = ds.raw_content or ds.content_snippet or ""
-                        if content:
-                            source_texts.append(header + content[:5000])
-
-                    social_texts = []
-                    for post in company.social_posts:
-                        social_texts.append(
-                            f"[{post.platform}] {post.author or 'Unknown'}: "
-                            f"{post.content or post.url}"
-                        )
-
-                    web_text = "\n\n---\n\n".join(source_texts)
-                    social_text = "\n".join(social_texts)
-
-                    # Social digest
-                    if social_text.strip():
-                        logger.info("Re-running social digest for %s ...", company_name)
-                        social_digest_result = await run_social_digest(
-                            company_name, social_text
-                        )
-                        social_md = _social_digest_to_markdown(social_digest_result)
-                        await service.store_digest(company_id, social_md, "social")
-
-                    # Full company digest
-                    all_context = _build_full_context_from_company(
-                        company, web_text, social_text
+                    previous = {d.digest_type: d.digest_markdown for d in company.digests}
+                    # Format the just-stored posts exactly as the stored text does
+                    new_social_urls = {r.url for r in new_linkedin + new_twitter + new_hn}
+                    new_social_text = _format_social_posts(
+                        post for post in company.social_posts if post.url in new_social_urls
+                    )
+                    new_web_text = _format_source_texts(
+                        (src.title or src.url, src.url, src.content) for src in new_sources
+                    )
+                    stored_web_text = _build_stored_web_text(company)
+                    stored_social_text = _build_stored_social_text(company)
+                    logger.info("Updating digests for %s ...", company_name)
+                    await execute_pipeline_graph(
+                        _digest_nodes(service, company_id, company_name, previous=previous),
+                        {
+                            "full_context": _build_full_context_from_company(
+                                company, stored_web_text, stored_social_text
+                            ),
+                            "social_content": stored_social_text,
+                            # The profile header goes in the prompt but is not new data
+                            "new_context": _build_full_context_from_company(
+                                company, new_web_text, new_social_text
+                            ),
+                            "new_social_content": new_social_text,
+                            "new_source_chars": len(new_web_text) + len(new_social_text),
+                            "stored_source_chars": (
+                                len(stored_web_text) + len(stored_social_text)
+                            ),
+                        },
+                        label=company_name,
                     )
-                    if all_context.strip():
-                        logger.info("Re-running company digest for %s ...", company_name)
-                        digest_result = await run_company_digest(
-                            company_name, all_context
-                        )
-                        full_md = _digest_to_markdown(digest_result)
-                        await service.store_digest(company_id, full_md, "full")
-
-                        # 360° Crosscheck
-                        logger.info("Running 360° crosscheck for %s ...", company_name)
-                        crosscheck_result = await run_crosscheck(company_name, all_context)
-                        crosscheck_md = _crosscheck_to_markdown(crosscheck_result)
-                        await service.store_digest(company_id, crosscheck_md, "crosscheck")
-                        await service.apply_crosscheck(company_id, crosscheck_result)
             else:
                 logger.info("No new data found for %s, skipping digest rerun", company_name)
 
@@ -400,72 +304,11 @@ async def run_intelligence_rerun(company_id: str) -> None:
 
         await service.set_status(company_id, "running")
         try:
-            # -- Run all 6 AI pipelines --
-            logger.info("Re-running discovery for %s ...", company_name)
-            discovery = await run_discovery(company_name, web_context)
-            await service.apply_discovery(company_id, discovery)
-
-            company = await service.get_by_id(company_id)
-
-            logger.info("Re-running media fingerprint for %s ...", company_name)
-            fingerprint = await run_media_fingerprint(company_name, web_context)
-            await service.apply_media_fingerprint(company_id, fingerprint)
-
-            logger.info("Re-running event extraction for %s ...", company_name)
-            events = await run_event_extraction(company_name, web_context)
-            await service.apply_events(company_id, events)
-
-            logger.info("Re-running market intel for %s ...", company_name)
-            intel = await run_market_intel(company_name, web_context)
-            await service.apply_market_intel(company_id, intel)
-
-            # Dedicated client search + enriched context
-            import asyncio
-            company = await service.get_by_id(company_id)
-            client_search_results = await asyncio.to_thread(
-                search_company_clients, company_name,
-                company.domain if company else None,
-            )
-            client_docs = await fetch_and_extract(client_search_results)
-            if company and company.domain:
-                website_client_docs = await fetch_company_client_pages(company.domain)
-                client_docs.extend(website_client_docs)
-            client_context = ResearchContext(
-                sources=web_context.sources + client_docs
+            await execute_pipeline_graph(
+                _enrichment_nodes(service, company_id, company_name),
+                {"web_context": web_context, "social_content": social_content},
+                label=company_name,
             )
-            logger.info("Re-running client intelligence for %s (%d client sources)...",
-                        company_name, len(client_docs))
-            from app.intelligence.pipelines.client_intelligence import run_client_intelligence
-            client_intel = await run_client_intelligence(company_name, client_context)
-            await service.apply_client_intelligence(company_id, client_intel)
-
-            logger.info("Re-running product features for %s ...", company_name)
-            features_result = await run_product_features(company_name, web_context)
-            await service.apply_product_features(company_id, features_result)
-
-            # -- Social digest --
-            if social_content.strip():
-                logger.info("Re-running social digest for %s ...", company_name)
-                social_digest_result = await run_social_digest(company_name, social_content)
-                social_md = _social_digest_to_markdown(social_digest_result)
-                await service.store_digest(company_id, social_md, "social")
-
-            # -- Company digest --
-            logger.info("Re-running company digest for %s ...", company_name)
-            company = await service.get_by_id(company_id)
-            all_context = _build_full_context(company, web_context) if company else ""
-            if all_context.strip():
-                digest_result = await run_company_digest(company_name, all_context)
-                full_md = _digest_to_markdown(digest_result)
-                await service.store_digest(company_id, full_md, "full")
-
-            # -- 360° Crosscheck --
-            logger.info("Running 360° crosscheck for %s ...", company_name)
-            if all_context.strip():
-                crosscheck_result = await run_crosscheck(company_name, all_context)
-                crosscheck_md = _crosscheck_to_markdown(crosscheck_result)
-                await service.store_digest(company_id, crosscheck_md, "crosscheck")
-                await service.apply_crosscheck(company_id, crosscheck_result)
 
             await service.set_status(company_id, "enriched")
             logger.info("Intelligence rerun complete for %s", company_name)
@@ -475,9 +318,238 @@ async def run_intelligence_rerun(company_id: str) -> None:
             await service.set_status(company_id, "error")
 
 
+# -- Pipeline graphs -----------------------------------------------------------
+
+
+def _enrichment_nodes(
+    service: CompanyService, company_id: str, company_name: str
+) -> list[PipelineNode]:
+    """All AI pipelines over ``web_context`` / ``social_content``, then digests.
+
+    Discovery, media fingerprint, events, market intel and product features
+    only read the web context and run side by side. Client intelligence waits
+    for discovery (it needs the domain for its dedicated search), and the
+    digest + crosscheck wait until every analysis has been persisted.
+    """
+
+    async def _client_context(args) -> ResearchContext:
+        domain = args["discovery"].domain
+        client_search_results = await search_company_clients(company_name, domain)
+        client_docs = await fetch_and_extract(client_search_results)
+        # Also scrape the company's own client-related pages
+        if domain:
+            client_docs.extend(await fetch_company_client_pages(domain))
+        logger.info("Collected %d client sources for %s", len(client_docs), company_name)
+        return ResearchContext(sources=args["web_context"].sources + client_docs)
+
+    async def _full_context(args) -> str:
+        company = await service.get_by_id(company_id)
+        return _build_full_context(company, args["web_context"]) if company else ""
+
+    analysis = [
+        PipelineNode(
+            "discovery",
+            lambda a: run_discovery(company_name, a["web_context"]),
+            requires=("web_context",),
+            sink=lambda r: service.apply_discovery(company_id, r),
+        ),
+        PipelineNode(
+            "media_fingerprint",
+            lambda a: run_media_fingerprint(company_name, a["web_context"]),
+            requires=("web_context",),
+            sink=lambda r: service.apply_media_fingerprint(company_id, r),
+        ),
+        PipelineNode(
+            "event_extraction",
+            lambda a: run_event_extraction(company_name, a["web_context"]),
+            requires=("web_context",),
+            sink=lambda r: service.apply_events(company_id, r),
+        ),
+        PipelineNode(
+            "market_intel",
+            lambda a: run_market_intel(company_name, a["web_context"]),
+            requires=("web_context",),
+            sink=lambda r: service.apply_market_intel(company_id, r),
+        ),
+        PipelineNode(
+            "client_context",
+            _client_context,
+            requires=("web_context", "discovery"),
+        ),
+        PipelineNode(
+            "client_intelligence",
+            lambda a: run_client_intelligence(company_name, a["client_context"]),
+            requires=("client_context",),
+            sink=lambda r: service.apply_client_intelligence(company_id, r),
+        ),
+        PipelineNode(
+            "product_features",
+            lambda a: run_product_features(company_name, a["web_context"]),
+            requires=("web_context",),
+            sink=lambda r: service.apply_product_features(company_id, r),
+            # Features attach to the products discovery creates
+            sink_after=("discovery",),
+        ),
+    ]
+    full_context = PipelineNode(
+        "full_context",
+        _full_context,
+        requires=("web_context", *(n.name for n in analysis if n.sink)),
+        uses_session=True,
+    )
+    return [*analysis, full_context, *_digest_nodes(service, company_id, company_name)]
+
+
+def _digest_nodes(
+    service: CompanyService,
+    company_id: str,
+    company_name: str,
+    social: bool = True,
+    previous: dict[str, str] | None = None,
+) -> list[PipelineNode]:
+    """Social digest, company digest and crosscheck; all three are independent.
+
+    Expects ``full_context`` (and ``social_content`` when ``social``) to be
+    provided as graph inputs or upstream nodes. Empty inputs skip the call.
+
+    With ``previous`` (digest markdown by type), also expects ``new_context``,
+    ``new_social_content`` and the sizes ``new_source_chars`` and
+    ``stored_source_chars`` (sources and posts only, without the profile
+    header): each digest is then updated from its previous version and the
+    new data alone, unless it has no previous version or the new material
+    exceeds ``digest_delta_max_ratio`` of the stored material, in which case
+    it is regenerated. Digests replace only their own type, so a failed
+    update keeps the earlier one.
+    """
+    delta = previous is not None
+    store = service.replace_digest if delta else service.store_digest
+
+    def _base(digest_type: str, new_chars: int, stored_chars: int) -> str | None:
+        """Previous digest to update, or None to regenerate from all stored data."""
+        prior = (previous or {}).get(digest_type)
+        if prior and new_chars > settings.digest_delta_max_ratio * stored_chars:
+            logger.info(
+                "New data for %s is too large for a %s update, regenerating",
+                company_name, digest_type,
+            )
+            return None
+        return prior
+
+    async def _social_digest(args):
+        if not args["social_content"].strip():
+            return None
+        if delta:
+            new = args["new_social_content"]
+            prior = _base("social", len(new), len(args["social_content"]))
+            if prior and not new.strip():
+                return None  # nothing new on social, keep the current digest
+            if prior:
+                return await run_social_digest_update(company_name, prior, new)
+        return await run_social_digest(company_name, args["social_content"])
+
+    async def _company_digest(args):
+        if not args["full_context"].strip():
+            return None
+        if delta:
+            prior = _base("full", args["new_source_chars"], args["stored_source_chars"])
+            if prior:
+                return await run_company_digest_update(company_name, prior, args["new_context"])
+        return await run_company_digest(company_name, args["full_context"])
+
+    async def _crosscheck(args):
+        if not args["full_context"].strip():
+            return None
+        if delta:
+            prior = _base(
+                "crosscheck", args["new_source_chars"], args["stored_source_chars"]
+            )
+            if prior:
+                return await run_crosscheck_update(company_name, prior, args["new_context"])
+        return await run_crosscheck(company_name, args["full_context"])
+
+    async def _store_social_digest(result) -> None:
+        if result is not None:
+            await store(company_id, _social_digest_to_markdown(result), "social")
+
+    async def _store_company_digest(result) -> None:
+        if result is not None:
+            await store(company_id, _digest_to_markdown(result), "full")
+
+    async def _store_crosscheck(result) -> None:
+        if result is not None:
+            await store(company_id, _crosscheck_to_markdown(result), "crosscheck")
+            await service.apply_crosscheck(company_id, result)
+
+    context_inputs = (
+        ("full_context", "new_context", "new_source_chars", "stored_source_chars")
+        if delta else ("full_context",)
+    )
+    nodes = [
+        PipelineNode(
+            "company_digest",
+            _company_digest,
+            requires=context_inputs,
+            sink=_store_company_digest,
+        ),
+        PipelineNode(
+            "crosscheck",
+            _crosscheck,
+            requires=context_inputs,
+            sink=_store_crosscheck,
+        ),
+    ]
+    if social:
+        nodes.insert(0, PipelineNode(
+            "social_digest",
+            _social_digest,
+            requires=(
+                ("social_content", "new_social_content") if delta else ("social_content",)
+            ),
+            sink=_store_social_digest,
+        ))
+    return nodes
+
+
 # -- Helper functions ----------------------------------------------------------
 
 
+def _build_stored_full_context(company: Company) -> str:
+    """Full digest context from the company's stored sources and social posts."""
+    return _build_full_context_from_company(
+        company, _build_stored_web_text(company), _build_stored_social_text(company)
+    )
+
+
+def _build_stored_web_text(company: Company) -> str:
+    """The company's stored web sources, as fed to the digests."""
+    return _format_source_texts(
+        (ds.title or ds.url, ds.url, ds.raw_content or ds.content_snippet or "")
+        for ds in company.data_sources
+    )
+
+
+def _format_source_texts(sources) -> str:
+    """Web sources as fed to the digests, from (title, url, content) tuples."""
+    source_texts = []
+    for title, url, content in sources:
+        if content:
+            source_texts.append(f"[Source: {title}]\nURL: {url}\n" + content[:5000])
+    return "\n\n---\n\n".join(source_texts)
+
+
+def _format_social_posts(posts) -> str:
+    """One line per social post, as fed to the social digest."""
+    return "\n".join(
+        f"[{post.platform}] {post.author or 'Unknown'}: {post.content or post.url}"
+        for post in posts
+    )
+
+
+def _build_stored_social_text(company: Company) -> str:
+    """Every stored social post, as fed to the social digest on rerun."""
+    return _format_social_posts(company.social_posts)
+
+
 async def _store_social_results(
     session, company_id: str, platform: str, results: list[SearchResult]
 ) -> None:
@@ -893,6 +965,7 @@ async def run_suggestions_generation(company_id: str) -> None:
             user_prompt=context,
             response_model=SuggestionsResult,
             model="gpt-5.2",
+            pipeline="suggestions",
         )
 
         # Store as JSON in a digest
@@ -18,4 +18,5 @@ async def run_client_intelligence(
             f"SOURCE INDEX:\n{research_context.source_summary}"
         ),
         response_model=ClientIntelligenceResult,
+        pipeline="client_intelligence",
     )
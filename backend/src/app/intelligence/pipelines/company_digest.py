@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from app.intelligence.openai_client import structured_completion
-from app.intelligence.prompts import COMPANY_DIGEST_SYSTEM_PROMPT
+from app.intelligence.prompts import COMPANY_DIGEST_SYSTEM_PROMPT, DIGEST_UPDATE_PROMPT
 from app.intelligence.schemas import CompanyDigestResult
 
 
@@ -17,4 +17,22 @@ async def run_company_digest(
         ),
         response_model=CompanyDigestResult,
         model="gpt-5.2",
+        pipeline="company_digest",
+    )
+
+
+async def run_company_digest_update(
+    company_name: str, previous_markdown: str, new_context: str
+) -> CompanyDigestResult:
+    """Fold new data into an existing company digest."""
+    return await structured_completion(
+        system_prompt=COMPANY_DIGEST_SYSTEM_PROMPT + DIGEST_UPDATE_PROMPT,
+        user_prompt=(
+            f"Company: {company_name}\n\n"
+            f"PREVIOUS ANALYSIS:\n{previous_markdown}\n\n"
+            f"NEW DATA:\n{new_context}"
+        ),
+        response_model=CompanyDigestResult,
+        model="gpt-5.2",
+        pipeline="company_digest_update",
     )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from app.intelligence.openai_client import structured_completion
-from app.intelligence.prompts import CROSSCHECK_SYSTEM_PROMPT
+from app.intelligence.prompts import CROSSCHECK_SYSTEM_PROMPT, DIGEST_UPDATE_PROMPT
 from app.intelligence.schemas import CrossCheckResult
 
 
@@ -17,4 +17,22 @@ async def run_crosscheck(
         ),
         response_model=CrossCheckResult,
         model="gpt-5.2",
+        pipeline="crosscheck",
+    )
+
+
+async def run_crosscheck_update(
+    company_name: str, previous_markdown: str, new_context: str
+) -> CrossCheckResult:
+    """Re-validate an existing crosscheck against newly collected data."""
+    return await structured_completion(
+        system_prompt=CROSSCHECK_SYSTEM_PROMPT + DIGEST_UPDATE_PROMPT,
+        user_prompt=(
+            f"Company: {company_name}\n\n"
+            f"PREVIOUS ANALYSIS:\n{previous_markdown}\n\n"
+            f"NEW DATA:\n{new_context}"
+        ),
+        response_model=CrossCheckResult,
+        model="gpt-5.2",
+        pipeline="crosscheck_update",
     )
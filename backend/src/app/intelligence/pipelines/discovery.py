@@ -15,4 +15,5 @@ async def run_discovery(
             f"SOURCE INDEX:\n{research_context.source_summary}"
         ),
         response_model=CompanyDiscoveryResult,
+        pipeline="discovery",
     )
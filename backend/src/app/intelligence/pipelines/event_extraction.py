@@ -15,4 +15,5 @@ async def run_event_extraction(
             f"SOURCE INDEX:\n{research_context.source_summary}"
         ),
         response_model=EventExtractionResult,
+        pipeline="event_extraction",
     )
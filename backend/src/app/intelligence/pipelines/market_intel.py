@@ -15,4 +15,5 @@ async def run_market_intel(
             f"SOURCE INDEX:\n{research_context.source_summary}"
         ),
         response_model=MarketIntelligence,
+        pipeline="market_intel",
     )
@@ -15,4 +15,5 @@ async def run_media_fingerprint(
             f"SOURCE INDEX:\n{research_context.source_summary}"
         ),
         response_model=MediaFingerprint,
+        pipeline="media_fingerprint",
     )
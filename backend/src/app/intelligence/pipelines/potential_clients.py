@@ -14,4 +14,5 @@ async def run_potential_clients_research(
         system_prompt=POTENTIAL_CLIENTS_SYSTEM_PROMPT,
         user_prompt=competitor_context,
         response_model=PotentialClientsResult,
+        pipeline="potential_clients",
     )
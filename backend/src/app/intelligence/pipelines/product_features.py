@@ -18,4 +18,5 @@ async def run_product_features(
             f"SOURCE INDEX:\n{research_context.source_summary}"
         ),
         response_model=ProductFeaturesResult,
+        pipeline="product_features",
     )
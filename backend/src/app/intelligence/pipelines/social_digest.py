@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from app.intelligence.openai_client import structured_completion
-from app.intelligence.prompts import SOCIAL_DIGEST_SYSTEM_PROMPT
+from app.intelligence.prompts import DIGEST_UPDATE_PROMPT, SOCIAL_DIGEST_SYSTEM_PROMPT
 from app.intelligence.schemas import SocialDigestResult
 
 
@@ -16,4 +16,21 @@ async def run_social_digest(
             f"SOCIAL MEDIA CONTENT:\n{social_content}"
         ),
         response_model=SocialDigestResult,
+        pipeline="social_digest",
+    )
+
+
+async def run_social_digest_update(
+    company_name: str, previous_markdown: str, new_context: str
+) -> SocialDigestResult:
+    """Fold new social media content into an existing social digest."""
+    return await structured_completion(
+        system_prompt=SOCIAL_DIGEST_SYSTEM_PROMPT + DIGEST_UPDATE_PROMPT,
+        user_prompt=(
+            f"Company: {company_name}\n\n"
+            f"PREVIOUS ANALYSIS:\n{previous_markdown}\n\n"
+            f"NEW SOCIAL MEDIA CONTENT:\n{new_context}"
+        ),
+        response_model=SocialDigestResult,
+        pipeline="social_digest_update",
     )
@@ -370,3 +370,26 @@ Also provide:
 
 Be specific, actionable, and grounded in the provided data. When financial data is available, \
 factor runway and burn into urgency assessments. No generic advice."""
+
+HISTORY_SUMMARY_PROMPT = """You maintain the running memory of a conversation between a startup founder \
+and their AI copilot. You will be given the existing summary (possibly empty) and the next turns \
+that are about to leave the verbatim history.
+
+Produce an updated summary that:
+- Preserves the founder's goals, decisions, constraints and open questions
+- Keeps concrete facts that were established: numbers, company names, dates, conclusions
+- Drops pleasantries, repetition and reasoning that led nowhere
+- Is written as terse bullet points, at most ~300 words
+
+Return only the summary."""
+
+
+DIGEST_UPDATE_PROMPT = """
+
+You are UPDATING an existing analysis, not writing one from scratch. You will be given the PREVIOUS \
+ANALYSIS and only the NEW DATA collected since it was written.
+
+- Keep every finding of the previous analysis that the new data does not contradict
+- Integrate new facts, events and signals where they belong, citing their sources
+- Revise or remove findings that the new data supersedes or contradicts, and say so
+- Return the complete updated analysis in the same structure, not just the changes"""
@@ -4,28 +4,29 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
 import httpx
-import trafilatura
 from ddgs import DDGS
-from markdownify import markdownify as md
+
+from app.config import settings
+from app.intelligence.extraction import extract
+from app.intelligence.fetcher import fetcher
+from app.intelligence.http_cache import CachedPage, http_cache
 
 logger = logging.getLogger(__name__)
 
 MAX_SOURCES = 15
 MAX_CONTENT_PER_SOURCE = 5000  # chars per source document
 MAX_COMBINED_TEXT = 50000  # chars total for LLM context
-FETCH_TIMEOUT = 15  # seconds per URL
-
-
-def html_to_markdown(html: str) -> str:
-    """Convert HTML to clean Markdown."""
-    try:
-        return md(html, heading_style="ATX", strip=["img", "script", "style"])
-    except Exception:
-        return ""
+MAX_CLIENT_SOURCES = 10
+MAX_DOC_SOURCES = 5
+RESULTS_PER_QUERY = 5
+SEARCH_CONCURRENCY = 4  # DuckDuckGo queries in flight, process-wide
+SEARCH_MIN_INTERVAL = 0.3  # seconds between query starts, process-wide
 
 
 @dataclass
@@ -75,9 +76,99 @@ class ResearchContext:
         return "\n".join(lines)
 
 
-def search_company(company_name: str) -> list[SearchResult]:
-    """Search the web for information about a company using DuckDuckGo."""
-    queries = [
+# -- Search ---------------------------------------------------------------------
+#
+# DuckDuckGo's client is synchronous, so each query runs in a worker thread.
+# All queries share one process-wide limiter so concurrent enrichments cannot
+# hammer the search backend.
+
+
+class _SearchRateLimiter:
+    """Bounded concurrency plus a minimum spacing between query starts."""
+
+    def __init__(self, concurrency: int, min_interval: float):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._min_interval = min_interval
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._semaphore:
+            async with self._lock:
+                loop = asyncio.get_running_loop()
+                wait = self._next_start - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_start = loop.time() + self._min_interval
+            yield
+
+
+_search_limiter = _SearchRateLimiter(SEARCH_CONCURRENCY, SEARCH_MIN_INTERVAL)
+
+
+def _ddgs_text(query: str, max_results: int) -> list[dict]:
+    with DDGS() as ddgs:
+        return list(ddgs.text(query, max_results=max_results))
+
+
+async def _run_query(query: str, purpose: str) -> list[SearchResult]:
+    async with _search_limiter.slot():
+        try:
+            hits = await asyncio.to_thread(_ddgs_text, query, RESULTS_PER_QUERY)
+        except Exception as exc:
+            logger.warning("%s search failed for %r: %s", purpose, query, exc)
+            return []
+    return [
+        SearchResult(
+            url=hit["href"],
+            title=hit.get("title", ""),
+            snippet=hit.get("body", ""),
+        )
+        for hit in hits
+        if hit.get("href")
+    ]
+
+
+async def run_searches(
+    plan: dict[str, list[str]],
+    limits: dict[str, int] | None = None,
+    shared: set[str] | None = None,
+) -> dict[str, list[SearchResult]]:
+    """Run every query of every purpose concurrently, grouped by purpose.
+
+    URLs are deduplicated across the ``shared`` groups (all of them when
+    None): a URL found by several is kept by the first group (in plan order)
+    that keeps it within its limit, so a URL cut from one group can still be
+    used by a later one. Groups outside ``shared`` are deduplicated only
+    within themselves.
+    """
+    limits = limits or {}
+    flat = [(purpose, query) for purpose, queries in plan.items() for query in queries]
+    hits = await asyncio.gather(*(_run_query(q, purpose) for purpose, q in flat))
+
+    shared_urls: set[str] = set()
+    seen_urls = {
+        purpose: shared_urls if shared is None or purpose in shared else set()
+        for purpose in plan
+    }
+    grouped: dict[str, list[SearchResult]] = {purpose: [] for purpose in plan}
+    # ``flat`` is in plan order, so each group is complete before the next starts
+    for (purpose, _), results in zip(flat, hits):
+        kept = grouped[purpose]
+        seen = seen_urls[purpose]
+        limit = limits.get(purpose)
+        for result in results:
+            if limit is not None and len(kept) >= limit:
+                break
+            if result.url not in seen:
+                seen.add(result.url)
+                kept.append(result)
+    return grouped
+
+
+def _company_queries(company_name: str) -> list[str]:
+    return [
         f'"{company_name}" company',
         f'"{company_name}" founders CEO funding startup',
         f'"{company_name}" product launch news 2024 2025',
@@ -87,38 +178,17 @@ def search_company(company_name: str) -> list[SearchResult]:
         f'"{company_name}" customers clients case studies testimonials',
     ]
 
-    seen_urls: set[str] = set()
-    results: list[SearchResult] = []
-
-    ddgs = DDGS()
-    for query in queries:
-        try:
-            hits = ddgs.text(query, max_results=5)
-            for hit in hits:
-                url = hit.get("href", "")
-                if url and url not in seen_urls:
-                    seen_urls.add(url)
-                    results.append(
-                        SearchResult(
-                            url=url,
-                            title=hit.get("title", ""),
-                            snippet=hit.get("body", ""),
-                        )
-                    )
-        except Exception as e:
-            logger.warning(f"Search failed for query '{query}': {e}")
-            continue
 
-    logger.info(
-        f"Found {len(results)} unique URLs for '{company_name}'"
-    )
-    return results[:MAX_SOURCES]
+def _docs_queries(company_name: str) -> list[str]:
+    """Developer documentation, API references, and technical resources."""
+    return [
+        f'"{company_name}" API reference documentation developer guide',
+        f'"{company_name}" SDK changelog release notes',
+        f'site:github.com "{company_name}"',
+    ]
 
 
-def search_company_clients(
-    company_name: str, domain: str | None = None
-) -> list[SearchResult]:
-    """Dedicated search for client/customer information."""
+def _client_queries(company_name: str, domain: str | None = None) -> list[str]:
     queries = [
         f'"{company_name}" customers clients case studies testimonials',
         f'"{company_name}" powered by',
@@ -131,30 +201,71 @@ def search_company_clients(
         clean = domain.replace("https://", "").replace("http://", "").rstrip("/")
         queries.append(f"site:{clean} customers")
         queries.append(f"site:{clean} case-studies OR case-study")
+    return queries
 
-    seen_urls: set[str] = set()
-    results: list[SearchResult] = []
 
-    ddgs = DDGS()
-    for query in queries:
-        try:
-            hits = ddgs.text(query, max_results=5)
-            for hit in hits:
-                url = hit.get("href", "")
-                if url and url not in seen_urls:
-                    seen_urls.add(url)
-                    results.append(
-                        SearchResult(
-                            url=url,
-                            title=hit.get("title", ""),
-                            snippet=hit.get("body", ""),
-                        )
-                    )
-        except Exception as e:
-            logger.warning(f"Client search failed for query '{query}': {e}")
+def _linkedin_queries(
+    company_name: str, founder_names: list[str] | None = None
+) -> list[str]:
+    queries = [f'site:linkedin.com "{company_name}"']
+    for name in (founder_names or [])[:3]:
+        queries.append(f'site:linkedin.com "{name}"')
+    return queries
+
+
+def _twitter_queries(
+    company_name: str,
+    founder_names: list[str] | None = None,
+    handles: list[str] | None = None,
+) -> list[str]:
+    queries = [f'site:x.com "{company_name}"']
+    for handle in (handles or [])[:3]:
+        clean = handle.lstrip("@")
+        queries.append(f"site:x.com from:{clean}")
+    for name in (founder_names or [])[:3]:
+        queries.append(f'site:x.com "{name}"')
+    return queries
+
+
+async def search_company(company_name: str) -> list[SearchResult]:
+    """Search the web for information about a company using DuckDuckGo."""
+    results = (
+        await run_searches({"web": _company_queries(company_name)}, {"web": MAX_SOURCES})
+    )["web"]
+    logger.info(f"Found {len(results)} unique URLs for '{company_name}'")
+    return results
 
+
+async def search_company_clients(
+    company_name: str, domain: str | None = None
+) -> list[SearchResult]:
+    """Dedicated search for client/customer information."""
+    results = (
+        await run_searches(
+            {"clients": _client_queries(company_name, domain)},
+            {"clients": MAX_CLIENT_SOURCES},
+        )
+    )["clients"]
     logger.info(f"Found {len(results)} client-specific URLs for '{company_name}'")
-    return results[:10]
+    return results
+
+
+async def search_social_linkedin(
+    company_name: str, founder_names: list[str] | None = None
+) -> list[SearchResult]:
+    """Search LinkedIn via DuckDuckGo site:linkedin.com."""
+    plan = {"linkedin": _linkedin_queries(company_name, founder_names)}
+    return (await run_searches(plan))["linkedin"]
+
+
+async def search_social_twitter(
+    company_name: str,
+    founder_names: list[str] | None = None,
+    handles: list[str] | None = None,
+) -> list[SearchResult]:
+    """Search X/Twitter via DuckDuckGo site:x.com."""
+    plan = {"twitter": _twitter_queries(company_name, founder_names, handles)}
+    return (await run_searches(plan))["twitter"]
 
 
 async def fetch_company_client_pages(domain: str) -> list[SourceDocument]:
@@ -180,103 +291,6 @@ async def fetch_company_client_pages(domain: str) -> list[SourceDocument]:
     return docs
 
 
-def _search_docs(company_name: str) -> list[SearchResult]:
-    """Search for developer documentation, API references, and technical resources."""
-    queries = [
-        f'"{company_name}" API reference documentation developer guide',
-        f'"{company_name}" SDK changelog release notes',
-        f'site:github.com "{company_name}"',
-    ]
-
-    seen_urls: set[str] = set()
-    results: list[SearchResult] = []
-
-    ddgs = DDGS()
-    for query in queries:
-        try:
-            hits = ddgs.text(query, max_results=5)
-            for hit in hits:
-                url = hit.get("href", "")
-                if url and url not in seen_urls:
-                    seen_urls.add(url)
-                    results.append(
-                        SearchResult(
-                            url=url,
-                            title=hit.get("title", ""),
-                            snippet=hit.get("body", ""),
-                        )
-                    )
-        except Exception as e:
-            logger.warning(f"Docs search failed for query '{query}': {e}")
-            continue
-
-    logger.info(f"Found {len(results)} doc URLs for '{company_name}'")
-    return results[:5]
-
-
-def search_social_linkedin(
-    company_name: str, founder_names: list[str] | None = None
-) -> list[SearchResult]:
-    """Search LinkedIn via DuckDuckGo site:linkedin.com."""
-    queries = [f'site:linkedin.com "{company_name}"']
-    for name in (founder_names or [])[:3]:
-        queries.append(f'site:linkedin.com "{name}"')
-
-    seen_urls: set[str] = set()
-    results: list[SearchResult] = []
-    with DDGS() as ddgs:
-        for query in queries:
-            try:
-                for r in ddgs.text(query, max_results=5):
-                    url = r.get("href", "")
-                    if url and url not in seen_urls:
-                        seen_urls.add(url)
-                        results.append(
-                            SearchResult(
-                                url=url,
-                                title=r.get("title", ""),
-                                snippet=r.get("body", ""),
-                            )
-                        )
-            except Exception as exc:
-                logger.warning("LinkedIn search failed for %r: %s", query, exc)
-    return results
-
-
-def search_social_twitter(
-    company_name: str,
-    founder_names: list[str] | None = None,
-    handles: list[str] | None = None,
-) -> list[SearchResult]:
-    """Search X/Twitter via DuckDuckGo site:x.com."""
-    queries = [f'site:x.com "{company_name}"']
-    for handle in (handles or [])[:3]:
-        clean = handle.lstrip("@")
-        queries.append(f"site:x.com from:{clean}")
-    for name in (founder_names or [])[:3]:
-        queries.append(f'site:x.com "{name}"')
-
-    seen_urls: set[str] = set()
-    results: list[SearchResult] = []
-    with DDGS() as ddgs:
-        for query in queries:
-            try:
-                for r in ddgs.text(query, max_results=5):
-                    url = r.get("href", "")
-                    if url and url not in seen_urls:
-                        seen_urls.add(url)
-                        results.append(
-                            SearchResult(
-                                url=url,
-                                title=r.get("title", ""),
-                                snippet=r.get("body", ""),
-                            )
-                        )
-            except Exception as exc:
-                logger.warning("Twitter search failed for %r: %s", query, exc)
-    return results
-
-
 async def search_hackernews(company_name: str) -> list[SearchResult]:
     """Search Hacker News via Algolia API (free, no auth)."""
     results: list[SearchResult] = []
@@ -307,67 +321,106 @@ async def search_hackernews(company_name: str) -> list[SearchResult]:
 
 
 async def _fetch_one(
-    client: httpx.AsyncClient, url: str
-) -> tuple[str, str | None]:
-    """Fetch a single URL and return (url, html_or_none)."""
-    try:
-        response = await client.get(
-            url,
-            follow_redirects=True,
-            timeout=FETCH_TIMEOUT,
-        )
-        if response.status_code == 200 and "text/html" in response.headers.get(
-            "content-type", ""
-        ):
-            return url, response.text
-    except Exception as e:
-        logger.debug(f"Failed to fetch {url}: {e}")
-    return url, None
+    url: str, require_html: bool = True
+) -> tuple[str, CachedPage | None]:
+    """Fetch a single URL through the HTTP cache and return (url, page_or_none).
+
+    A 304 (or an identical body) keeps the cached page, including any
+    extraction stored with it.
+    """
+    cached = await http_cache.load(url) if settings.http_cache_enabled else None
+    response = await fetcher.fetch(
+        url,
+        headers=cached.conditional_headers() if cached else None,
+        require_html=require_html,
+    )
+    if response is None:
+        return url, None
+    if response.status_code == 304 and cached is not None:
+        await http_cache.touch(url)
+        return url, cached
+    if response.status_code != 200:
+        return url, None
+
+    page = CachedPage(
+        url=url,
+        body=response.text,
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified"),
+    )
+    if cached is not None and cached.body_hash == page.body_hash:
+        page.extracted = cached.extracted
+    if settings.http_cache_enabled:
+        await http_cache.store(page)
+    return url, page
 
 
-async def fetch_and_extract(
+async def _extract_cached(page: CachedPage, mode: str) -> dict[str, str]:
+    """Extract text/markdown from a page, reusing the cached result when unchanged."""
+    if mode in page.extracted:
+        return page.extracted[mode]
+    result = await extract(page.body, mode)
+    page.extracted[mode] = result
+    if settings.http_cache_enabled:
+        await http_cache.store(page)
+    return result
+
+
+async def iter_fetch_and_extract(
     search_results: list[SearchResult],
-) -> list[SourceDocument]:
-    """Fetch URLs concurrently and extract clean text with trafilatura."""
-    documents: list[SourceDocument] = []
-    now = datetime.now(timezone.utc)
+) -> AsyncIterator[SourceDocument]:
+    """Fetch and extract URLs concurrently, yielding documents as they finish.
 
-    async with httpx.AsyncClient(
-        headers={
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        },
-    ) as client:
-        tasks = [_fetch_one(client, sr.url) for sr in search_results]
-        results = await asyncio.gather(*tasks)
-
-    # Build a title lookup from search results
+    Each page is handed to the extraction pool as soon as its download
+    completes, so parsing overlaps with fetches still in flight.
+    """
+    now = datetime.now(timezone.utc)
     title_map = {sr.url: sr.title for sr in search_results}
-
-    for url, html in results:
-        if html is None:
-            continue
+    reused = 0
+
+    async def _one(url: str) -> SourceDocument | None:
+        nonlocal reused
+        _, page = await _fetch_one(url)
+        if page is None:
+            return None
+        reused += "recall" in page.extracted
         try:
-            text = trafilatura.extract(
-                html,
-                include_comments=False,
-                include_tables=True,
-                favor_recall=True,
-            )
-            if text and len(text.strip()) > 100:
-                content_md = html_to_markdown(html)
-                documents.append(
-                    SourceDocument(
-                        url=url,
-                        title=title_map.get(url, ""),
-                        content=text.strip(),
-                        fetch_date=now,
-                        content_md=content_md,
-                    )
-                )
+            extracted = await _extract_cached(page, "recall")
         except Exception as e:
             logger.debug(f"Extraction failed for {url}: {e}")
+            return None
+        if not extracted["text"]:
+            return None
+        return SourceDocument(
+            url=url,
+            title=title_map.get(url, ""),
+            content=extracted["text"],
+            fetch_date=now,
+            content_md=extracted["markdown"],
+        )
+
+    tasks = [asyncio.create_task(_one(url)) for url in title_map]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            doc = await finished
+            if doc is not None:
+                yield doc
+        logger.debug(f"{reused}/{len(tasks)} pages unchanged since last fetch")
+    finally:
+        # Consumer stopped early: don't leave fetches running in the background
+        for task in tasks:
+            task.cancel()
+
+
+async def fetch_and_extract(
+    search_results: list[SearchResult],
+) -> list[SourceDocument]:
+    """Fetch URLs concurrently and extract clean text with trafilatura."""
+    documents = [doc async for doc in iter_fetch_and_extract(search_results)]
+
+    # Keep search-result order so source numbering stays stable
+    order = {sr.url: i for i, sr in reversed(list(enumerate(search_results)))}
+    documents.sort(key=lambda doc: order[doc.url])
 
     logger.info(
         f"Extracted content from {len(documents)}/{len(search_results)} URLs"
@@ -378,28 +431,18 @@ async def fetch_and_extract(
 async def fetch_custom_source(url: str) -> SourceDocument | None:
     """Fetch a single URL and return as a SourceDocument."""
     try:
-        async with httpx.AsyncClient(
-            timeout=FETCH_TIMEOUT,
-            follow_redirects=True,
-            headers={"User-Agent": "Mozilla/5.0"},
-        ) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            html_text = resp.text
-            text = trafilatura.extract(html_text) or ""
-            content_md = html_to_markdown(html_text)
-            # Simple title extraction from HTML
-            import re
-            title_match = re.search(r"<title[^>]*>([^<]+)</title>", html_text, re.I)
-            title = title_match.group(1).strip() if title_match else url
-            if text:
-                return SourceDocument(
-                    url=url,
-                    title=title,
-                    content=text[:MAX_CONTENT_PER_SOURCE],
-                    fetch_date=datetime.now(timezone.utc),
-                    content_md=content_md[:MAX_CONTENT_PER_SOURCE * 2],
-                )
+        _, page = await _fetch_one(url, require_html=False)
+        if page is None:
+            raise ValueError("no usable response")
+        extracted = await _extract_cached(page, "default")
+        if extracted["text"]:
+            return SourceDocument(
+                url=url,
+                title=extracted["title"] or url,
+                content=extracted["text"][:MAX_CONTENT_PER_SOURCE],
+                fetch_date=datetime.now(timezone.utc),
+                content_md=extracted["markdown"][:MAX_CONTENT_PER_SOURCE * 2],
+            )
     except Exception as exc:
         logger.warning("Failed to fetch custom source %s: %s", url, exc)
     return None
@@ -407,8 +450,7 @@ async def fetch_custom_source(url: str) -> SourceDocument | None:
 
 async def research_company(company_name: str) -> ResearchContext:
     """Full research pipeline: search → fetch → extract → bundle."""
-    # Search is synchronous (duckduckgo-search uses requests internally)
-    search_results = await asyncio.to_thread(search_company, company_name)
+    search_results = await search_company(company_name)
 
     if not search_results:
         logger.warning(f"No search results found for '{company_name}'")
@@ -431,30 +473,38 @@ async def research_company_full(
     founder_names: list[str] | None = None,
     social_handles: dict[str, str] | None = None,
 ) -> tuple[ResearchContext, list[SearchResult], list[SearchResult], list[SearchResult]]:
-    """Full research: web + LinkedIn + Twitter + HN."""
-    # Web research (existing)
-    web_context = await research_company(company_name)
-
-    # Docs search (supplement web research with developer documentation)
-    doc_results = await asyncio.to_thread(_search_docs, company_name)
-    if doc_results:
-        doc_documents = await fetch_and_extract(doc_results)
-        web_context.sources.extend(doc_documents)
-        logger.info(
-            f"Added {len(doc_documents)} documentation sources for '{company_name}'"
-        )
-
-    # Social searches
-    linkedin_results = await asyncio.to_thread(
-        search_social_linkedin, company_name, founder_names
-    )
+    """Full research: web + docs + LinkedIn + Twitter + HN, all searched at once."""
     twitter_handles = []
     if social_handles:
         if social_handles.get("twitter"):
             twitter_handles.append(social_handles["twitter"])
-    twitter_results = await asyncio.to_thread(
-        search_social_twitter, company_name, founder_names, twitter_handles
+
+    plan = {
+        "web": _company_queries(company_name),
+        "docs": _docs_queries(company_name),
+        "linkedin": _linkedin_queries(company_name, founder_names),
+        "twitter": _twitter_queries(company_name, founder_names, twitter_handles),
+    }
+    grouped, hn_results = await asyncio.gather(
+        # Social results are stored as posts even if the web group found them too
+        run_searches(
+            plan, {"web": MAX_SOURCES, "docs": MAX_DOC_SOURCES}, shared={"web", "docs"}
+        ),
+        search_hackernews(company_name),
+    )
+    logger.info(
+        f"Search for '{company_name}': "
+        + ", ".join(f"{len(v)} {k}" for k, v in grouped.items())
+        + f", {len(hn_results)} hackernews"
+    )
+
+    # Web pages first, documentation after, in one concurrent fetch
+    documents = await fetch_and_extract(grouped["web"] + grouped["docs"])
+    web_context = ResearchContext(sources=documents)
+    logger.info(
+        f"Research complete for '{company_name}': "
+        f"{len(documents)} sources, "
+        f"{len(web_context.combined_text)} chars of content"
     )
-    hn_results = await search_hackernews(company_name)
 
-    return web_context, linkedin_results, twitter_results, hn_results
+    return web_context, grouped["linkedin"], grouped["twitter"], hn_results
@@ -0,0 +1,270 @@
+"""Local BM25 retrieval over company research for portfolio-wide Ask.
+
+Without a selected company, Ask used to paste every tracked company's full
+context into the prompt. Instead, source text, digests, events and products
+are split into chunks and indexed in memory; each question pulls the
+best-scoring chunks until the token budget is spent, so prompt size stays
+flat as companies are added. Per-company chunks are cached against the same
+fingerprints as the Ask context documents and only re-chunked when stale.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.intelligence.context_docs import company_fingerprints
+from app.models.company import Company
+from app.models.company_digest import CompanyDigest
+from app.models.data_source import DataSource
+from app.models.event import Event
+from app.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+CHUNK_CHARS = 1200
+CHARS_PER_TOKEN = 4  # rough estimate, good enough for budgeting
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by do does for from has have how in is it its of on or "
+    "our that the their them they this to was we what when where which who why "
+    "will with you your".split()
+)
+
+
+@dataclass
+class Chunk:
+    company_id: str
+    company_name: str
+    label: str
+    url: str | None
+    text: str
+    terms: Counter
+    length: int
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+def _split(text: str, size: int = CHUNK_CHARS) -> list[str]:
+    """Split on paragraph boundaries into pieces of roughly ``size`` chars."""
+    pieces: list[str] = []
+    current = ""
+    for para in re.split(r"\n\s*\n", text):
+        para = para.strip()
+        if not para:
+            continue
+        while len(para) > size:
+            pieces.append(para[:size])
+            para = para[size:]
+        if current and len(current) + len(para) + 2 > size:
+            pieces.append(current)
+            current = ""
+        current = f"{current}\n\n{para}" if current else para
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+class BM25Index:
+    def __init__(self, chunks: list[Chunk]):
+        self.chunks = chunks
+        self.avg_length = (sum(c.length for c in chunks) / len(chunks)) if chunks else 0.0
+        self.postings: dict[str, list[tuple[int, int]]] = {}
+        for i, chunk in enumerate(chunks):
+            for term, tf in chunk.terms.items():
+                self.postings.setdefault(term, []).append((i, tf))
+        n = len(chunks)
+        self.idf = {
+            term: math.log((n - len(posting) + 0.5) / (len(posting) + 0.5) + 1)
+            for term, posting in self.postings.items()
+        }
+
+    def search(self, query: str) -> list[tuple[float, Chunk]]:
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for i, tf in self.postings[term]:
+                norm = 1 - BM25_B + BM25_B * self.chunks[i].length / self.avg_length
+                scores[i] = scores.get(i, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [(score, self.chunks[i]) for i, score in ranked]
+
+
+# company_id -> (fingerprint, chunks); the index is rebuilt when the set changes
+_company_chunks: dict[str, tuple[str, list[Chunk]]] = {}
+_index: BM25Index | None = None
+_index_key: tuple[tuple[str, str], ...] = ()
+
+
+def _make_chunks(
+    company_id: str, company_name: str, label: str, url: str | None, text: str
+) -> list[Chunk]:
+    chunks = []
+    for piece in _split(text):
+        terms = Counter(tokenize(f"{company_name} {label} {piece}"))
+        if terms:
+            chunks.append(
+                Chunk(company_id, company_name, label, url, piece, terms, sum(terms.values()))
+            )
+    return chunks
+
+
+async def _load_chunks(
+    session: AsyncSession, companies: dict[str, str]
+) -> dict[str, list[Chunk]]:
+    """Chunk sources, digests, events and products for ``companies`` (id -> name)."""
+    ids = list(companies)
+    out: dict[str, list[Chunk]] = {cid: [] for cid in ids}
+
+    rows = await session.execute(
+        select(CompanyDigest.company_id, CompanyDigest.digest_type, CompanyDigest.digest_markdown)
+        .where(CompanyDigest.company_id.in_(ids))
+    )
+    for cid, digest_type, markdown in rows.all():
+        label = f"Digest ({digest_type.replace('_', ' ').title()})"
+        out[cid] += _make_chunks(cid, companies[cid], label, None, markdown or "")
+
+    rows = await session.execute(
+        select(
+            DataSource.company_id, DataSource.title, DataSource.url, DataSource.raw_content
+        ).where(DataSource.company_id.in_(ids), DataSource.raw_content.is_not(None))
+    )
+    for cid, title, url, raw in rows.all():
+        out[cid] += _make_chunks(cid, companies[cid], title or url, url, raw)
+
+    rows = await session.execute(
+        select(
+            Event.company_id, Event.event_type, Event.event_date, Event.title,
+            Event.description, Event.source_url,
+        ).where(Event.company_id.in_(ids))
+    )
+    for cid, event_type, event_date, title, description, source_url in rows.all():
+        date_str = event_date.strftime("%Y-%m-%d") if event_date else "Unknown date"
+        text = f"[{event_type}] {date_str}: {title}"
+        if description:
+            text += f"\n{description}"
+        out[cid] += _make_chunks(cid, companies[cid], "Event", source_url, text)
+
+    rows = await session.execute(
+        select(Product.company_id, Product.name, Product.description, Product.features)
+        .where(Product.company_id.in_(ids))
+    )
+    for cid, name, description, features in rows.all():
+        text = f"{name}: {description}" if description else name
+        if features:
+            try:
+                feats = json.loads(features)
+                if feats:
+                    text += f"\nFeatures: {', '.join(feats)}"
+            except (json.JSONDecodeError, TypeError):
+                pass
+        out[cid] += _make_chunks(cid, companies[cid], "Product", None, text)
+
+    return out
+
+
+async def get_index(session: AsyncSession, limit: int = 100) -> BM25Index:
+    """Return the BM25 index over the newest ``limit`` companies, refreshing stale ones."""
+    global _index, _index_key
+
+    listing = await company_fingerprints(session, None, limit)
+    stale = {
+        cid: name
+        for cid, name, _primary, _version, fp in listing
+        if _company_chunks.get(cid, ("", []))[0] != fp
+    }
+    if stale:
+        loaded = await _load_chunks(session, stale)
+        fps = {cid: fp for cid, *_, fp in listing}
+        for cid, chunks in loaded.items():
+            _company_chunks[cid] = (fps[cid], chunks)
+        logger.info("Re-chunked %d companies for Ask retrieval", len(stale))
+
+    key = tuple((cid, fp) for cid, *_, fp in listing)
+    if _index is None or key != _index_key:
+        live = {cid for cid, *_ in listing}
+        for cid in list(_company_chunks):
+            if cid not in live:
+                del _company_chunks[cid]
+        _index = BM25Index([c for cid, *_ in listing for c in _company_chunks[cid][1]])
+        _index_key = key
+    return _index
+
+
+async def _format_directory(session: AsyncSession, limit: int) -> str:
+    """One line per tracked company so the model knows the whole portfolio."""
+    rows = await session.execute(
+        select(Company.name, Company.one_liner, Company.is_primary)
+        .order_by(Company.created_at.desc())
+        .limit(limit)
+    )
+    lines = []
+    for name, one_liner, is_primary in rows.all():
+        line = f"- {name}"
+        if is_primary:
+            line += " (Primary — Your Company)"
+        if one_liner:
+            line += f": {one_liner}"
+        lines.append(line)
+    return "## Tracked Companies\n" + "\n".join(lines) if lines else ""
+
+
+async def retrieve_context(
+    session: AsyncSession,
+    question: str,
+    token_budget: int | None = None,
+    max_chunks: int | None = None,
+) -> tuple[str, list[dict]]:
+    """Select the most relevant chunks for ``question`` under a token budget.
+
+    Returns the formatted context (company directory plus excerpts grouped
+    by company) and the sources of the chosen excerpts.
+    """
+    budget = (token_budget or settings.ask_retrieval_token_budget) * CHARS_PER_TOKEN
+    max_chunks = max_chunks or settings.ask_retrieval_max_chunks
+
+    index = await get_index(session)
+    directory = await _format_directory(session, limit=100)
+    used = len(directory)
+
+    selected: dict[str, list[Chunk]] = {}
+    taken = 0
+    for _score, chunk in index.search(question):
+        if taken >= max_chunks:
+            break
+        if used + len(chunk.text) > budget:
+            continue
+        selected.setdefault(chunk.company_id, []).append(chunk)
+        used += len(chunk.text)
+        taken += 1
+
+    parts = [directory] if directory else []
+    sources: list[dict] = []
+    for chunks in selected.values():
+        excerpts = []
+        for chunk in chunks:
+            header = f"**{chunk.label}**" + (f" ({chunk.url})" if chunk.url else "")
+            excerpts.append(f"{header}\n{chunk.text}")
+            if chunk.url:
+                sources.append({"label": chunk.label, "url": chunk.url})
+        parts.append(f"## {chunks[0].company_name}\n\n" + "\n\n".join(excerpts))
+
+    logger.info(
+        f"Ask retrieval: {taken} chunks from {len(selected)} companies "
+        f"out of {len(index.chunks)} indexed"
+    )
+    return "\n\n---\n\n".join(parts), sources
@@ -0,0 +1,245 @@
+"""Durable enrichment job queue: SQLite-backed jobs drained by bounded asyncio workers."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_, select, update
+
+from app.config import settings
+from app.database import async_session
+from app.intelligence.orchestrator import (
+    rerun_with_sources,
+    run_full_enrichment,
+    run_incremental_update,
+    run_intelligence_rerun,
+)
+from app.models.company import Company
+from app.models.enrichment_job import EnrichmentJob
+
+logger = logging.getLogger(__name__)
+
+JOB_RUNNERS = {
+    "full": run_full_enrichment,
+    "incremental": run_incremental_update,
+    "intelligence": run_intelligence_rerun,
+    "sources": rerun_with_sources,
+}
+ACTIVE_STATUSES = ("queued", "running")
+POLL_INTERVAL = 5  # seconds between checks for delayed (backed-off) jobs
+
+_workers: list[asyncio.Task] = []
+_wakeup: asyncio.Event | None = None
+
+
+def _now() -> datetime:
+    # SQLite DateTime columns are naive; store UTC without tzinfo
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _notify() -> None:
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def enqueue_jobs(company_ids: list[str], kind: str) -> list[EnrichmentJob]:
+    """Queue a job per company, reusing any still-queued job of the same kind."""
+    if kind not in JOB_RUNNERS:
+        raise ValueError(f"Unknown enrichment job kind: {kind}")
+    if not company_ids:
+        return []
+
+    async with async_session() as session:
+        stmt = select(EnrichmentJob).where(
+            EnrichmentJob.company_id.in_(company_ids),
+            EnrichmentJob.kind == kind,
+            EnrichmentJob.status == "queued",
+        )
+        pending = {j.company_id: j for j in (await session.execute(stmt)).scalars().all()}
+
+        jobs = []
+        for company_id in company_ids:
+            job = pending.get(company_id)
+            if job is None:
+                job = EnrichmentJob(
+                    company_id=company_id,
+                    kind=kind,
+                    status="queued",
+                    max_attempts=settings.enrichment_max_attempts,
+                )
+                session.add(job)
+                pending[company_id] = job
+            jobs.append(job)
+        await session.commit()
+
+    _notify()
+    return jobs
+
+
+async def enqueue_job(company_id: str, kind: str) -> EnrichmentJob:
+    """Queue a single enrichment job for a company."""
+    return (await enqueue_jobs([company_id], kind))[0]
+
+
+async def list_jobs(
+    company_id: str | None = None, status: str | None = None, limit: int = 100
+) -> list[EnrichmentJob]:
+    async with async_session() as session:
+        stmt = select(EnrichmentJob).order_by(EnrichmentJob.created_at.desc()).limit(limit)
+        if company_id:
+            stmt = stmt.where(EnrichmentJob.company_id == company_id)
+        if status:
+            stmt = stmt.where(EnrichmentJob.status == status)
+        return list((await session.execute(stmt)).scalars().all())
+
+
+async def _claim_next() -> EnrichmentJob | None:
+    """Atomically move the oldest due job from queued to running.
+
+    Companies that already have a running job are skipped so two workers
+    never enrich the same company at once.
+    """
+    async with async_session() as session:
+        now = _now()
+        busy = select(EnrichmentJob.company_id).where(EnrichmentJob.status == "running")
+        candidates = (
+            select(EnrichmentJob.id)
+            .where(
+                EnrichmentJob.status == "queued",
+                or_(EnrichmentJob.run_after.is_(None), EnrichmentJob.run_after <= now),
+                EnrichmentJob.company_id.not_in(busy),
+            )
+            .order_by(EnrichmentJob.created_at)
+            .limit(settings.enrichment_workers * 2)
+        )
+        for job_id in (await session.execute(candidates)).scalars().all():
+            claimed = await session.execute(
+                update(EnrichmentJob)
+                .where(
+                    EnrichmentJob.id == job_id,
+                    EnrichmentJob.status == "queued",
+                    # Re-checked here: another worker may have claimed a
+                    # different job for this company since the SELECT
+                    EnrichmentJob.company_id.not_in(busy),
+                )
+                .values(
+                    status="running",
+                    started_at=now,
+                    attempts=EnrichmentJob.attempts + 1,
+                )
+            )
+            await session.commit()
+            if claimed.rowcount:
+                return await session.get(EnrichmentJob, job_id)
+    return None
+
+
+async def _finish(job: EnrichmentJob, error: str | None) -> None:
+    async with async_session() as session:
+        row = await session.get(EnrichmentJob, job.id)
+        if row is None:
+            return  # company (and its jobs) deleted mid-run
+        row.finished_at = _now()
+        row.last_error = error
+        if error is None:
+            row.status = "done"
+        elif row.attempts < row.max_attempts:
+            delay = settings.enrichment_retry_base_seconds * 2 ** (row.attempts - 1)
+            row.status = "queued"
+            row.run_after = _now() + timedelta(seconds=delay)
+            logger.warning(
+                "Job %s (%s) failed attempt %d/%d, retrying in %ds",
+                row.id, row.kind, row.attempts, row.max_attempts, delay,
+            )
+        else:
+            row.status = "failed"
+            logger.error("Job %s (%s) failed permanently: %s", row.id, row.kind, error)
+        await session.commit()
+
+
+async def _run_job(job: EnrichmentJob) -> None:
+    logger.info("Starting %s job %s for company %s", job.kind, job.id, job.company_id)
+    error = None
+    try:
+        await JOB_RUNNERS[job.kind](job.company_id)
+        # Orchestrator runs swallow their exceptions and flag the company instead
+        async with async_session() as session:
+            status = await session.scalar(
+                select(Company.status).where(Company.id == job.company_id)
+            )
+        if status == "error":
+            error = "Pipeline reported an error"
+    except Exception as exc:
+        logger.exception("Job %s crashed", job.id)
+        error = str(exc) or exc.__class__.__name__
+    await _finish(job, error)
+
+
+async def _worker(index: int) -> None:
+    assert _wakeup is not None
+    while True:
+        # Clear before claiming so a notify that lands mid-claim is not lost
+        _wakeup.clear()
+        try:
+            job = await _claim_next()
+        except Exception:
+            logger.exception("Enrichment worker %d failed to claim a job", index)
+            job = None
+        if job is not None:
+            await _run_job(job)
+            continue
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _recover_interrupted() -> None:
+    """Requeue jobs cut off by a restart and unstick orphaned company statuses."""
+    async with async_session() as session:
+        interrupted = (
+            await session.execute(
+                select(EnrichmentJob).where(EnrichmentJob.status == "running")
+            )
+        ).scalars().all()
+        for job in interrupted:
+            if job.attempts < job.max_attempts:
+                job.status = "queued"
+                job.run_after = None
+            else:
+                job.status = "failed"
+                job.last_error = "Interrupted by restart"
+                job.finished_at = _now()
+
+        pending = select(EnrichmentJob.company_id).where(
+            EnrichmentJob.status.in_(ACTIVE_STATUSES)
+        )
+        await session.flush()
+        await session.execute(
+            update(Company)
+            .where(Company.status == "running", Company.id.not_in(pending))
+            .values(status="error")
+        )
+        await session.commit()
+    if interrupted:
+        logger.info("Recovered %d interrupted enrichment jobs", len(interrupted))
+
+
+async def start_job_queue() -> None:
+    """Recover interrupted jobs and start the worker pool."""
+    global _wakeup
+    await _recover_interrupted()
+    _wakeup = asyncio.Event()
+    for i in range(max(1, settings.enrichment_workers)):
+        _workers.append(asyncio.create_task(_worker(i), name=f"enrichment-worker-{i}"))
+    logger.info("Enrichment job queue started with %d workers", len(_workers))
+
+
+async def stop_job_queue() -> None:
+    """Cancel workers; in-flight jobs are requeued on next start."""
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    logger.info("Enrichment job queue stopped")
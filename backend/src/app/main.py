@@ -3,18 +3,29 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api import api_router
 from app.config import settings
 from app.database import init_db
-from app.api import api_router
+from app.intelligence.extraction import shutdown_extraction_pool
+from app.intelligence.fetcher import fetcher
+from app.intelligence.openai_client import close_clients
+from app.job_queue import start_job_queue, stop_job_queue
 from app.scheduler import start_scheduler, stop_scheduler
+from app.services.holded_client import close_holded_client
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await start_job_queue()
     await start_scheduler()
     yield
     stop_scheduler()
+    await stop_job_queue()
+    await close_clients()
+    await fetcher.aclose()
+    await close_holded_client()
+    shutdown_extraction_pool()
 
 
 def create_app() -> FastAPI:
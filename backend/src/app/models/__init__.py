@@ -4,19 +4,24 @@ from app.models.associations import company_categories, round_investors
 from app.models.bank_transaction import BankTransaction
 from app.models.base import Base
 from app.models.company import Company
+from app.models.company_context_doc import CompanyContextDoc
 from app.models.company_digest import CompanyDigest
 from app.models.company_legal import CompanyLegal
 from app.models.competitor_client import CompetitorClient
 from app.models.conversation import Conversation
+from app.models.conversation_message import ConversationMessage
 from app.models.data_source import DataSource
+from app.models.enrichment_job import EnrichmentJob
 from app.models.enrichment_snapshot import EnrichmentSnapshot
 from app.models.equity_event import EquityEvent
 from app.models.expense_category_rule import ExpenseCategoryRule
 from app.models.event import Event
+from app.models.finance_monthly_rollup import FinanceMonthlyRollup
 from app.models.founder import Founder
 from app.models.funding_round import FundingRound
 from app.models.investor import Investor
 from app.models.legal_document import LegalDocument
+from app.models.llm_cache_entry import LlmCacheEntry
 from app.models.market_category import MarketCategory
 from app.models.planned_expense import PlannedExpense
 from app.models.product import Product
@@ -33,19 +38,24 @@ __all__ = [
     "BankTransaction",
     "Base",
     "Company",
+    "CompanyContextDoc",
     "CompanyDigest",
     "CompanyLegal",
     "CompetitorClient",
     "Conversation",
+    "ConversationMessage",
     "DataSource",
+    "EnrichmentJob",
     "EnrichmentSnapshot",
     "EquityEvent",
     "Event",
     "ExpenseCategoryRule",
+    "FinanceMonthlyRollup",
     "Founder",
     "FundingRound",
     "Investor",
     "LegalDocument",
+    "LlmCacheEntry",
     "MarketCategory",
     "PlannedExpense",
     "Product",
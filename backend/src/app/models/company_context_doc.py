@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class CompanyContextDoc(Base):
+    """Materialized Ask-mode context for one company."""
+
+    __tablename__ = "company_context_docs"
+
+    company_id: Mapped[str] = mapped_column(
+        ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True
+    )
+    # sha256 over data_version, updated_at and child-row counts/timestamps
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    data_version: Mapped[int] = mapped_column(Integer, default=0)
+    context_markdown: Mapped[str] = mapped_column(Text, nullable=False)
+    sources_json: Mapped[str] = mapped_column(Text, default="[]")  # JSON: [{"label", "url"}]
+
+    built_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
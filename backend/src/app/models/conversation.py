@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -17,7 +17,12 @@ class Conversation(Base):
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
     )
     title: Mapped[str] = mapped_column(String(255), nullable=False, default="New Conversation")
-    messages: Mapped[str] = mapped_column(Text, default="[]")  # JSON array
+    # Legacy JSON array, emptied once migrated into conversation_messages
+    messages: Mapped[str] = mapped_column(Text, default="[]")
+    message_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Rolling summary of every message with id <= summary_through_id
+    summary: Mapped[Optional[str]] = mapped_column(Text)
+    summary_through_id: Mapped[int] = mapped_column(Integer, default=0)
     company_id: Mapped[Optional[str]] = mapped_column(
         ForeignKey("companies.id", ondelete="SET NULL"), nullable=True
     )
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class FinanceMonthlyRollup(Base):
+    """Bank transaction totals per month, category bucket and direction.
+
+    Maintained by FinanceService whenever transactions or their categories
+    change; dashboard aggregates read only this table.
+    """
+
+    __tablename__ = "finance_monthly_rollup"
+
+    year_month: Mapped[str] = mapped_column(String(7), primary_key=True)  # "YYYY-MM"
+    # category, falling back to contact name, then "Other"
+    category: Mapped[str] = mapped_column(String(500), primary_key=True)
+    direction: Mapped[str] = mapped_column(String(3), primary_key=True)  # "in" | "out"
+    total: Mapped[float] = mapped_column(Float, default=0.0)  # absolute amount
+    transaction_count: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
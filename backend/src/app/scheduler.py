@@ -8,7 +8,7 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from app.database import async_session
-from app.intelligence.orchestrator import run_incremental_update
+from app.job_queue import enqueue_jobs
 from app.services.settings_service import SettingsService
 
 logger = logging.getLogger(__name__)
@@ -26,7 +26,7 @@ def get_scheduler() -> AsyncIOScheduler:
 
 
 async def _daily_update_job() -> None:
-    """Run incremental update for all enriched companies."""
+    """Queue an incremental update for all enriched companies."""
     logger.info("Daily auto-update starting...")
     try:
         async with async_session() as session:
@@ -35,16 +35,10 @@ async def _daily_update_job() -> None:
             service = CompanyService(session)
             companies = await service.list_all(limit=100)
 
-        updated = 0
-        for company in companies:
-            if company.status not in ("enriched", "error"):
-                continue
-            try:
-                logger.info("Updating %s ...", company.name)
-                await run_incremental_update(company.id)
-                updated += 1
-            except Exception:
-                logger.exception("Failed to update %s", company.name)
+        company_ids = [
+            c.id for c in companies if c.status in ("enriched", "error")
+        ]
+        jobs = await enqueue_jobs(company_ids, "incremental")
 
         # Record last run timestamp
         async with async_session() as session:
@@ -54,7 +48,7 @@ async def _daily_update_job() -> None:
                 datetime.now(timezone.utc).isoformat(),
             )
 
-        logger.info("Daily auto-update finished. Updated %d companies.", updated)
+        logger.info("Daily auto-update queued %d companies.", len(jobs))
     except Exception:
         logger.exception("Daily auto-update job failed")
 
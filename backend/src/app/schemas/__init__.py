@@ -12,6 +12,7 @@ from app.schemas.intelligence import (
     AskResponse,
     CompareQuery,
     CompareResponse,
+    EnrichmentJobRead,
     PipelineStatusResponse,
 )
 from app.schemas.market import (
@@ -37,6 +38,7 @@ __all__ = [
     "CompareResponse",
     "ComparisonData",
     "DataSourceRead",
+    "EnrichmentJobRead",
     "ErrorResponse",
     "EventRead",
     "FounderRead",
@@ -154,3 +154,85 @@ class CapTableKPIs(BaseModel):
     total_shares: int
     rounds_count: int
     last_round_name: str | None
+
+
+# ── Dilution Simulation ──────────────────────────────────────
+
+class ConvertibleInput(BaseModel):
+    name: str = "SAFE"
+    amount: float
+    valuation_cap: float | None = None
+    discount_pct: float = 0.0
+
+
+class SimulatedRound(BaseModel):
+    name: str
+    pre_money_min: float
+    pre_money_max: float | None = None  # defaults to pre_money_min
+    raise_min: float
+    raise_max: float | None = None  # defaults to raise_min
+    steps: int = 10  # grid points per range
+    option_pool_pct: float = 0.0  # pool top-up, % of post-money, in the pre-money
+    convertibles: list[ConvertibleInput] = []
+
+
+class DilutionSimulationRequest(BaseModel):
+    rounds: list[SimulatedRound]  # applied in order
+
+
+class OwnershipDistribution(BaseModel):
+    min: float
+    p10: float
+    p50: float
+    p90: float
+    max: float
+    mean: float
+
+
+class SimulatedHolder(BaseModel):
+    name: str
+    type: str  # stakeholder type, or new_investor | option_pool | convertible
+    stakeholder_id: str | None = None
+    current_pct: float
+    ownership: OwnershipDistribution
+
+
+class DilutionSimulationResult(BaseModel):
+    scenarios: int
+    infeasible_scenarios: int
+    founder_ownership: OwnershipDistribution
+    holders: list[SimulatedHolder]
+
+
+# ── Liquidation Waterfall ────────────────────────────────────
+
+class WaterfallRequest(BaseModel):
+    exit_min: float
+    exit_max: float | None = None  # defaults to exit_min
+    steps: int = 25
+    accelerate_vsop: bool = False  # treat unvested VSOP grants as vested at exit
+
+
+class WaterfallPayout(BaseModel):
+    stakeholder_id: str
+    name: str
+    type: str
+    share_payout: float
+    vsop_payout: float
+    total_payout: float
+    pct_of_exit: float
+
+
+class WaterfallPoint(BaseModel):
+    exit_value: float
+    price_per_common_share: float
+    class_payouts: dict[str, float]  # share_class_id -> proceeds
+    converted_classes: list[str]  # non-participating classes that converted
+    vsop_payout: float
+    unallocated: float
+    payouts: list[WaterfallPayout]
+
+
+class WaterfallResult(BaseModel):
+    share_classes: list[ShareClassRead]
+    points: list[WaterfallPoint]
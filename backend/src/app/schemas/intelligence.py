@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class AskQuery(BaseModel):
@@ -18,6 +19,22 @@ class PipelineStatusResponse(BaseModel):
     company_id: str
 
 
+class EnrichmentJobRead(BaseModel):
+    id: str
+    company_id: str
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str] = None
+    run_after: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class CompareQuery(BaseModel):
     company_ids: list[str]
     question: str
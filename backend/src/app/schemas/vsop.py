@@ -87,3 +87,18 @@ class VsopSummary(BaseModel):
     total_unvested: int
     pool_utilization_pct: float
     overall_vesting_pct: float
+
+
+# ── Vesting Schedule (computed) ──────────────────────────────
+
+class VestingSchedulePoint(BaseModel):
+    month: str  # YYYY-MM
+    vested_shares: int
+    unvested_shares: int
+    vesting_pct: float
+
+
+class VsopSchedule(BaseModel):
+    pool_total_shares: int
+    total_granted: int
+    points: list[VestingSchedulePoint]
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.config import settings
 from app.models.allocation import Allocation
 from app.models.equity_event import EquityEvent
 from app.models.share_class import ShareClass
@@ -17,13 +18,175 @@ from app.schemas.captable import (
     CapTableKPIs,
     CapTableRow,
     CapTableSnapshot,
+    DilutionSimulationRequest,
+    DilutionSimulationResult,
     EquityEventCreate,
     EquityEventRead,
     ShareClassCreate,
     ShareClassRead,
     StakeholderCreate,
+    StakeholderRead,
     StakeholderUpdate,
+    WaterfallRequest,
+    WaterfallResult,
 )
+from app.services.captable_simulator import simulate_dilution
+from app.services.captable_waterfall import VsopClaim, build_class_terms, run_waterfall
+from app.services.vsop_service import VsopService
+
+# Replayed ledgers per company, dropped whenever its equity data changes.
+# The version counter keeps a replay that raced with a write from being cached.
+_ledgers: dict[str, CapTableLedger] = {}
+_ledger_versions: dict[str, int] = {}
+
+
+def invalidate_ledger(company_id: str) -> None:
+    _ledger_versions[company_id] = _ledger_versions.get(company_id, 0) + 1
+    _ledgers.pop(company_id, None)
+
+
+@dataclass
+class Checkpoint:
+    """Holdings right after ``event`` was applied."""
+
+    event: EquityEventRead
+    shares: dict[str, dict[str, int]]  # stakeholder_id -> share_class_id -> shares
+    invested: dict[str, float]
+    total_shares: int
+
+
+@dataclass
+class CapTableLedger:
+    """All equity events of a company replayed once, with a checkpoint per event.
+
+    Snapshot, KPI and evolution views are read from the checkpoints instead
+    of reloading and replaying the events for each of them.
+    """
+
+    stakeholders: dict[str, StakeholderRead]
+    share_classes: list[ShareClassRead]
+    checkpoints: list[Checkpoint] = field(default_factory=list)
+    invested_by_class: dict[str, float] = field(default_factory=dict)
+    total_raised: float = 0.0
+    last_valuation: float | None = None
+    post_money_valuation: float | None = None
+    last_round_name: str | None = None
+    rounds_count: int = 0
+    _rows: dict[int, list[CapTableRow]] = field(default_factory=dict)
+
+    @classmethod
+    def replay(
+        cls,
+        events: list[EquityEvent],
+        stakeholders: list[Stakeholder],
+        share_classes: list[ShareClass],
+    ) -> CapTableLedger:
+        ledger = cls(
+            stakeholders={s.id: StakeholderRead.model_validate(s) for s in stakeholders},
+            share_classes=[ShareClassRead.model_validate(sc) for sc in share_classes],
+        )
+        shares: dict[str, dict[str, int]] = {}
+        invested: dict[str, float] = {}
+        total_shares = 0
+
+        # Walk events chronologically
+        for event in events:
+            # Holdings the event doesn't touch are shared with the previous checkpoint
+            shares = dict(shares)
+            invested = dict(invested)
+            touched: set[str] = set()
+            for alloc in event.allocations:
+                sid = alloc.stakeholder_id
+                if sid not in touched:
+                    shares[sid] = dict(shares.get(sid, {}))
+                    touched.add(sid)
+                class_shares = shares[sid]
+                class_shares[alloc.share_class_id] = (
+                    class_shares.get(alloc.share_class_id, 0) + alloc.shares
+                )
+                total_shares += alloc.shares
+                if alloc.amount_invested:
+                    invested[sid] = invested.get(sid, 0.0) + alloc.amount_invested
+                    ledger.invested_by_class[alloc.share_class_id] = (
+                        ledger.invested_by_class.get(alloc.share_class_id, 0.0)
+                        + alloc.amount_invested
+                    )
+            ledger.checkpoints.append(
+                Checkpoint(serialize_event(event), shares, invested, total_shares)
+            )
+
+            if event.amount_raised:
+                ledger.total_raised += event.amount_raised
+            if event.event_type in ("funding_round", "incorporation"):
+                ledger.rounds_count += 1
+                ledger.last_round_name = event.name
+                if event.pre_money_valuation:
+                    ledger.last_valuation = event.pre_money_valuation
+                    ledger.post_money_valuation = (
+                        event.pre_money_valuation + (event.amount_raised or 0)
+                    )
+        return ledger
+
+    @property
+    def total_shares(self) -> int:
+        return self.checkpoints[-1].total_shares if self.checkpoints else 0
+
+    def rows(self, index: int = -1) -> list[CapTableRow]:
+        """Cap table rows as of checkpoint ``index`` (default: latest)."""
+        if not self.checkpoints:
+            return []
+        index %= len(self.checkpoints)
+        rows = self._rows.get(index)
+        if rows is None:
+            cp = self.checkpoints[index]
+            rows = []
+            for sid, class_shares in cp.shares.items():
+                sh = self.stakeholders.get(sid)
+                if not sh:
+                    continue
+                s_total = sum(class_shares.values())
+                pct = (s_total / cp.total_shares * 100) if cp.total_shares > 0 else 0
+                rows.append(
+                    CapTableRow(
+                        stakeholder=sh,
+                        shares_by_class=class_shares,
+                        total_shares=s_total,
+                        ownership_pct=round(pct, 2),
+                        total_invested=cp.invested.get(sid, 0),
+                    )
+                )
+            rows.sort(key=lambda r: r.ownership_pct, reverse=True)
+            self._rows[index] = rows
+        return rows
+
+    def snapshot(self) -> CapTableSnapshot:
+        return CapTableSnapshot(
+            rows=self.rows(),
+            total_shares=self.total_shares,
+            share_classes=self.share_classes,
+        )
+
+    def kpis(self) -> CapTableKPIs:
+        founder_pct = sum(
+            row.ownership_pct for row in self.rows()
+            if row.stakeholder.type == "founder"
+        )
+        return CapTableKPIs(
+            last_valuation=self.last_valuation,
+            post_money_valuation=self.post_money_valuation,
+            total_raised=self.total_raised,
+            total_shareholders=len(self.stakeholders),
+            founder_ownership_pct=round(founder_pct, 2),
+            total_shares=self.total_shares,
+            rounds_count=self.rounds_count,
+            last_round_name=self.last_round_name,
+        )
+
+    def evolution(self) -> list[CapTableEvolutionEntry]:
+        return [
+            CapTableEvolutionEntry(event=cp.event, snapshot=self.rows(i))
+            for i, cp in enumerate(self.checkpoints)
+        ]
 
 
 class CapTableService:
@@ -38,6 +201,7 @@ class CapTableService:
         sc = ShareClass(company_id=company_id, **data.model_dump())
         self.session.add(sc)
         await self.session.commit()
+        invalidate_ledger(company_id)
         await self.session.refresh(sc)
         return sc
 
@@ -58,6 +222,7 @@ class CapTableService:
             return False
         await self.session.delete(sc)
         await self.session.commit()
+        invalidate_ledger(sc.company_id)
         return True
 
     # ── Stakeholders ─────────────────────────────────────────
@@ -68,6 +233,7 @@ class CapTableService:
         sh = Stakeholder(company_id=company_id, **data.model_dump())
         self.session.add(sh)
         await self.session.commit()
+        invalidate_ledger(company_id)
         await self.session.refresh(sh)
         return sh
 
@@ -79,9 +245,10 @@ class CapTableService:
         sh = result.scalar_one_or_none()
         if not sh:
             return None
-        for field, value in data.model_dump(exclude_unset=True).items():
-            setattr(sh, field, value)
+        for field_name, value in data.model_dump(exclude_unset=True).items():
+            setattr(sh, field_name, value)
         await self.session.commit()
+        invalidate_ledger(sh.company_id)
         await self.session.refresh(sh)
         return sh
 
@@ -93,6 +260,7 @@ class CapTableService:
             return False
         await self.session.delete(sh)
         await self.session.commit()
+        invalidate_ledger(sh.company_id)
         return True
 
     async def list_stakeholders(self, company_id: str) -> list[Stakeholder]:
@@ -130,6 +298,7 @@ class CapTableService:
             self.session.add(alloc)
 
         await self.session.commit()
+        invalidate_ledger(company_id)
 
         # Reload with relationships
         stmt = (
@@ -164,167 +333,82 @@ class CapTableService:
             return False
         await self.session.delete(event)
         await self.session.commit()
+        invalidate_ledger(event.company_id)
         return True
 
     # ── Cap Table Snapshot ───────────────────────────────────
 
-    async def get_cap_table(self, company_id: str) -> CapTableSnapshot:
-        events = await self.list_equity_events(company_id)
-        share_classes = await self.list_share_classes(company_id)
-        stakeholders = await self.list_stakeholders(company_id)
-
-        # Aggregate all allocations
-        stakeholder_map: dict[str, Stakeholder] = {s.id: s for s in stakeholders}
-        shares_by_stakeholder: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        invested_by_stakeholder: dict[str, float] = defaultdict(float)
-
-        total_shares = 0
-        for event in events:
-            for alloc in event.allocations:
-                shares_by_stakeholder[alloc.stakeholder_id][alloc.share_class_id] += alloc.shares
-                total_shares += alloc.shares
-                if alloc.amount_invested:
-                    invested_by_stakeholder[alloc.stakeholder_id] += alloc.amount_invested
-
-        rows: list[CapTableRow] = []
-        for sid, class_shares in shares_by_stakeholder.items():
-            sh = stakeholder_map.get(sid)
-            if not sh:
-                continue
-            s_total = sum(class_shares.values())
-            pct = (s_total / total_shares * 100) if total_shares > 0 else 0
-            rows.append(
-                CapTableRow(
-                    stakeholder=StakeholderRead.model_validate(sh),
-                    shares_by_class=class_shares,
-                    total_shares=s_total,
-                    ownership_pct=round(pct, 2),
-                    total_invested=invested_by_stakeholder.get(sid, 0),
-                )
+    async def get_ledger(self, company_id: str) -> CapTableLedger:
+        """The company's replayed ledger, built on first use after any change."""
+        ledger = _ledgers.get(company_id)
+        if ledger is None:
+            version = _ledger_versions.get(company_id, 0)
+            ledger = CapTableLedger.replay(
+                await self.list_equity_events(company_id),
+                await self.list_stakeholders(company_id),
+                await self.list_share_classes(company_id),
             )
+            if _ledger_versions.get(company_id, 0) == version:
+                _ledgers[company_id] = ledger
+        return ledger
 
-        rows.sort(key=lambda r: r.ownership_pct, reverse=True)
-
-        return CapTableSnapshot(
-            rows=rows,
-            total_shares=total_shares,
-            share_classes=[ShareClassRead.model_validate(sc) for sc in share_classes],
-        )
+    async def get_cap_table(self, company_id: str) -> CapTableSnapshot:
+        return (await self.get_ledger(company_id)).snapshot()
 
     async def get_kpis(self, company_id: str) -> CapTableKPIs:
-        events = await self.list_equity_events(company_id)
-        stakeholders = await self.list_stakeholders(company_id)
-
-        total_raised = 0.0
-        last_valuation: float | None = None
-        post_money: float | None = None
-        last_round_name: str | None = None
-        rounds_count = 0
-
-        # Walk events chronologically
-        for event in events:
-            if event.amount_raised:
-                total_raised += event.amount_raised
-            if event.event_type in ("funding_round", "incorporation"):
-                rounds_count += 1
-                last_round_name = event.name
-                if event.pre_money_valuation:
-                    last_valuation = event.pre_money_valuation
-                    post_money = event.pre_money_valuation + (event.amount_raised or 0)
-
-        # Compute founder ownership from snapshot
-        snapshot = await self.get_cap_table(company_id)
-        founder_pct = sum(
-            row.ownership_pct for row in snapshot.rows
-            if row.stakeholder.type == "founder"
-        )
-
-        return CapTableKPIs(
-            last_valuation=last_valuation,
-            post_money_valuation=post_money,
-            total_raised=total_raised,
-            total_shareholders=len(stakeholders),
-            founder_ownership_pct=round(founder_pct, 2),
-            total_shares=snapshot.total_shares,
-            rounds_count=rounds_count,
-            last_round_name=last_round_name,
-        )
+        return (await self.get_ledger(company_id)).kpis()
 
     async def get_cap_table_evolution(
         self, company_id: str
     ) -> list[CapTableEvolutionEntry]:
-        events = await self.list_equity_events(company_id)
-        stakeholders = await self.list_stakeholders(company_id)
-
-        stakeholder_map: dict[str, Stakeholder] = {s.id: s for s in stakeholders}
-        cumulative_shares: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        cumulative_invested: dict[str, float] = defaultdict(float)
-        cumulative_total = 0
-
-        evolution: list[CapTableEvolutionEntry] = []
-
-        for event in events:
-            for alloc in event.allocations:
-                cumulative_shares[alloc.stakeholder_id][alloc.share_class_id] += alloc.shares
-                cumulative_total += alloc.shares
-                if alloc.amount_invested:
-                    cumulative_invested[alloc.stakeholder_id] += alloc.amount_invested
+        return (await self.get_ledger(company_id)).evolution()
+
+    async def simulate(
+        self, company_id: str, data: DilutionSimulationRequest
+    ) -> DilutionSimulationResult:
+        """Ownership distributions for hypothetical rounds on today's cap table."""
+        ledger = await self.get_ledger(company_id)
+        return simulate_dilution(
+            ledger.rows(),
+            ledger.total_shares,
+            data.rounds,
+            settings.captable_simulation_max_scenarios,
+        )
 
-            # Build snapshot at this point
-            rows: list[CapTableRow] = []
-            for sid, class_shares in cumulative_shares.items():
-                sh = stakeholder_map.get(sid)
-                if not sh:
-                    continue
-                s_total = sum(class_shares.values())
-                pct = (s_total / cumulative_total * 100) if cumulative_total > 0 else 0
-                rows.append(
-                    CapTableRow(
-                        stakeholder=StakeholderRead.model_validate(sh),
-                        shares_by_class=dict(class_shares),
-                        total_shares=s_total,
-                        ownership_pct=round(pct, 2),
-                        total_invested=cumulative_invested.get(sid, 0),
-                    )
-                )
-            rows.sort(key=lambda r: r.ownership_pct, reverse=True)
+    async def get_waterfall(
+        self, company_id: str, data: WaterfallRequest
+    ) -> WaterfallResult:
+        """Exit proceeds per share class and stakeholder across a range of exit values."""
+        ledger = await self.get_ledger(company_id)
+        holdings = ledger.checkpoints[-1].shares if ledger.checkpoints else {}
+        class_shares: dict[str, int] = {}
+        for by_class in holdings.values():
+            for class_id, shares in by_class.items():
+                class_shares[class_id] = class_shares.get(class_id, 0) + shares
+        classes = build_class_terms(
+            ledger.share_classes, class_shares, ledger.invested_by_class
+        )
 
-            # Build event read with allocation details
-            alloc_reads = []
-            for a in event.allocations:
-                alloc_reads.append(
-                    AllocationRead(
-                        id=a.id,
-                        stakeholder_id=a.stakeholder_id,
-                        stakeholder_name=a.stakeholder.name if a.stakeholder else None,
-                        share_class_id=a.share_class_id,
-                        share_class_name=a.share_class.name if a.share_class else None,
-                        shares=a.shares,
-                        amount_invested=a.amount_invested,
-                        ownership_pct=a.ownership_pct,
-                        notes=a.notes,
+        vsop_summary = await VsopService(self.session).get_summary(company_id)
+        vsop = []
+        for grant in vsop_summary.grants:
+            if grant.status == "terminated":
+                continue
+            shares = grant.shares_granted if data.accelerate_vsop else grant.vested_shares
+            if shares > 0:
+                vsop.append(
+                    VsopClaim(
+                        stakeholder_id=grant.stakeholder_id,
+                        name=grant.stakeholder_name or "",
+                        shares=shares,
+                        strike=grant.strike_price or 0.0,
                     )
                 )
 
-            event_read = EquityEventRead(
-                id=event.id,
-                name=event.name,
-                event_type=event.event_type,
-                date=event.date,
-                pre_money_valuation=event.pre_money_valuation,
-                amount_raised=event.amount_raised,
-                price_per_share=event.price_per_share,
-                total_shares_after=event.total_shares_after,
-                notes=event.notes,
-                allocations=alloc_reads,
-                created_at=event.created_at,
-            )
-
-            evolution.append(
-                CapTableEvolutionEntry(event=event_read, snapshot=rows)
-            )
-
-        return evolution
+        return WaterfallResult(
+            share_classes=ledger.share_classes,
+            points=run_waterfall(data, classes, holdings, ledger.stakeholders, vsop),
+        )
 
 
 # ── Serialization helpers for routes ─────────────────────────
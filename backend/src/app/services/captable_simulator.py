@@ -0,0 +1,185 @@
+"""What-if dilution across grids of hypothetical financing rounds.
+
+Every round dilutes all holders that exist before it by the same factor, so
+a scenario reduces to one number per round rather than a recomputation of
+the whole cap table. For pre-money ``V``, raise ``R``, pool top-up ``p``
+(share of post-money, issued in the pre-money) and convertibles that turn
+into ``c`` times the pre-money share count:
+
+    g = R / V
+    F = T / (1 - p(1 + g) - c)        pre-money fully diluted shares
+    existing holders keep (1 - p(1 + g) - c) / (1 + g) of their stake
+    new investors get g / (1 + g), the pool p, convertibles c / (1 + g)
+
+Each current stakeholder's ownership across scenarios is their stake times
+the cumulative factor, so distributions are read off one sorted list
+instead of a stakeholders × scenarios matrix.
+"""
+from __future__ import annotations
+
+import itertools
+import math
+
+from app.schemas.captable import (
+    CapTableRow,
+    DilutionSimulationResult,
+    OwnershipDistribution,
+    SimulatedHolder,
+    SimulatedRound,
+)
+
+MAX_STEPS = 100
+
+
+def _grid(low: float, high: float | None, steps: int) -> list[float]:
+    if high is None or high == low or steps == 1:
+        return [low]
+    return [low + (high - low) * i / (steps - 1) for i in range(steps)]
+
+
+def _validate(rounds: list[SimulatedRound], max_scenarios: int) -> None:
+    if not rounds:
+        raise ValueError("At least one round is required")
+    count = 1
+    for rnd in rounds:
+        if rnd.pre_money_min <= 0:
+            raise ValueError(f"{rnd.name}: pre-money valuation must be positive")
+        if rnd.pre_money_max is not None and rnd.pre_money_max < rnd.pre_money_min:
+            raise ValueError(f"{rnd.name}: pre_money_max is below pre_money_min")
+        if rnd.raise_min < 0:
+            raise ValueError(f"{rnd.name}: raise must not be negative")
+        if rnd.raise_max is not None and rnd.raise_max < rnd.raise_min:
+            raise ValueError(f"{rnd.name}: raise_max is below raise_min")
+        if not 1 <= rnd.steps <= MAX_STEPS:
+            raise ValueError(f"{rnd.name}: steps must be between 1 and {MAX_STEPS}")
+        if not 0 <= rnd.option_pool_pct < 100:
+            raise ValueError(f"{rnd.name}: option_pool_pct must be in [0, 100)")
+        for conv in rnd.convertibles:
+            if conv.amount <= 0:
+                raise ValueError(f"{rnd.name}: {conv.name} amount must be positive")
+            if conv.valuation_cap is not None and conv.valuation_cap <= 0:
+                raise ValueError(f"{rnd.name}: {conv.name} valuation cap must be positive")
+            if not 0 <= conv.discount_pct < 100:
+                raise ValueError(f"{rnd.name}: {conv.name} discount must be in [0, 100)")
+        count *= (
+            len(_grid(rnd.pre_money_min, rnd.pre_money_max, rnd.steps))
+            * len(_grid(rnd.raise_min, rnd.raise_max, rnd.steps))
+        )
+    if count > max_scenarios:
+        raise ValueError(
+            f"{count} scenarios requested, the limit is {max_scenarios}; use fewer steps"
+        )
+
+
+def _round_terms(rnd: SimulatedRound) -> list[tuple[float, list[float]] | None]:
+    """(dilution factor, fractions issued) per grid point; None if infeasible.
+
+    Fractions are ordered new investors, pool top-up, then each convertible.
+    """
+    pool = rnd.option_pool_pct / 100
+    terms: list[tuple[float, list[float]] | None] = []
+    for pre_money in _grid(rnd.pre_money_min, rnd.pre_money_max, rnd.steps):
+        conv_ratios = []
+        for conv in rnd.convertibles:
+            price_value = pre_money * (1 - conv.discount_pct / 100)
+            if conv.valuation_cap is not None:
+                price_value = min(price_value, conv.valuation_cap)
+            conv_ratios.append(conv.amount / price_value)
+        for raised in _grid(rnd.raise_min, rnd.raise_max, rnd.steps):
+            g = raised / pre_money
+            kept = 1 - pool * (1 + g) - sum(conv_ratios)
+            if kept <= 0:
+                terms.append(None)
+                continue
+            issued = [g / (1 + g), pool] + [c / (1 + g) for c in conv_ratios]
+            terms.append((kept / (1 + g), issued))
+    return terms
+
+
+def _distribution(values: list[float], scale: float = 1.0) -> OwnershipDistribution:
+    """Percentiles of ``values`` (sorted ascending) times ``scale``, in percent."""
+    if not values:
+        return OwnershipDistribution(min=0, p10=0, p50=0, p90=0, max=0, mean=0)
+
+    def pct(q: float) -> float:
+        pos = (len(values) - 1) * q
+        lo = math.floor(pos)
+        hi = min(lo + 1, len(values) - 1)
+        value = values[lo] + (values[hi] - values[lo]) * (pos - lo)
+        return round(value * scale * 100, 2)
+
+    return OwnershipDistribution(
+        min=pct(0),
+        p10=pct(0.1),
+        p50=pct(0.5),
+        p90=pct(0.9),
+        max=pct(1),
+        mean=round(sum(values) / len(values) * scale * 100, 2),
+    )
+
+
+def simulate_dilution(
+    rows: list[CapTableRow],
+    total_shares: int,
+    rounds: list[SimulatedRound],
+    max_scenarios: int,
+) -> DilutionSimulationResult:
+    """Ownership distributions after ``rounds`` over every grid combination."""
+    _validate(rounds, max_scenarios)
+
+    per_round = [_round_terms(rnd) for rnd in rounds]
+    group_labels: list[tuple[str, str]] = []
+    for rnd in rounds:
+        group_labels.append((f"{rnd.name} investors", "new_investor"))
+        group_labels.append((f"{rnd.name} pool top-up", "option_pool"))
+        group_labels.extend((f"{rnd.name} {conv.name}", "convertible") for conv in rnd.convertibles)
+
+    retained: list[float] = []  # share of today's cap table kept, per scenario
+    issued: list[list[float]] = [[] for _ in group_labels]
+    infeasible = 0
+    for combo in itertools.product(*per_round):
+        if None in combo:
+            infeasible += 1
+            continue
+        # Walk rounds newest first so each group is diluted by later rounds only
+        tail = 1.0
+        fractions: list[float] = []
+        for factor, round_issued in reversed(combo):
+            fractions[:0] = [f * tail for f in round_issued]
+            tail *= factor
+        retained.append(tail)
+        for i, value in enumerate(fractions):
+            issued[i].append(value)
+
+    retained.sort()
+    holders: list[SimulatedHolder] = []
+    founder_share = 0.0
+    for row in rows:
+        share = row.total_shares / total_shares if total_shares else 0.0
+        if row.stakeholder.type == "founder":
+            founder_share += share
+        holders.append(
+            SimulatedHolder(
+                name=row.stakeholder.name,
+                type=row.stakeholder.type,
+                stakeholder_id=row.stakeholder.id,
+                current_pct=row.ownership_pct,
+                ownership=_distribution(retained, share),
+            )
+        )
+    for (name, kind), values in zip(group_labels, issued):
+        if kind == "option_pool" and not any(values):
+            continue
+        values.sort()
+        holders.append(
+            SimulatedHolder(
+                name=name, type=kind, current_pct=0.0, ownership=_distribution(values)
+            )
+        )
+
+    return DilutionSimulationResult(
+        scenarios=len(retained),
+        infeasible_scenarios=infeasible,
+        founder_ownership=_distribution(retained, founder_share),
+        holders=holders,
+    )
@@ -0,0 +1,226 @@
+"""Liquidation waterfall over share-class seniority.
+
+Preferences are paid from the most senior class down (higher ``seniority``
+first, equal seniority pari passu), each class claiming its multiple of the
+amount invested in it. What remains is shared per share by common,
+participating and converted classes, and by VSOP grants as phantom common
+shares paying out the per-share value above their strike. Non-participating
+classes convert to common when that pays them more, lowest preference per
+share first.
+
+Preference terms come from the free-form ``ShareClass.liquidation_preference``
+("1x", "1.5x non-participating", "2x participating"); a value without a
+multiple means common. Participation caps are not modelled.
+"""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+
+from app.schemas.captable import (
+    ShareClassRead,
+    StakeholderRead,
+    WaterfallPayout,
+    WaterfallPoint,
+    WaterfallRequest,
+)
+
+MAX_STEPS = 200
+
+_MULTIPLE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*x")
+
+
+@dataclass
+class ClassTerms:
+    id: str
+    seniority: int
+    shares: int
+    preference: float  # total amount claimed ahead of junior classes
+    participating: bool
+
+
+@dataclass
+class VsopClaim:
+    stakeholder_id: str
+    name: str
+    shares: int
+    strike: float
+
+
+def parse_preference(text: str | None) -> tuple[float, bool]:
+    """(multiple, participating) from e.g. "1x" or "2x participating"."""
+    if not text:
+        return 0.0, False
+    lowered = text.lower()
+    match = _MULTIPLE_RE.search(lowered)
+    if not match:
+        return 0.0, False
+    participating = "participating" in lowered and "non" not in lowered
+    return float(match.group(1)), participating
+
+
+def build_class_terms(
+    share_classes: list[ShareClassRead],
+    class_shares: dict[str, int],
+    invested_by_class: dict[str, float],
+) -> list[ClassTerms]:
+    """Terms for every class that holds shares; unknown classes count as common."""
+    by_id = {sc.id: sc for sc in share_classes}
+    terms = []
+    for class_id, shares in class_shares.items():
+        sc = by_id.get(class_id)
+        multiple, participating = parse_preference(sc.liquidation_preference if sc else None)
+        terms.append(
+            ClassTerms(
+                id=class_id,
+                seniority=sc.seniority if sc else 0,
+                shares=shares,
+                preference=multiple * invested_by_class.get(class_id, 0.0),
+                participating=participating,
+            )
+        )
+    return terms
+
+
+def _common_price(residual: float, common_shares: int, vsop: list[VsopClaim]) -> float:
+    """Per-share value p with p·N + Σ max(p − strike, 0)·n = residual.
+
+    ``vsop`` must be sorted by strike; grants join the pool one by one as
+    the price rises past their strike.
+    """
+    active, strike_sum = common_shares, 0.0
+    for claim in vsop:
+        price = (residual + strike_sum) / active if active else math.inf
+        if price <= claim.strike:
+            return price
+        active += claim.shares
+        strike_sum += claim.strike * claim.shares
+    return (residual + strike_sum) / active if active else 0.0
+
+
+def _distribute(
+    exit_value: float,
+    classes: list[ClassTerms],
+    converted: set[str],
+    vsop: list[VsopClaim],
+) -> tuple[dict[str, float], float, float]:
+    """Class payouts, common price and undistributed remainder for one exit."""
+    payouts = {c.id: 0.0 for c in classes}
+    remaining = exit_value
+
+    tiers: dict[int, list[ClassTerms]] = {}
+    for c in classes:
+        if c.preference > 0 and c.id not in converted:
+            tiers.setdefault(c.seniority, []).append(c)
+    for seniority in sorted(tiers, reverse=True):
+        claim = sum(c.preference for c in tiers[seniority])
+        paid = min(remaining, claim)
+        for c in tiers[seniority]:
+            payouts[c.id] += paid * c.preference / claim
+        remaining -= paid
+
+    sharing = [
+        c for c in classes if c.preference == 0 or c.participating or c.id in converted
+    ]
+    price = _common_price(remaining, sum(c.shares for c in sharing), vsop)
+    for c in sharing:
+        payouts[c.id] += c.shares * price
+    distributed = sum(c.shares for c in sharing) * price + sum(
+        max(price - v.strike, 0.0) * v.shares for v in vsop
+    )
+    return payouts, price, max(remaining - distributed, 0.0)
+
+
+def waterfall_at(
+    exit_value: float, classes: list[ClassTerms], vsop: list[VsopClaim]
+) -> tuple[dict[str, float], float, float, set[str]]:
+    """Payouts for one exit value, converting non-participating classes when better."""
+    converted: set[str] = set()
+    payouts, price, unallocated = _distribute(exit_value, classes, converted, vsop)
+    candidates = sorted(
+        (c for c in classes if c.preference > 0 and not c.participating and c.shares),
+        key=lambda c: c.preference / c.shares,
+    )
+    for c in candidates:
+        trial = _distribute(exit_value, classes, converted | {c.id}, vsop)
+        if trial[0][c.id] <= payouts[c.id]:
+            break
+        converted.add(c.id)
+        payouts, price, unallocated = trial
+    return payouts, price, unallocated, converted
+
+
+def run_waterfall(
+    data: WaterfallRequest,
+    classes: list[ClassTerms],
+    holdings: dict[str, dict[str, int]],
+    stakeholders: dict[str, StakeholderRead],
+    vsop: list[VsopClaim],
+) -> list[WaterfallPoint]:
+    """Sweep the waterfall across ``steps`` exit values from exit_min to exit_max."""
+    exit_max = data.exit_min if data.exit_max is None else data.exit_max
+    if data.exit_min < 0:
+        raise ValueError("Exit value must not be negative")
+    if exit_max < data.exit_min:
+        raise ValueError("exit_max is below exit_min")
+    if not 1 <= data.steps <= MAX_STEPS:
+        raise ValueError(f"steps must be between 1 and {MAX_STEPS}")
+
+    if exit_max == data.exit_min or data.steps == 1:
+        exits = [data.exit_min]
+    else:
+        span = exit_max - data.exit_min
+        exits = [data.exit_min + span * i / (data.steps - 1) for i in range(data.steps)]
+    vsop = sorted(vsop, key=lambda v: v.strike)
+    class_size = {c.id: c.shares for c in classes}
+
+    points = []
+    for exit_value in exits:
+        payouts, price, unallocated, converted = waterfall_at(exit_value, classes, vsop)
+        per_share = {cid: payouts[cid] / n for cid, n in class_size.items() if n}
+
+        share_payout: dict[str, float] = {}
+        for sid, class_shares in holdings.items():
+            share_payout[sid] = sum(
+                n * per_share.get(cid, 0.0) for cid, n in class_shares.items()
+            )
+        vsop_payout: dict[str, float] = {}
+        names: dict[str, str] = {}
+        for v in vsop:
+            vsop_payout[v.stakeholder_id] = (
+                vsop_payout.get(v.stakeholder_id, 0.0) + max(price - v.strike, 0.0) * v.shares
+            )
+            names[v.stakeholder_id] = v.name
+
+        rows = []
+        for sid in share_payout.keys() | vsop_payout.keys():
+            sh = stakeholders.get(sid)
+            if not sh and sid not in names:
+                continue
+            total = share_payout.get(sid, 0.0) + vsop_payout.get(sid, 0.0)
+            rows.append(
+                WaterfallPayout(
+                    stakeholder_id=sid,
+                    name=sh.name if sh else names[sid],
+                    type=sh.type if sh else "employee",
+                    share_payout=round(share_payout.get(sid, 0.0), 2),
+                    vsop_payout=round(vsop_payout.get(sid, 0.0), 2),
+                    total_payout=round(total, 2),
+                    pct_of_exit=round(total / exit_value * 100, 2) if exit_value else 0,
+                )
+            )
+        rows.sort(key=lambda r: r.total_payout, reverse=True)
+
+        points.append(
+            WaterfallPoint(
+                exit_value=round(exit_value, 2),
+                price_per_common_share=round(price, 6),
+                class_payouts={cid: round(v, 2) for cid, v in payouts.items()},
+                converted_classes=sorted(converted),
+                vsop_payout=round(sum(vsop_payout.values()), 2),
+                unallocated=round(unallocated, 2),
+                payouts=rows,
+            )
+        )
+    return points
@@ -55,7 +55,7 @@ def _parse_flexible_date(date_str: str) -> datetime | None:
     logger.warning("Could not parse funding date: %r", date_str)
     return None
 
-from sqlalchemy import delete, insert, select
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -68,6 +68,7 @@ from app.models.investor import Investor
 from app.models.market_category import MarketCategory
 from app.models.product import Product
 from app.schemas.company import CompanyCreate
+from app.services.captable_service import invalidate_ledger
 
 if TYPE_CHECKING:
     from app.intelligence.research import ResearchContext
@@ -83,6 +84,19 @@ class CompanyService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def _touch(self, company_id: str) -> None:
+        """Bump the company's updated_at after writing its child rows.
+
+        Context-doc fingerprints only see child row counts and creation
+        times, so in-place child updates (and deletes offset by inserts)
+        must move this timestamp; microseconds keep same-second writes apart.
+        """
+        await self.session.execute(
+            update(Company)
+            .where(Company.id == company_id)
+            .values(updated_at=datetime.utcnow())
+        )
+
     async def create(self, data: CompanyCreate) -> Company:
         company = Company(name=data.name)
         self.session.add(company)
@@ -96,6 +110,7 @@ class CompanyService:
             return False
         await self.session.delete(company)
         await self.session.commit()
+        invalidate_ledger(company_id)
         return True
 
     async def delete_source(self, company_id: str, source_id: str) -> bool:
@@ -109,6 +124,7 @@ class CompanyService:
         if not source:
             return False
         await self.session.delete(source)
+        await self._touch(company_id)
         await self.session.commit()
         return True
 
@@ -125,6 +141,7 @@ class CompanyService:
         if not post:
             return False
         await self.session.delete(post)
+        await self._touch(company_id)
         await self.session.commit()
         return True
 
@@ -188,6 +205,7 @@ class CompanyService:
             company.industry_focus = None
             company.crosscheck_result = None
 
+        await self._touch(company_id)
         await self.session.commit()
 
     async def clear_intelligence_data(self, company_id: str) -> None:
@@ -243,6 +261,7 @@ class CompanyService:
             company.industry_focus = None
             company.crosscheck_result = None
 
+        await self._touch(company_id)
         await self.session.commit()
 
     async def clear_digests(self, company_id: str) -> None:
@@ -252,6 +271,7 @@ class CompanyService:
         await self.session.execute(
             delete(CompanyDigest).where(CompanyDigest.company_id == company_id)
         )
+        await self._touch(company_id)
         await self.session.commit()
 
     async def get_by_id(self, company_id: str) -> Company | None:
@@ -336,6 +356,7 @@ class CompanyService:
                 company_id=company_id,
             )
             self.session.add(ds)
+        await self._touch(company_id)
         await self.session.commit()
 
     async def apply_discovery(
@@ -423,6 +444,7 @@ class CompanyService:
             if category not in company.categories:
                 company.categories.append(category)
 
+        await self._touch(company_id)
         await self.session.commit()
 
     async def apply_media_fingerprint(
@@ -472,6 +494,7 @@ class CompanyService:
             )
             self.session.add(event)
 
+        await self._touch(company_id)
         await self.session.commit()
 
     async def apply_market_intel(
@@ -571,6 +594,7 @@ class CompanyService:
                 company_id=company_id,
             )
             self.session.add(post)
+        await self._touch(company_id)
         await self.session.commit()
 
     async def add_custom_source(
@@ -594,6 +618,7 @@ class CompanyService:
             company_id=company_id,
         )
         self.session.add(ds)
+        await self._touch(company_id)
         await self.session.commit()
         await self.session.refresh(ds)
         return ds
@@ -645,6 +670,7 @@ class CompanyService:
                     company_id=company_id,
                 )
                 self.session.add(product)
+        await self._touch(company_id)
         await self.session.commit()
 
     async def store_digest(
@@ -658,6 +684,29 @@ class CompanyService:
             company_id=company_id,
         )
         self.session.add(digest)
+        await self._touch(company_id)
+        await self.session.commit()
+
+    async def replace_digest(
+        self, company_id: str, markdown: str, digest_type: str
+    ) -> None:
+        """Store a digest in place of any earlier one of the same type."""
+        from app.models.company_digest import CompanyDigest
+
+        await self.session.execute(
+            delete(CompanyDigest).where(
+                CompanyDigest.company_id == company_id,
+                CompanyDigest.digest_type == digest_type,
+            )
+        )
+        self.session.add(
+            CompanyDigest(
+                digest_markdown=markdown,
+                digest_type=digest_type,
+                company_id=company_id,
+            )
+        )
+        await self._touch(company_id)
         await self.session.commit()
 
     async def apply_client_intelligence(
@@ -688,6 +737,7 @@ class CompanyService:
             company.geography_analysis = json.dumps(result.geography.model_dump())
             company.industry_focus = json.dumps(result.industry.model_dump())
 
+        await self._touch(company_id)
         await self.session.commit()
 
     async def get_competitor_clients(self, company_id: str) -> list:
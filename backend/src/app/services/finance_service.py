@@ -1,22 +1,40 @@
 import json
 import logging
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import case, delete, func, select, update
+from sqlalchemy import case, delete, exists, func, insert, literal, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.bank_transaction import BankTransaction
 from app.models.expense_category_rule import ExpenseCategoryRule
+from app.models.finance_monthly_rollup import FinanceMonthlyRollup
 from app.models.planned_expense import PlannedExpense
 from app.models.treasury_account import TreasuryAccount
+from app.schemas.finance import (
+    BurnRates,
+    FinanceDashboard,
+    FinanceKPIs,
+    ForecastSettings,
+    RunwayScenarios,
+)
 from app.services.holded_client import HoldedClient
 from app.services.settings_service import SettingsService
+from app.services.vendor_classifier import classify_locally
 
 logger = logging.getLogger(__name__)
 
+SYNC_BATCH_SIZE = 500  # rows per upsert statement / commit
+CLASSIFY_BATCH_SIZE = 50  # contacts per LLM classification call
+SYNC_OVERLAP_DAYS = 7  # re-fetch window before the high-water mark for late edits
+PAYMENTS_HIGH_WATER_KEY = "holded_payments_synced_through"  # unix ts
+
 # ── Module-level sync status (in-memory) ─────────────────────
 
 _sync_status: dict = {"status": "idle", "step": "", "progress": 0}
+_rollup_checked = False  # rollup backfilled (or found populated) this process
+_dashboard_cache: tuple[str, FinanceDashboard] | None = None  # (year_month built in, dashboard)
 
 STARTUP_CATEGORIES = [
     "Payroll",
@@ -44,6 +62,20 @@ def _set_sync_status(status: str, step: str = "", progress: int = 0):
     _sync_status["progress"] = progress
 
 
+def invalidate_dashboard_cache() -> None:
+    global _dashboard_cache
+    _dashboard_cache = None
+
+
+def _parse_forecast(raw: str | None) -> dict:
+    if raw:
+        try:
+            return json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            pass
+    return {"monthly_burn": 0.0, "monthly_income": 0.0}
+
+
 def _normalize_contact(contact_name: str | None, description: str | None) -> str:
     if contact_name:
         return contact_name
@@ -53,6 +85,42 @@ def _normalize_contact(contact_name: str | None, description: str | None) -> str
     return "Other"
 
 
+def _summarize_months(rows: list[FinanceMonthlyRollup]) -> list[dict]:
+    """Income, expenses and net per month from rollup rows, oldest first."""
+    months: dict[str, dict[str, float]] = {}
+    for r in rows:
+        month = months.setdefault(r.year_month, {"income": 0.0, "expenses": 0.0})
+        month["income" if r.direction == "in" else "expenses"] += r.total
+    return [
+        {
+            "year_month": ym,
+            "income": round(m["income"], 2),
+            "expenses": round(m["expenses"], 2),
+            "net": round(m["income"] - m["expenses"], 2),
+        }
+        for ym, m in sorted(months.items())
+    ]
+
+
+def _top_categories(
+    rows: list[FinanceMonthlyRollup], direction: str, months: int, limit: int = 15
+) -> list[dict]:
+    """Top categories for one direction over complete months in the window."""
+    now_ym = datetime.utcnow().strftime("%Y-%m")
+    cutoff = (datetime.utcnow() - timedelta(days=months * 31)).strftime("%Y-%m")
+    totals: dict[str, list] = {}
+    for r in rows:
+        if r.direction == direction and cutoff <= r.year_month < now_ym:
+            entry = totals.setdefault(r.category or "Other", [0.0, 0])
+            entry[0] += r.total
+            entry[1] += r.transaction_count
+    ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+    return [
+        {"category": category, "total": round(total, 2), "transaction_count": count}
+        for category, (total, count) in ranked
+    ]
+
+
 class FinanceService:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -61,37 +129,104 @@ class FinanceService:
 
     async def sync_treasury(self, client: HoldedClient) -> int:
         accounts = await client.get_treasury_accounts()
-        count = 0
-        for acc in accounts:
-            holded_id = acc.get("id", "")
-            if not holded_id:
-                continue
-            result = await self.session.execute(
-                select(TreasuryAccount).where(
-                    TreasuryAccount.holded_id == holded_id
-                )
+        now = datetime.utcnow()
+        rows = {
+            acc["id"]: {
+                "id": str(uuid.uuid4()),
+                "holded_id": acc["id"],
+                "name": acc.get("name", ""),
+                "account_type": acc.get("type", ""),
+                "balance": float(acc.get("balance", 0)),
+                "iban": acc.get("iban"),
+                "currency": acc.get("currency", "EUR"),
+                "updated_at": now,
+            }
+            for acc in accounts
+            if acc.get("id")
+        }
+        if rows:
+            stmt = sqlite_insert(TreasuryAccount)
+            await self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[TreasuryAccount.holded_id],
+                    set_={
+                        "name": stmt.excluded.name,
+                        "account_type": stmt.excluded.account_type,
+                        "balance": stmt.excluded.balance,
+                        "iban": stmt.excluded.iban,
+                        "updated_at": stmt.excluded.updated_at,
+                    },
+                ),
+                list(rows.values()),
             )
-            existing = result.scalar_one_or_none()
-            if existing:
-                existing.name = acc.get("name", "")
-                existing.account_type = acc.get("type", "")
-                existing.balance = float(acc.get("balance", 0))
-                existing.iban = acc.get("iban")
-                existing.updated_at = datetime.utcnow()
-            else:
-                self.session.add(
-                    TreasuryAccount(
-                        holded_id=holded_id,
-                        name=acc.get("name", ""),
-                        account_type=acc.get("type", ""),
-                        balance=float(acc.get("balance", 0)),
-                        iban=acc.get("iban"),
-                        currency=acc.get("currency", "EUR"),
-                    )
-                )
-            count += 1
         await self.session.commit()
-        return count
+        invalidate_dashboard_cache()
+        return len(rows)
+
+    @staticmethod
+    def _payment_row(pay: dict) -> dict | None:
+        """Map a Holded payment to a bank_transactions row (None if unusable)."""
+        holded_id = pay.get("id", "")
+        if not holded_id:
+            return None
+
+        ts = pay.get("date", 0)
+        dt = datetime.utcfromtimestamp(ts) if ts else datetime.utcnow()
+
+        raw_contact = pay.get("contactName") or None
+        desc = pay.get("desc", "")
+        return {
+            "id": str(uuid.uuid4()),
+            "holded_id": holded_id,
+            "treasury_holded_id": pay.get("bankId"),
+            "date": dt,
+            "amount": float(pay.get("amount", 0)),
+            "description": desc,
+            "contact_name": _normalize_contact(raw_contact, desc),
+            "year_month": dt.strftime("%Y-%m"),
+            "created_at": datetime.utcnow(),
+        }
+
+    async def _upsert_payments(self, payments: list[dict]) -> int:
+        """Insert-or-update payments in chunks, committing after each chunk.
+
+        Existing rows keep their id, created_at and category; committing per
+        chunk releases the SQLite write lock between batches.
+        """
+        # Last occurrence wins; ON CONFLICT cannot touch a row twice per statement
+        rows = {}
+        for pay in payments:
+            row = self._payment_row(pay)
+            if row is not None:
+                rows[row["holded_id"]] = row
+        rows = list(rows.values())
+
+        stmt = sqlite_insert(BankTransaction)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BankTransaction.holded_id],
+            set_={
+                "treasury_holded_id": stmt.excluded.treasury_holded_id,
+                "date": stmt.excluded.date,
+                "amount": stmt.excluded.amount,
+                "description": stmt.excluded.description,
+                "contact_name": stmt.excluded.contact_name,
+                "year_month": stmt.excluded.year_month,
+            },
+        )
+        for i in range(0, len(rows), SYNC_BATCH_SIZE):
+            chunk = rows[i:i + SYNC_BATCH_SIZE]
+            # Months the chunk moves rows out of, as well as into
+            previous = await self.session.execute(
+                select(BankTransaction.year_month)
+                .where(BankTransaction.holded_id.in_([r["holded_id"] for r in chunk]))
+                .distinct()
+            )
+            months = {r["year_month"] for r in chunk} | set(previous.scalars().all())
+            await self.session.execute(stmt, chunk)
+            await self.refresh_rollup(months)
+            await self.session.commit()
+            invalidate_dashboard_cache()
+        return len(rows)
 
     async def sync_payments(
         self,
@@ -99,73 +234,166 @@ class FinanceService:
         start_timestamp: int | None = None,
         end_timestamp: int | None = None,
     ) -> int:
-        payments = await client.get_payments(start_timestamp, end_timestamp)
+        # Upsert each window as it arrives instead of buffering the full history
         count = 0
-        for pay in payments:
-            holded_id = pay.get("id", "")
-            if not holded_id:
-                continue
-
-            ts = pay.get("date", 0)
-            dt = datetime.utcfromtimestamp(ts) if ts else datetime.utcnow()
-            year_month = dt.strftime("%Y-%m")
-
-            raw_contact = pay.get("contactName") or None
-            desc = pay.get("desc", "")
-            contact = _normalize_contact(raw_contact, desc)
-
-            result = await self.session.execute(
-                select(BankTransaction).where(
-                    BankTransaction.holded_id == holded_id
-                )
-            )
-            existing = result.scalar_one_or_none()
-            if existing:
-                existing.amount = float(pay.get("amount", 0))
-                existing.description = desc
-                existing.contact_name = contact
-                existing.date = dt
-                existing.year_month = year_month
-                existing.treasury_holded_id = pay.get("bankId")
-            else:
-                self.session.add(
-                    BankTransaction(
-                        holded_id=holded_id,
-                        treasury_holded_id=pay.get("bankId"),
-                        date=dt,
-                        amount=float(pay.get("amount", 0)),
-                        description=desc,
-                        contact_name=contact,
-                        year_month=year_month,
-                    )
-                )
-            count += 1
-        await self.session.commit()
+        async for batch in client.iter_payments(start_timestamp, end_timestamp):
+            count += await self._upsert_payments(batch)
         return count
 
     async def apply_category_rules(self):
         """Apply existing category rules to all transactions."""
-        rules = await self.session.execute(select(ExpenseCategoryRule))
-        for rule in rules.scalars().all():
-            await self.session.execute(
-                update(BankTransaction)
-                .where(BankTransaction.contact_name == rule.contact_name)
-                .values(category=rule.category)
-            )
+        await self._apply_rules()
         await self.session.commit()
+        invalidate_dashboard_cache()
+
+    async def _apply_rules(self, contact_names: list[str] | None = None) -> None:
+        """Set each transaction's category from its contact's rule in one UPDATE.
+
+        Only rows whose category actually changes are written, and only
+        their months are re-rolled up. Restricted to ``contact_names`` when
+        given. Does not commit.
+        """
+        rule_category = (
+            select(ExpenseCategoryRule.category)
+            .where(ExpenseCategoryRule.contact_name == BankTransaction.contact_name)
+            .scalar_subquery()
+        )
+        stale = [
+            exists().where(
+                ExpenseCategoryRule.contact_name == BankTransaction.contact_name,
+                or_(
+                    BankTransaction.category.is_(None),
+                    BankTransaction.category != ExpenseCategoryRule.category,
+                ),
+            )
+        ]
+        if contact_names is not None:
+            stale.append(BankTransaction.contact_name.in_(contact_names))
+
+        months = await self.session.execute(
+            select(BankTransaction.year_month).where(*stale).distinct()
+        )
+        months = set(months.scalars().all())
+        if not months:
+            return
+        await self.session.execute(
+            update(BankTransaction)
+            .where(*stale)
+            .values(category=rule_category)
+            .execution_options(synchronize_session=False)
+        )
+        await self.refresh_rollup(months)
+
+    # ── Monthly rollup ──────────────────────────────────────────
+
+    async def refresh_rollup(self, year_months: set[str] | None = None) -> None:
+        """Recompute finance_monthly_rollup for ``year_months`` (all months if None).
+
+        Does not commit; callers commit together with the change that
+        triggered the refresh and only then call invalidate_dashboard_cache(),
+        so a concurrent dashboard read cannot cache the pre-commit state.
+        """
+        if year_months is not None and not year_months:
+            return
+        bucket = func.coalesce(
+            BankTransaction.category, BankTransaction.contact_name, "Other"
+        )
+        direction = case((BankTransaction.amount < 0, "out"), else_="in")
+        source = (
+            select(
+                BankTransaction.year_month,
+                bucket,
+                direction,
+                func.sum(func.abs(BankTransaction.amount)),
+                func.count(BankTransaction.id),
+                literal(datetime.utcnow()),
+            )
+            .where(BankTransaction.amount != 0)
+            .group_by(BankTransaction.year_month, bucket, direction)
+        )
+        clear = delete(FinanceMonthlyRollup)
+        if year_months is not None:
+            source = source.where(BankTransaction.year_month.in_(year_months))
+            clear = clear.where(FinanceMonthlyRollup.year_month.in_(year_months))
 
-    async def full_sync(self, history_months: int = 36) -> tuple[int, int]:
+        await self.session.execute(clear)
+        await self.session.execute(
+            insert(FinanceMonthlyRollup).from_select(
+                ["year_month", "category", "direction", "total", "transaction_count", "updated_at"],
+                source,
+            )
+        )
+
+    async def _ensure_rollup(self) -> None:
+        """Build the rollup once for databases synced before it existed."""
+        global _rollup_checked
+        if _rollup_checked:
+            return
+        has_rollup = await self.session.scalar(select(exists().select_from(FinanceMonthlyRollup)))
+        has_transactions = await self.session.scalar(select(exists().select_from(BankTransaction)))
+        if has_transactions and not has_rollup:
+            logger.info("Building finance monthly rollup from existing transactions")
+            await self.refresh_rollup()
+            await self.session.commit()
+            invalidate_dashboard_cache()
+        _rollup_checked = True
+
+    async def _sync_window_start(self, history_months: int, force_full: bool) -> tuple[int, bool]:
+        """Start timestamp for the payments request and whether it is a full resync.
+
+        Incremental syncs resume from the high-water mark minus an overlap so
+        payments edited in Holded after they were first synced are picked up.
+        """
+        full_start = int((datetime.utcnow() - timedelta(days=history_months * 31)).timestamp())
+        if force_full:
+            return full_start, True
+        raw = await SettingsService(self.session).get(PAYMENTS_HIGH_WATER_KEY)
+        try:
+            high_water = int(raw) if raw else None
+        except ValueError:
+            high_water = None
+        if high_water is None:
+            return full_start, True
+        return max(high_water - SYNC_OVERLAP_DAYS * 86400, full_start), False
+
+    async def _advance_high_water(self, end_ts: int) -> None:
+        """Record the newest synced payment date (capped at the sync window end)."""
+        latest = await self.session.scalar(select(func.max(BankTransaction.date)))
+        if latest is None:
+            return
+        mark = min(int(latest.replace(tzinfo=timezone.utc).timestamp()), end_ts)
+        await SettingsService(self.session).set(PAYMENTS_HIGH_WATER_KEY, str(mark))
+
+    async def full_sync(
+        self, history_months: int = 36, force_full: bool = False
+    ) -> tuple[int, int]:
+        """Sync accounts and payments, then categorize.
+
+        Payments are fetched incrementally from the stored high-water mark
+        unless ``force_full`` is set or no sync has completed yet, in which
+        case the last ``history_months`` are requested.
+        """
         _set_sync_status("syncing", "Connecting to Holded...", 10)
         client = await HoldedClient.from_session(self.session)
 
         _set_sync_status("syncing", "Syncing bank accounts...", 20)
         accounts = await self.sync_treasury(client)
 
-        _set_sync_status("syncing", "Syncing transactions...", 40)
-        start_dt = datetime.utcnow() - timedelta(days=history_months * 31)
-        start_ts = int(start_dt.timestamp())
+        start_ts, is_full = await self._sync_window_start(history_months, force_full)
         end_ts = int(datetime.utcnow().timestamp())
+        _set_sync_status(
+            "syncing",
+            "Syncing all transactions..." if is_full else "Syncing new transactions...",
+            40,
+        )
         transactions = await self.sync_payments(client, start_ts, end_ts)
+        await self._advance_high_water(end_ts)
+        logger.info(
+            "%s Holded sync: %d transactions since %s",
+            "Full" if is_full else "Incremental",
+            transactions,
+            datetime.utcfromtimestamp(start_ts).date(),
+        )
 
         _set_sync_status("syncing", "Applying categories...", 70)
         await self.apply_category_rules()
@@ -176,6 +404,7 @@ class FinanceService:
         _set_sync_status("syncing", "Finalizing...", 95)
         svc = SettingsService(self.session)
         await svc.set("holded_last_sync", datetime.utcnow().isoformat())
+        invalidate_dashboard_cache()
 
         _set_sync_status("done", "Sync complete", 100)
         return accounts, transactions
@@ -192,28 +421,79 @@ class FinanceService:
         )
         return [r[0] for r in result.all() if r[0]]
 
+    async def _expense_contacts(self) -> set[str]:
+        """Contacts the company pays more than it receives from."""
+        result = await self.session.execute(
+            select(BankTransaction.contact_name)
+            .where(BankTransaction.contact_name.isnot(None))
+            .group_by(BankTransaction.contact_name)
+            .having(func.sum(BankTransaction.amount) < 0)
+        )
+        return set(result.scalars().all())
+
     async def auto_classify_contacts(self):
-        """Use OpenAI to classify uncategorized contacts into startup categories."""
+        """Classify uncategorized contacts into startup categories.
+
+        Contacts are resolved locally first (prior rules, fuzzy name match,
+        keyword heuristics); only the remainder is sent to OpenAI, in batches.
+        """
         contacts = await self.get_uncategorized_contacts()
         if not contacts:
             return
 
-        try:
-            from app.intelligence.openai_client import structured_completion
-            from pydantic import BaseModel
+        existing = {r.contact_name: r.category for r in await self.get_category_rules()}
+        decided, unknown = classify_locally(contacts, existing, await self._expense_contacts())
+        logger.info(
+            "Classified %d of %d contacts locally, %d left for the LLM",
+            len(decided), len(contacts), len(unknown),
+        )
+
+        for i in range(0, len(unknown), CLASSIFY_BATCH_SIZE):
+            batch = unknown[i:i + CLASSIFY_BATCH_SIZE]
+            try:
+                decided.update(await self._classify_with_llm(batch))
+            except Exception as e:
+                logger.warning("Auto-classify failed (OpenAI may not be configured): %s", e)
+                break
+
+        # Local matches may reuse a custom category from an existing rule;
+        # only LLM output is restricted to the standard list
+        allowed = set(STARTUP_CATEGORIES) | set(existing.values())
+        now = datetime.utcnow()
+        rules = [
+            {
+                "id": str(uuid.uuid4()),
+                "contact_name": contact,
+                "category": category,
+                "is_auto": True,
+                "created_at": now,
+            }
+            for contact, category in decided.items()
+            if category in allowed and contact not in existing
+        ]
+        if rules:
+            await self._upsert_rules(rules)
+        if decided:
+            await self._apply_rules(list(decided))
+        await self.session.commit()
+        invalidate_dashboard_cache()
+
+    async def _classify_with_llm(self, contacts: list[str]) -> dict[str, str]:
+        from app.intelligence.openai_client import structured_completion
+        from pydantic import BaseModel
 
-            class CategoryAssignment(BaseModel):
-                contact_name: str
-                category: str
+        class CategoryAssignment(BaseModel):
+            contact_name: str
+            category: str
 
-            class ClassificationResult(BaseModel):
-                assignments: list[CategoryAssignment]
+        class ClassificationResult(BaseModel):
+            assignments: list[CategoryAssignment]
 
-            categories_str = ", ".join(STARTUP_CATEGORIES)
-            contacts_str = "\n".join(f"- {c}" for c in contacts)
+        categories_str = ", ".join(STARTUP_CATEGORIES)
+        contacts_str = "\n".join(f"- {c}" for c in contacts)
 
-            result = await structured_completion(
-                system_prompt=f"""You are a financial categorizer for a startup. Classify each vendor/contact into exactly one category.
+        result = await structured_completion(
+            system_prompt=f"""You are a financial categorizer for a startup. Classify each vendor/contact into exactly one category.
 
 Available categories: {categories_str}
 
@@ -230,39 +510,27 @@ Rules:
 - Travel & Events: flights, hotels, conference tickets
 - Banking & Fees: bank charges, transfer fees
 - Other: anything that doesn't fit above""",
-                user_prompt=f"Classify these vendors/contacts:\n{contacts_str}",
-                response_model=ClassificationResult,
-            )
+            user_prompt=f"Classify these vendors/contacts:\n{contacts_str}",
+            response_model=ClassificationResult,
+            pipeline="vendor_classification",
+        )
+        requested = set(contacts)
+        return {
+            a.contact_name: a.category
+            for a in result.assignments
+            if a.contact_name in requested
+        }
 
-            for assignment in result.assignments:
-                if assignment.category in STARTUP_CATEGORIES:
-                    # Upsert rule
-                    existing = await self.session.execute(
-                        select(ExpenseCategoryRule).where(
-                            ExpenseCategoryRule.contact_name == assignment.contact_name
-                        )
-                    )
-                    rule = existing.scalar_one_or_none()
-                    if rule:
-                        rule.category = assignment.category
-                        rule.is_auto = True
-                    else:
-                        self.session.add(
-                            ExpenseCategoryRule(
-                                contact_name=assignment.contact_name,
-                                category=assignment.category,
-                                is_auto=True,
-                            )
-                        )
-                    # Apply to transactions
-                    await self.session.execute(
-                        update(BankTransaction)
-                        .where(BankTransaction.contact_name == assignment.contact_name)
-                        .values(category=assignment.category)
-                    )
-            await self.session.commit()
-        except Exception as e:
-            logger.warning("Auto-classify failed (OpenAI may not be configured): %s", e)
+    async def _upsert_rules(self, rows: list[dict]) -> None:
+        """Insert-or-update category rules by contact name in one statement."""
+        stmt = sqlite_insert(ExpenseCategoryRule)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ExpenseCategoryRule.contact_name],
+                set_={"category": stmt.excluded.category, "is_auto": stmt.excluded.is_auto},
+            ),
+            rows,
+        )
 
     async def get_category_rules(self) -> list[ExpenseCategoryRule]:
         result = await self.session.execute(
@@ -289,12 +557,10 @@ Rules:
             self.session.add(rule)
 
         # Apply to transactions
-        await self.session.execute(
-            update(BankTransaction)
-            .where(BankTransaction.contact_name == contact_name)
-            .values(category=category)
-        )
+        await self.session.flush()
+        await self._apply_rules([contact_name])
         await self.session.commit()
+        invalidate_dashboard_cache()
         return rule
 
     async def delete_category_rule(self, rule_id: str):
@@ -302,9 +568,73 @@ Rules:
             delete(ExpenseCategoryRule).where(ExpenseCategoryRule.id == rule_id)
         )
         await self.session.commit()
+        invalidate_dashboard_cache()
 
     # ── Queries ─────────────────────────────────────────────────
 
+    async def get_dashboard(self) -> FinanceDashboard:
+        """Everything the finance dashboard shows, built from one rollup scan.
+
+        The result is cached in memory until the next sync, category rule,
+        planned-expense or forecast change (or until the month rolls over).
+        """
+        global _dashboard_cache
+        now_ym = datetime.utcnow().strftime("%Y-%m")
+        if _dashboard_cache is not None and _dashboard_cache[0] == now_ym:
+            return _dashboard_cache[1]
+
+        rows = await self._rollup_rows()
+        accounts = await self.get_treasury_accounts()
+        stored = await SettingsService(self.session).get_many(
+            ["holded_last_sync", "finance_forecast"]
+        )
+
+        cash = float(sum(a.balance for a in accounts))
+        monthly = _summarize_months(rows)
+        burn_rates = await self.get_burn_rates(monthly)
+        forecast_settings = _parse_forecast(stored.get("finance_forecast"))
+
+        runway = await self.get_runway_from_burn(cash, burn_rates["six_month"])
+        runway_scenarios = self.compute_runway_scenarios(cash, burn_rates, monthly, forecast_settings)
+
+        complete = [m for m in monthly if m["year_month"] < now_ym]
+        last = complete[-1] if complete else {"expenses": 0.0, "income": 0.0, "net": 0.0}
+
+        # Exclude current partial month from chart; forecast starts from last complete month
+        forecast_months = self.build_forecast_months(cash, forecast_settings, complete, count=36)
+        all_months = [{**m, "is_forecast": False} for m in complete] + forecast_months
+
+        dashboard = FinanceDashboard(
+            kpis=FinanceKPIs(
+                cash_position=cash,
+                monthly_burn=last["expenses"],
+                monthly_income=last["income"],
+                runway_months=runway,
+                runway_scenarios=RunwayScenarios(**runway_scenarios),
+                net_last_month=last["net"],
+                burn_rates=BurnRates(**burn_rates),
+            ),
+            monthly_summary=all_months,
+            expense_breakdown=_top_categories(rows, "out", 6),
+            income_sources=_top_categories(rows, "in", 6),
+            treasury_accounts=[
+                {
+                    "id": a.id,
+                    "holded_id": a.holded_id,
+                    "name": a.name,
+                    "account_type": a.account_type,
+                    "balance": a.balance,
+                    "iban": a.iban,
+                    "currency": a.currency,
+                }
+                for a in accounts
+            ],
+            last_synced=stored.get("holded_last_sync"),
+            forecast=ForecastSettings(**forecast_settings),
+        )
+        _dashboard_cache = (now_ym, dashboard)
+        return dashboard
+
     async def get_cash_position(self) -> float:
         result = await self.session.execute(
             select(func.coalesce(func.sum(TreasuryAccount.balance), 0.0))
@@ -317,36 +647,13 @@ Rules:
         )
         return list(result.scalars().all())
 
+    async def _rollup_rows(self) -> list[FinanceMonthlyRollup]:
+        await self._ensure_rollup()
+        result = await self.session.execute(select(FinanceMonthlyRollup))
+        return list(result.scalars().all())
+
     async def get_monthly_summary(self) -> list[dict]:
-        result = await self.session.execute(
-            select(
-                BankTransaction.year_month,
-                func.sum(
-                    case(
-                        (BankTransaction.amount > 0, BankTransaction.amount),
-                        else_=0.0,
-                    )
-                ).label("income"),
-                func.sum(
-                    case(
-                        (BankTransaction.amount < 0, func.abs(BankTransaction.amount)),
-                        else_=0.0,
-                    )
-                ).label("expenses"),
-                func.sum(BankTransaction.amount).label("net"),
-            )
-            .group_by(BankTransaction.year_month)
-            .order_by(BankTransaction.year_month)
-        )
-        return [
-            {
-                "year_month": row.year_month,
-                "income": round(float(row.income), 2),
-                "expenses": round(float(row.expenses), 2),
-                "net": round(float(row.net), 2),
-            }
-            for row in result.all()
-        ]
+        return _summarize_months(await self._rollup_rows())
 
     async def get_burn_rates(self, monthly: list[dict]) -> dict:
         now_ym = datetime.utcnow().strftime("%Y-%m")
@@ -413,79 +720,11 @@ Rules:
 
     async def get_expense_breakdown(self, months: int = 6) -> list[dict]:
         """Group expenses by category (falls back to contact_name). Excludes current partial month."""
-        now_ym = datetime.utcnow().strftime("%Y-%m")
-        cutoff = (datetime.utcnow() - timedelta(days=months * 31)).strftime("%Y-%m")
-        result = await self.session.execute(
-            select(
-                func.coalesce(
-                    BankTransaction.category,
-                    BankTransaction.contact_name,
-                    "Other",
-                ).label("category"),
-                func.sum(func.abs(BankTransaction.amount)).label("total"),
-                func.count(BankTransaction.id).label("transaction_count"),
-            )
-            .where(
-                BankTransaction.amount < 0,
-                BankTransaction.year_month >= cutoff,
-                BankTransaction.year_month < now_ym,
-            )
-            .group_by(
-                func.coalesce(
-                    BankTransaction.category,
-                    BankTransaction.contact_name,
-                    "Other",
-                )
-            )
-            .order_by(func.sum(func.abs(BankTransaction.amount)).desc())
-            .limit(15)
-        )
-        return [
-            {
-                "category": row.category or "Other",
-                "total": round(float(row.total), 2),
-                "transaction_count": int(row.transaction_count),
-            }
-            for row in result.all()
-        ]
+        return _top_categories(await self._rollup_rows(), "out", months)
 
     async def get_income_sources(self, months: int = 6) -> list[dict]:
         """Group income by category. Excludes current partial month."""
-        now_ym = datetime.utcnow().strftime("%Y-%m")
-        cutoff = (datetime.utcnow() - timedelta(days=months * 31)).strftime("%Y-%m")
-        result = await self.session.execute(
-            select(
-                func.coalesce(
-                    BankTransaction.category,
-                    BankTransaction.contact_name,
-                    "Other",
-                ).label("category"),
-                func.sum(BankTransaction.amount).label("total"),
-                func.count(BankTransaction.id).label("transaction_count"),
-            )
-            .where(
-                BankTransaction.amount > 0,
-                BankTransaction.year_month >= cutoff,
-                BankTransaction.year_month < now_ym,
-            )
-            .group_by(
-                func.coalesce(
-                    BankTransaction.category,
-                    BankTransaction.contact_name,
-                    "Other",
-                )
-            )
-            .order_by(func.sum(BankTransaction.amount).desc())
-            .limit(15)
-        )
-        return [
-            {
-                "category": row.category or "Other",
-                "total": round(float(row.total), 2),
-                "transaction_count": int(row.transaction_count),
-            }
-            for row in result.all()
-        ]
+        return _top_categories(await self._rollup_rows(), "in", months)
 
     # ── Planned Expenses ────────────────────────────────────────
 
@@ -499,6 +738,7 @@ Rules:
         pe = PlannedExpense(**kwargs)
         self.session.add(pe)
         await self.session.commit()
+        invalidate_dashboard_cache()
         await self.session.refresh(pe)
         return pe
 
@@ -513,6 +753,7 @@ Rules:
             if v is not None:
                 setattr(pe, k, v)
         await self.session.commit()
+        invalidate_dashboard_cache()
         await self.session.refresh(pe)
         return pe
 
@@ -521,23 +762,19 @@ Rules:
             delete(PlannedExpense).where(PlannedExpense.id == pe_id)
         )
         await self.session.commit()
+        invalidate_dashboard_cache()
 
     # ── Forecast ────────────────────────────────────────────────
 
     async def get_forecast_settings(self) -> dict:
         svc = SettingsService(self.session)
-        raw = await svc.get("finance_forecast")
-        if raw:
-            try:
-                return json.loads(raw)
-            except (json.JSONDecodeError, TypeError):
-                pass
-        return {"monthly_burn": 0.0, "monthly_income": 0.0}
+        return _parse_forecast(await svc.get("finance_forecast"))
 
     async def set_forecast_settings(self, monthly_burn: float, monthly_income: float) -> dict:
         settings = {"monthly_burn": monthly_burn, "monthly_income": monthly_income}
         svc = SettingsService(self.session)
         await svc.set("finance_forecast", json.dumps(settings))
+        invalidate_dashboard_cache()
         return settings
 
     def build_forecast_months(
@@ -1,11 +1,43 @@
+import asyncio
+import logging
 import os
+from collections.abc import AsyncIterator
 
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.settings_service import SettingsService
 
+logger = logging.getLogger(__name__)
+
 HOLDED_BASE_URL = "https://api.holded.com"
+PAYMENTS_WINDOW_DAYS = 90  # payments are requested in windows of this size
+MAX_RETRIES = 4
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 60.0  # cap on any single wait, including server Retry-After
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Process-wide pooled client shared by every HoldedClient."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            base_url=HOLDED_BASE_URL,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+        )
+    return _http_client
+
+
+async def close_holded_client() -> None:
+    """Close the shared HTTP pool (on application shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
 class HoldedClient:
@@ -23,34 +55,71 @@ class HoldedClient:
             raise ValueError("Holded API key not configured")
         return cls(api_key)
 
+    async def _get(self, path: str, params: dict[str, str] | None = None):
+        """GET with bounded exponential backoff on 429/5xx and network errors."""
+        client = _get_http_client()
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                resp = await client.get(path, headers=self.headers, params=params)
+            except httpx.TransportError as exc:
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = min(RETRY_BASE_SECONDS * 2 ** attempt, RETRY_MAX_SECONDS)
+                logger.warning("Holded %s failed (%s), retrying in %.0fs", path, exc, delay)
+            else:
+                if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    resp.raise_for_status()
+                    return resp.json()
+                retry_after = resp.headers.get("retry-after", "")
+                delay = min(
+                    float(retry_after) if retry_after.isdigit()
+                    else RETRY_BASE_SECONDS * 2 ** attempt,
+                    RETRY_MAX_SECONDS,
+                )
+                logger.warning(
+                    "Holded %s returned %d, retrying in %.0fs", path, resp.status_code, delay
+                )
+            await asyncio.sleep(delay)
+
     async def get_treasury_accounts(self) -> list[dict]:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{HOLDED_BASE_URL}/api/invoicing/v1/treasury",
-                headers=self.headers,
-                timeout=30.0,
+        return await self._get("/api/invoicing/v1/treasury")
+
+    async def iter_payments(
+        self, start_timestamp: int | None = None, end_timestamp: int | None = None
+    ) -> AsyncIterator[list[dict]]:
+        """Yield payments one time window at a time, oldest window first.
+
+        Only one window's response is held in memory at once, and each
+        request stays small enough to finish well within the timeout.
+        """
+        if start_timestamp is None or end_timestamp is None:
+            params: dict[str, str] = {}
+            if start_timestamp is not None:
+                params["starttmp"] = str(start_timestamp)
+            if end_timestamp is not None:
+                params["endtmp"] = str(end_timestamp)
+            yield await self._get("/api/invoicing/v1/payments", params)
+            return
+
+        window = PAYMENTS_WINDOW_DAYS * 86400
+        window_start = start_timestamp
+        while window_start <= end_timestamp:
+            window_end = min(window_start + window - 1, end_timestamp)
+            batch = await self._get(
+                "/api/invoicing/v1/payments",
+                {"starttmp": str(window_start), "endtmp": str(window_end)},
             )
-            resp.raise_for_status()
-            return resp.json()
+            if batch:
+                yield batch
+            window_start = window_end + 1
 
     async def get_payments(
         self, start_timestamp: int | None = None, end_timestamp: int | None = None
     ) -> list[dict]:
-        params: dict[str, str] = {}
-        if start_timestamp is not None:
-            params["starttmp"] = str(start_timestamp)
-        if end_timestamp is not None:
-            params["endtmp"] = str(end_timestamp)
-
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{HOLDED_BASE_URL}/api/invoicing/v1/payments",
-                headers=self.headers,
-                params=params,
-                timeout=30.0,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        payments: list[dict] = []
+        async for batch in self.iter_payments(start_timestamp, end_timestamp):
+            payments.extend(batch)
+        return payments
 
     async def test_connection(self) -> bool:
         try:
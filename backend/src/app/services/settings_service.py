@@ -21,6 +21,19 @@ class SettingsService:
             return decrypt_value(setting.value)
         return setting.value
 
+    async def get_many(self, keys: list[str]) -> dict[str, str | None]:
+        """Get several settings in one query; missing keys are omitted."""
+        result = await self.session.execute(
+            select(AppSetting).where(AppSetting.key.in_(keys))
+        )
+        values = {}
+        for setting in result.scalars().all():
+            if setting.is_secret and setting.value:
+                values[setting.key] = decrypt_value(setting.value)
+            else:
+                values[setting.key] = setting.value
+        return values
+
     async def set(self, key: str, value: str, is_secret: bool = False) -> None:
         """Set a setting value, encrypting if it's a secret."""
         result = await self.session.execute(
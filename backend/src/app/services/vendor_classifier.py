@@ -0,0 +1,107 @@
+"""Local vendor → expense category classification.
+
+Runs before the LLM in ``FinanceService.auto_classify_contacts``:
+
+1. exact or normalized-name match against existing category rules
+   (every prior decision, manual or automatic, is a rule),
+2. fuzzy match of the normalized name against those rules,
+3. keyword heuristics for common vendors and Spanish banking descriptions,
+   for contacts the company pays (income counterparties are never guessed).
+
+Only contacts none of these recognise are left for the LLM.
+"""
+import difflib
+import re
+import unicodedata
+
+FUZZY_CUTOFF = 0.88
+
+# Legal-form suffixes that vary between bank descriptions of the same vendor
+_LEGAL_SUFFIXES = re.compile(
+    r"\b(s\s?l\s?u?|s\s?a\s?u?|s\s?c|sll|gmbh|inc|ltd|llc|plc|bv|sas|sarl|corp|co)\b"
+)
+
+# Checked in order, most specific first (vendor names, then institutional
+# phrases, then generic Spanish banking terms); the first match wins. Bare
+# words that also name places or income ("tax", "legal", "booking", "zurich")
+# are left out and fall through to the LLM.
+KEYWORD_CATEGORIES: list[tuple[str, tuple[str, ...]]] = [
+    ("Infrastructure & Cloud", (
+        "amazon web services", "aws", "google cloud", "gcp", "azure", "hetzner",
+        "digitalocean", "ovh", "cloudflare", "vercel", "heroku",
+    )),
+    ("SaaS & Tools", (
+        "slack", "notion", "github", "atlassian", "jira", "figma", "google workspace",
+        "gsuite", "microsoft", "zoom", "openai", "anthropic", "1password", "dropbox",
+    )),
+    ("Marketing & Sales", (
+        "google ads", "linkedin", "facebook", "meta platforms", "hubspot", "mailchimp",
+        "semrush",
+    )),
+    ("Office & Coworking", ("wework", "regus", "coworking", "alquiler oficina")),
+    ("Travel & Events", (
+        "renfe", "iberia", "vueling", "ryanair", "booking com", "airbnb", "cabify", "uber",
+    )),
+    ("Insurance", (
+        "mapfre", "allianz", "axa seguros", "zurich seguros", "zurich insurance",
+        "seguro", "seguros",
+    )),
+    ("Taxes & Government", (
+        "agencia tributaria", "aeat", "hacienda", "seguridad social", "tgss",
+        "ayuntamiento", "impuesto",
+    )),
+    ("Legal & Compliance", ("registro mercantil", "notaria", "notario", "abogado", "abogados")),
+    ("Payroll", ("nomina", "payroll", "salario", "salary")),
+    ("Banking & Fees", ("bank fee", "stripe fee", "comision", "intereses")),
+    ("Consulting", ("consultoria", "asesoria", "gestoria")),
+]
+
+
+def normalize_vendor(name: str) -> str:
+    """Lowercase, strip accents, punctuation and legal-form suffixes."""
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    text = re.sub(r"[^a-z0-9 ]+", " ", text.lower())
+    text = _LEGAL_SUFFIXES.sub(" ", text)
+    return " ".join(text.split())
+
+
+def _keyword_category(normalized: str) -> str | None:
+    padded = f" {normalized} "
+    for category, keywords in KEYWORD_CATEGORIES:
+        if any(f" {kw} " in padded for kw in keywords):
+            return category
+    return None
+
+
+def classify_locally(
+    contacts: list[str], rules: dict[str, str], expense_contacts: set[str]
+) -> tuple[dict[str, str], list[str]]:
+    """Split ``contacts`` into local decisions and names left for the LLM.
+
+    ``rules`` maps existing rule contact names to their category; keyword
+    guessing only applies to names in ``expense_contacts``.
+    """
+    known: dict[str, str] = {}
+    for contact_name, category in rules.items():
+        known.setdefault(normalize_vendor(contact_name), category)
+    known_names = list(known)
+
+    decided: dict[str, str] = {}
+    unknown: list[str] = []
+    for contact in contacts:
+        if contact in rules:
+            decided[contact] = rules[contact]
+            continue
+        normalized = normalize_vendor(contact)
+        category = known.get(normalized)
+        if category is None and normalized:
+            close = difflib.get_close_matches(normalized, known_names, n=1, cutoff=FUZZY_CUTOFF)
+            if close:
+                category = known[close[0]]
+        if category is None and contact in expense_contacts:
+            category = _keyword_category(normalized)
+        if category is None:
+            unknown.append(contact)
+        else:
+            decided[contact] = category
+    return decided, unknown
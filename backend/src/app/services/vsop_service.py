@@ -15,50 +15,41 @@ from app.schemas.vsop import (
     VsopPoolCreate,
     VsopPoolRead,
     VsopPoolUpdate,
+    VsopSchedule,
     VsopSummary,
+    VestingSchedulePoint,
 )
 
 
-def _compute_vesting(grant: VsopGrant) -> dict:
-    """Compute vested/unvested shares based on grant date and today."""
-    if not grant.grant_date or grant.status == "terminated":
-        return {
-            "vested_shares": 0,
-            "unvested_shares": grant.shares_granted if grant.status != "terminated" else 0,
-            "vesting_pct": 0.0,
-            "cliff_met": False,
-        }
+def _month_index(dt: datetime) -> int:
+    """Months since year 0; vesting counts whole calendar months."""
+    return dt.year * 12 + dt.month - 1
 
-    if grant.status == "fully_vested":
-        return {
-            "vested_shares": grant.shares_granted,
-            "unvested_shares": 0,
-            "vesting_pct": 100.0,
-            "cliff_met": True,
-        }
 
-    now = datetime.now(timezone.utc)
-    grant_date = grant.grant_date
-    if grant_date.tzinfo is None:
-        grant_date = grant_date.replace(tzinfo=timezone.utc)
+def _current_month() -> int:
+    return _month_index(datetime.now(timezone.utc))
 
-    # Months elapsed since grant
-    months_elapsed = (
-        (now.year - grant_date.year) * 12 + (now.month - grant_date.month)
-    )
 
-    # Check cliff
-    cliff_met = months_elapsed >= grant.cliff_months
-    if not cliff_met:
+def _vested_shares(shares: int, elapsed: int, cliff_months: int, vesting_months: int) -> int:
+    """Shares vested ``elapsed`` months after the grant date."""
+    if elapsed < cliff_months:
+        return 0
+    if elapsed >= vesting_months:
+        return shares
+    return int(shares * elapsed / vesting_months)
+
+
+def _compute_vesting(grant: VsopGrant, month: int | None = None) -> dict:
+    """Compute vested/unvested shares as of ``month`` (a month index; default now)."""
+    if not grant.grant_date or grant.status == "terminated":
         return {
             "vested_shares": 0,
-            "unvested_shares": grant.shares_granted,
+            "unvested_shares": grant.shares_granted if grant.status != "terminated" else 0,
             "vesting_pct": 0.0,
             "cliff_met": False,
         }
 
-    # Linear vesting after cliff
-    if months_elapsed >= grant.vesting_months:
+    if grant.status == "fully_vested":
         return {
             "vested_shares": grant.shares_granted,
             "unvested_shares": 0,
@@ -66,20 +57,59 @@ def _compute_vesting(grant: VsopGrant) -> dict:
             "cliff_met": True,
         }
 
-    vested = int(grant.shares_granted * months_elapsed / grant.vesting_months)
-    unvested = grant.shares_granted - vested
+    if month is None:
+        month = _current_month()
+    elapsed = month - _month_index(grant.grant_date)
+    vested = _vested_shares(
+        grant.shares_granted, elapsed, grant.cliff_months, grant.vesting_months
+    )
     pct = round(vested / grant.shares_granted * 100, 1) if grant.shares_granted > 0 else 0
 
     return {
         "vested_shares": vested,
-        "unvested_shares": unvested,
+        "unvested_shares": grant.shares_granted - vested,
         "vesting_pct": pct,
-        "cliff_met": True,
+        "cliff_met": elapsed >= grant.cliff_months,
     }
 
 
-def _grant_to_read(grant: VsopGrant) -> VsopGrantRead:
-    vesting = _compute_vesting(grant)
+def vesting_curve(grants: list[VsopGrant], start_month: int, months: int) -> list[int]:
+    """Total vested shares of ``grants`` at each month from ``start_month``.
+
+    Fully vested grants and the flat tail after each grant's vesting end go
+    through a difference array; only the months a grant is actually vesting
+    are computed individually, so the cost is the grants' vesting months
+    inside the window rather than every grant at every month.
+    """
+    curve = [0] * months
+    fully_vested_from = [0] * (months + 1)
+    for grant in grants:
+        if grant.status == "terminated":
+            continue
+        if grant.status == "fully_vested" and grant.grant_date:
+            fully_vested_from[0] += grant.shares_granted
+            continue
+        if not grant.grant_date:
+            continue
+        shares = grant.shares_granted
+        offset = start_month - _month_index(grant.grant_date)  # elapsed at curve[0]
+        vest_start = max(grant.cliff_months - offset, 0)
+        vest_end = min(max(grant.vesting_months, grant.cliff_months) - offset, months)
+        for i in range(vest_start, vest_end):
+            curve[i] += _vested_shares(
+                shares, offset + i, grant.cliff_months, grant.vesting_months
+            )
+        fully_vested_from[max(vest_end, 0)] += shares
+
+    running = 0
+    for i in range(months):
+        running += fully_vested_from[i]
+        curve[i] += running
+    return curve
+
+
+def _grant_to_read(grant: VsopGrant, month: int | None = None) -> VsopGrantRead:
+    vesting = _compute_vesting(grant, month)
     return VsopGrantRead(
         id=grant.id,
         stakeholder_id=grant.stakeholder_id,
@@ -210,7 +240,9 @@ class VsopService:
 
     # ── Summary ──────────────────────────────────────────────
 
-    async def get_summary(self, company_id: str) -> VsopSummary:
+    async def get_summary(
+        self, company_id: str, as_of: datetime | None = None
+    ) -> VsopSummary:
         pool = await self.get_pool(company_id)
         if not pool:
             return VsopSummary(
@@ -225,7 +257,8 @@ class VsopService:
             )
 
         raw_grants = await self._list_grants(pool.id)
-        grants = [_grant_to_read(g) for g in raw_grants]
+        month = _month_index(as_of) if as_of else _current_month()
+        grants = [_grant_to_read(g, month) for g in raw_grants]
 
         active_grants = [g for g in grants if g.status != "terminated"]
         total_granted = sum(g.shares_granted for g in active_grants)
@@ -252,3 +285,35 @@ class VsopService:
             pool_utilization_pct=pool_util,
             overall_vesting_pct=overall_vest,
         )
+
+    async def get_schedule(self, company_id: str, years: int = 4) -> VsopSchedule:
+        """Month-by-month vesting of the pool's active grants from this month on."""
+        pool = await self.get_pool(company_id)
+        if not pool:
+            return VsopSchedule(pool_total_shares=0, total_granted=0, points=[])
+
+        grants = [
+            g for g in await self._list_grants(pool.id) if g.status != "terminated"
+        ]
+        total_granted = sum(g.shares_granted for g in grants)
+        start = _current_month()
+        curve = vesting_curve(grants, start, years * 12)
+
+        points = []
+        for i, vested in enumerate(curve):
+            year, month = divmod(start + i, 12)
+            points.append(
+                VestingSchedulePoint(
+                    month=f"{year:04d}-{month + 1:02d}",
+                    vested_shares=vested,
+                    unvested_shares=total_granted - vested,
+                    vesting_pct=(
+                        round(vested / total_granted * 100, 1) if total_granted > 0 else 0
+                    ),
+                )
+            )
+        return VsopSchedule(
+            pool_total_shares=pool.total_shares,
+            total_granted=total_granted,
+            points=points,
+        )
@@ -0,0 +1,157 @@
+import pytest
+
+from app.schemas.captable import (
+    CapTableRow,
+    ConvertibleInput,
+    SimulatedRound,
+    StakeholderRead,
+)
+from app.services.captable_simulator import simulate_dilution
+
+
+def _row(sid: str, type_: str, shares: int, total: int) -> CapTableRow:
+    stakeholder = StakeholderRead(
+        id=sid, name=sid, email=None, phone=None, type=type_, entity_name=None,
+        contact_person=None, partner_emails=None, linkedin_url=None, notes=None,
+    )
+    return CapTableRow(
+        stakeholder=stakeholder,
+        shares_by_class={"common": shares},
+        total_shares=shares,
+        ownership_pct=round(shares / total * 100, 2),
+        total_invested=0,
+    )
+
+
+ROWS = [_row("founder", "founder", 800, 1000), _row("angel", "angel", 200, 1000)]
+
+
+def _holder(result, name):
+    return next(h for h in result.holders if h.name == name)
+
+
+@pytest.mark.parametrize(
+    "rounds",
+    [
+        [SimulatedRound(name="Seed", pre_money_min=8e6, raise_min=2e6)],
+        [SimulatedRound(
+            name="Seed", pre_money_min=5e6, pre_money_max=12e6,
+            raise_min=1e6, raise_max=3e6, steps=7, option_pool_pct=10,
+        )],
+        [SimulatedRound(
+            name="Seed", pre_money_min=8e6, raise_min=2e6, option_pool_pct=5,
+            convertibles=[ConvertibleInput(amount=1e6, valuation_cap=4e6, discount_pct=20)],
+        )],
+        [
+            SimulatedRound(
+                name="Seed", pre_money_min=6e6, pre_money_max=10e6, raise_min=2e6,
+                steps=5, option_pool_pct=10,
+            ),
+            SimulatedRound(
+                name="A", pre_money_min=2e7, pre_money_max=4e7, raise_min=5e6,
+                raise_max=1e7, steps=5,
+                convertibles=[ConvertibleInput(name="Note", amount=2e6, discount_pct=15)],
+            ),
+        ],
+    ],
+)
+def test_ownership_sums_to_100_pct(rounds):
+    result = simulate_dilution(ROWS, 1000, rounds, max_scenarios=10_000)
+
+    assert result.scenarios > 0
+    assert result.infeasible_scenarios == 0
+    # Means are linear, so per-holder means add up to the whole company
+    assert sum(h.ownership.mean for h in result.holders) == pytest.approx(100, abs=0.05)
+
+
+@pytest.mark.parametrize(
+    "cap, discount_pct, expected_safe_pct",
+    [
+        # Cap (4M) beats the 20% discount (6.4M): 1M buys 25% of pre-money shares
+        (4e6, 20, 20.0),
+        # Discount (6.4M) beats the cap (10M)
+        (10e6, 20, 12.5),
+        # No cap: 60% discount prices the SAFE at 3.2M
+        (None, 60, 25.0),
+    ],
+)
+def test_safe_conversion_price(cap, discount_pct, expected_safe_pct):
+    rnd = SimulatedRound(
+        name="Seed", pre_money_min=8e6, raise_min=2e6,
+        convertibles=[ConvertibleInput(amount=1e6, valuation_cap=cap, discount_pct=discount_pct)],
+    )
+    result = simulate_dilution(ROWS, 1000, [rnd], max_scenarios=10)
+
+    assert _holder(result, "Seed SAFE").ownership.p50 == pytest.approx(expected_safe_pct)
+    assert _holder(result, "Seed investors").ownership.p50 == pytest.approx(20.0)
+
+
+def test_safe_at_cap_dilutes_existing_holders():
+    rnd = SimulatedRound(
+        name="Seed", pre_money_min=8e6, raise_min=2e6,
+        convertibles=[ConvertibleInput(amount=1e6, valuation_cap=4e6)],
+    )
+    result = simulate_dilution(ROWS, 1000, [rnd], max_scenarios=10)
+
+    # Existing holders keep (1 - 0.25) / 1.25 = 60% of the company
+    assert result.founder_ownership.p50 == pytest.approx(48.0)
+    assert _holder(result, "angel").ownership.p50 == pytest.approx(12.0)
+
+
+def test_pool_top_up_is_share_of_post_money():
+    rnd = SimulatedRound(name="Seed", pre_money_min=8e6, raise_min=2e6, option_pool_pct=10)
+    result = simulate_dilution(ROWS, 1000, [rnd], max_scenarios=10)
+
+    assert _holder(result, "Seed pool top-up").ownership.p50 == pytest.approx(10.0)
+    assert _holder(result, "Seed investors").ownership.p50 == pytest.approx(20.0)
+    assert result.founder_ownership.p50 == pytest.approx(56.0)
+
+
+def test_later_rounds_dilute_earlier_investors():
+    rounds = [
+        SimulatedRound(name="Seed", pre_money_min=8e6, raise_min=2e6),
+        SimulatedRound(name="A", pre_money_min=30e6, raise_min=10e6),
+    ]
+    result = simulate_dilution(ROWS, 1000, rounds, max_scenarios=10)
+
+    assert _holder(result, "Seed investors").ownership.p50 == pytest.approx(15.0)
+    assert _holder(result, "A investors").ownership.p50 == pytest.approx(25.0)
+    assert result.founder_ownership.p50 == pytest.approx(48.0)
+
+
+def test_infeasible_scenarios_are_counted_not_returned():
+    rnd = SimulatedRound(
+        name="Seed", pre_money_min=1e6, raise_min=1e6, raise_max=20e6, steps=3,
+        option_pool_pct=60,
+    )
+    result = simulate_dilution(ROWS, 1000, [rnd], max_scenarios=10)
+
+    # 1 - 0.6 * (1 + g) > 0 only for g < 2/3, i.e. none of the grid's raises
+    assert result.scenarios == 0
+    assert result.infeasible_scenarios == 3
+
+
+@pytest.mark.parametrize(
+    "rnd, message",
+    [
+        (SimulatedRound(name="S", pre_money_min=0, raise_min=1), "pre-money"),
+        (SimulatedRound(name="S", pre_money_min=1, pre_money_max=0.5, raise_min=1), "pre_money_max"),
+        (SimulatedRound(name="S", pre_money_min=1, raise_min=1, option_pool_pct=100), "option_pool_pct"),
+        (
+            SimulatedRound(
+                name="S", pre_money_min=1, raise_min=1,
+                convertibles=[ConvertibleInput(amount=1, discount_pct=100)],
+            ),
+            "discount",
+        ),
+        (
+            SimulatedRound(
+                name="S", pre_money_min=1, pre_money_max=2, raise_min=1, raise_max=2, steps=5,
+            ),
+            "scenarios",
+        ),
+    ],
+)
+def test_invalid_requests_raise(rnd, message):
+    with pytest.raises(ValueError, match=message):
+        simulate_dilution(ROWS, 1000, [rnd], max_scenarios=10)
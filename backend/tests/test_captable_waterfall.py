@@ -0,0 +1,166 @@
+import pytest
+
+from app.schemas.captable import StakeholderRead, WaterfallRequest
+from app.services.captable_waterfall import (
+    ClassTerms,
+    VsopClaim,
+    parse_preference,
+    run_waterfall,
+    waterfall_at,
+)
+
+COMMON = ClassTerms(id="common", seniority=0, shares=900, preference=0.0, participating=False)
+SERIES_A = ClassTerms(id="a", seniority=1, shares=100, preference=10e6, participating=False)
+
+
+def _assert_conserved(exit_value, payouts, price, unallocated, vsop=()):
+    vsop_total = sum(max(price - v.strike, 0.0) * v.shares for v in vsop)
+    assert sum(payouts.values()) + vsop_total + unallocated == pytest.approx(exit_value)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        (None, (0.0, False)),
+        ("", (0.0, False)),
+        ("1x", (1.0, False)),
+        ("1.5x non-participating", (1.5, False)),
+        ("2X Participating", (2.0, True)),
+        ("none", (0.0, False)),
+    ],
+)
+def test_parse_preference(text, expected):
+    assert parse_preference(text) == expected
+
+
+@pytest.mark.parametrize(
+    "exit_value, expected_a, expected_common, converted",
+    [
+        # Below the preference: everything goes to the preferred class
+        (5e6, 5e6, 0.0, set()),
+        # Preference (10M) beats 10% as-converted (2M)
+        (20e6, 10e6, 10e6, set()),
+        # 10% as-converted (20M) beats the preference: converts
+        (200e6, 20e6, 180e6, {"a"}),
+    ],
+)
+def test_non_participating_takes_preference_or_converts(
+    exit_value, expected_a, expected_common, converted
+):
+    payouts, price, unallocated, did_convert = waterfall_at(exit_value, [COMMON, SERIES_A], [])
+
+    assert payouts["a"] == pytest.approx(expected_a)
+    assert payouts["common"] == pytest.approx(expected_common)
+    assert did_convert == converted
+    _assert_conserved(exit_value, payouts, price, unallocated)
+
+
+def test_participating_takes_preference_and_shares_residual():
+    participating = ClassTerms(id="p", seniority=1, shares=100, preference=10e6, participating=True)
+    payouts, price, unallocated, converted = waterfall_at(20e6, [COMMON, participating], [])
+
+    assert payouts["p"] == pytest.approx(10e6 + 1e6)
+    assert payouts["common"] == pytest.approx(9e6)
+    assert converted == set()
+
+
+@pytest.mark.parametrize(
+    "exit_value, expected",
+    [
+        # Senior tier paid first in full, juniors pari passu on the remainder
+        (9e6, {"senior": 4e6, "b": 3e6, "c": 2e6, "common": 0.0}),
+        # Senior tier short: juniors get nothing
+        (3e6, {"senior": 3e6, "b": 0.0, "c": 0.0, "common": 0.0}),
+        # Everyone's preference covered, common takes the rest
+        (20e6, {"senior": 4e6, "b": 6e6, "c": 4e6, "common": 6e6}),
+    ],
+)
+def test_seniority_tiers_are_pari_passu_within_a_tier(exit_value, expected):
+    classes = [
+        ClassTerms(id="common", seniority=0, shares=1000, preference=0.0, participating=False),
+        ClassTerms(id="senior", seniority=2, shares=1, preference=4e6, participating=False),
+        ClassTerms(id="b", seniority=1, shares=1, preference=6e6, participating=False),
+        ClassTerms(id="c", seniority=1, shares=1, preference=4e6, participating=False),
+    ]
+    payouts, price, unallocated, converted = waterfall_at(exit_value, classes, [])
+
+    assert converted == set()
+    for class_id, amount in expected.items():
+        assert payouts[class_id] == pytest.approx(amount)
+    _assert_conserved(exit_value, payouts, price, unallocated)
+
+
+@pytest.mark.parametrize(
+    "strike, expected_price",
+    [
+        # Out of the money at 1000/share: grant is ignored
+        (2000.0, 1000.0),
+        # In the money: 1000p + 100(p - 500) = 1M
+        (500.0, 1_050_000 / 1100),
+        # Zero strike behaves like 100 extra common shares
+        (0.0, 1e6 / 1100),
+    ],
+)
+def test_vsop_grants_pay_above_their_strike(strike, expected_price):
+    common = ClassTerms(id="common", seniority=0, shares=1000, preference=0.0, participating=False)
+    vsop = [VsopClaim(stakeholder_id="e", name="Employee", shares=100, strike=strike)]
+    payouts, price, unallocated, _ = waterfall_at(1e6, [common], vsop)
+
+    assert price == pytest.approx(expected_price)
+    _assert_conserved(1e6, payouts, price, unallocated, vsop)
+
+
+def test_vsop_grants_join_in_strike_order():
+    common = ClassTerms(id="common", seniority=0, shares=1000, preference=0.0, participating=False)
+    vsop = [
+        VsopClaim(stakeholder_id="e1", name="E1", shares=100, strike=900.0),
+        VsopClaim(stakeholder_id="e2", name="E2", shares=100, strike=5000.0),
+    ]
+    payouts, price, unallocated, _ = waterfall_at(1e6, [common], vsop)
+
+    # Only the 900 strike is in the money: 1000p + 100(p - 900) = 1M
+    assert price == pytest.approx(1_090_000 / 1100)
+    _assert_conserved(1e6, payouts, price, unallocated, vsop)
+
+
+def _stakeholder(sid: str, type_: str) -> StakeholderRead:
+    return StakeholderRead(
+        id=sid, name=sid, email=None, phone=None, type=type_, entity_name=None,
+        contact_person=None, partner_emails=None, linkedin_url=None, notes=None,
+    )
+
+
+def test_run_waterfall_sweeps_exits_and_attributes_payouts():
+    holdings = {"founder": {"common": 900}, "vc": {"a": 100}}
+    stakeholders = {"founder": _stakeholder("founder", "founder"), "vc": _stakeholder("vc", "vc")}
+    vsop = [VsopClaim(stakeholder_id="emp", name="Employee", shares=50, strike=0.0)]
+
+    points = run_waterfall(
+        WaterfallRequest(exit_min=5e6, exit_max=200e6, steps=3),
+        [COMMON, SERIES_A],
+        holdings,
+        stakeholders,
+        vsop,
+    )
+
+    assert [p.exit_value for p in points] == [5e6, 102.5e6, 200e6]
+    for point in points:
+        total = sum(r.total_payout for r in point.payouts)
+        assert total + point.unallocated == pytest.approx(point.exit_value, abs=0.05)
+    by_id = {r.stakeholder_id: r for r in points[0].payouts}
+    assert by_id["vc"].share_payout == pytest.approx(5e6)
+    assert by_id["emp"].vsop_payout == 0
+    assert points[-1].converted_classes == ["a"]
+
+
+@pytest.mark.parametrize(
+    "request_, message",
+    [
+        (WaterfallRequest(exit_min=-1), "negative"),
+        (WaterfallRequest(exit_min=10, exit_max=5), "exit_max"),
+        (WaterfallRequest(exit_min=1, exit_max=2, steps=0), "steps"),
+    ],
+)
+def test_invalid_requests_raise(request_, message):
+    with pytest.raises(ValueError, match=message):
+        run_waterfall(request_, [COMMON], {}, {}, [])
@@ -0,0 +1,55 @@
+import pytest
+
+from app.services.vendor_classifier import classify_locally, normalize_vendor
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Amazon Web Services EMEA SARL", "amazon web services emea"),
+        ("Notaría Pérez, S.L.", "notaria perez"),
+        ("GitHub, Inc.", "github"),
+    ],
+)
+def test_normalize_vendor(name, expected):
+    assert normalize_vendor(name) == expected
+
+
+@pytest.mark.parametrize(
+    "contact, expected",
+    [
+        ("AWS EMEA SARL", "Infrastructure & Cloud"),
+        ("Slack Technologies Ltd", "SaaS & Tools"),
+        ("Google Ads", "Marketing & Sales"),
+        ("Agencia Tributaria", "Taxes & Government"),
+        ("Zurich Seguros SA", "Insurance"),
+        ("Notaria Lopez", "Legal & Compliance"),
+        ("Comision mantenimiento", "Banking & Fees"),
+        # Brand names win over generic words later in the list
+        ("Microsoft Consultoria", "SaaS & Tools"),
+        # Generic words alone are left for the LLM
+        ("Hotel Zurich", None),
+        ("Tax Advisors Ltd", None),
+        ("Legal Spaces", None),
+        ("Booking Holdings", None),
+    ],
+)
+def test_keyword_categories(contact, expected):
+    decided, unknown = classify_locally([contact], {}, {contact})
+    assert decided.get(contact) == expected
+    assert (contact in unknown) == (expected is None)
+
+
+def test_income_contacts_are_not_keyword_guessed():
+    contacts = ["Banco Santander Comision", "Slack Technologies"]
+    decided, unknown = classify_locally(contacts, {}, expense_contacts=set())
+    assert decided == {}
+    assert unknown == contacts
+
+
+def test_existing_rules_apply_regardless_of_direction():
+    rules = {"Acme Robotics": "Customers"}
+    contacts = ["Acme Robotics", "ACME ROBOTICS, S.L.", "Acme Robotic"]
+    decided, unknown = classify_locally(contacts, rules, set())
+    assert decided == dict.fromkeys(contacts, "Customers")
+    assert unknown == []